@@ -0,0 +1,206 @@
+# Assembly and parliamentary constituencies for each LSG, from boundary overlay
+# Constituency boundaries go into an STRtree; each district's LSGs are queried
+# against it and intersected with their candidates only, in parallel per
+# district. Overlap is the share of the LSG's area inside the constituency.
+# Areas are in square degrees; across one LSG the latitude scale is constant
+# enough that the ratio is unaffected.
+
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from kerala_json_io import dumps, load_json
+from kerala_lsg_records import stable_feature_id, unique_ids
+from kerala_spatial import repair_geometries
+
+# kind -> (default boundary file, LSG property, candidate name properties)
+KINDS = {
+    'assembly': (Path("data/raw/assembly_constituencies.geojson"), 'mla_constituency',
+                 ('AC_NAME', 'ac_name', 'assembly', 'constituency', 'name')),
+    'parliamentary': (Path("data/raw/parliamentary_constituencies.geojson"), 'mp_constituency',
+                      ('PC_NAME', 'pc_name', 'parliament', 'constituency', 'name')),
+}
+
+# Overlaps below this share of an LSG are boundary slivers between sources
+MIN_FRACTION = 0.01
+INDEX_FORMAT = 'kerala-constituency-index/1'
+DEFAULT_CONSTITUENCY_INDEX = Path("data/processed/constituency_index.json")
+
+
+def _geometries(features):
+    """Repaired shapely geometries for GeoJSON features (None where missing)"""
+    geoms = shapely.from_geojson(np.array(
+        [None if f.get('geometry') is None else dumps(f['geometry'], minify=True) for f in features],
+        dtype=object,
+    ))
+    repair_geometries(geoms)
+    return geoms
+
+
+def constituency_name(props, names):
+    """First non-empty name property, whitespace-normalized"""
+    for name in names:
+        value = props.get(name)
+        if value not in (None, ''):
+            return ' '.join(str(value).split())
+    return ''
+
+
+class ConstituencyLayer:
+    """One kind of constituency boundaries with an STRtree over them"""
+
+    def __init__(self, kind, features, names=None):
+        names = names or KINDS[kind][2]
+        self.kind = kind
+        self.names = [constituency_name(f.get('properties') or {}, names) for f in features]
+        self.geoms = _geometries(features)
+        self.tree = shapely.STRtree(self.geoms)
+
+    @classmethod
+    def load(cls, kind, path=None):
+        return cls(kind, load_json(path or KINDS[kind][0])['features'])
+
+    def __len__(self):
+        return len(self.names)
+
+    def overlay(self, lsg_geoms, min_fraction=MIN_FRACTION):
+        """
+        Constituencies overlapping each LSG geometry
+
+        Returns:
+            One list per LSG of (name, fraction) pairs, largest overlap first
+        """
+        lsg_idx, con_idx = self.tree.query(lsg_geoms, predicate='intersects')
+        overlap = shapely.area(shapely.intersection(lsg_geoms[lsg_idx], self.geoms[con_idx]))
+        area = shapely.area(lsg_geoms[lsg_idx])
+        fractions = np.divide(overlap, area, out=np.zeros_like(overlap), where=area > 0)
+
+        # Several polygons of one constituency may hit the same LSG
+        totals = [defaultdict(float) for _ in range(len(lsg_geoms))]
+        pairs = zip(lsg_idx.tolist(), con_idx.tolist(), fractions.tolist(), strict=True)
+        for i, j, fraction in pairs:
+            totals[i][self.names[j]] += fraction
+        return [
+            sorted(((name, round(min(fraction, 1.0), 4)) for name, fraction in found.items()
+                    if fraction >= min_fraction), key=lambda item: (-item[1], item[0]))
+            for found in totals
+        ]
+
+
+def overlay_lsgs(features, layers, min_fraction=MIN_FRACTION, workers=None):
+    """
+    Overlay LSG features with constituency layers, one district per task
+
+    Args:
+        features: LSG GeoJSON features (with a 'district' property)
+        layers: ConstituencyLayer list
+        workers: Thread count (default: one per CPU); shapely releases the GIL
+
+    Returns:
+        One dict per feature of {kind: [(name, fraction), ...]}
+    """
+    geoms = _geometries(features)
+    districts = defaultdict(list)
+    for i, feature in enumerate(features):
+        districts[feature['properties'].get('district') or ''].append(i)
+
+    def run(rows):
+        rows = np.array(rows)
+        return rows, {layer.kind: layer.overlay(geoms[rows], min_fraction) for layer in layers}
+
+    matches = [{} for _ in features]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for rows, found in pool.map(run, districts.values()):
+            for kind, per_lsg in found.items():
+                for row, pairs in zip(rows.tolist(), per_lsg, strict=True):
+                    matches[row][kind] = pairs
+    return matches
+
+
+def apply_constituencies(geo_data, matches):
+    """
+    Add overlay results to the feature properties in place
+
+    Each feature gets a 'constituencies' property ({kind: [{name, fraction}]}).
+    mla_constituency / mp_constituency are filled from the largest overlap
+    unless the officials CSV already set them; 'constituency_filled' lists
+    the ones filled here, so a later run replaces them and keeps CSV values.
+
+    Returns:
+        {kind: {'filled', 'kept', 'disagree', 'none'}} counts
+    """
+    stats = {}
+    for feature, found in zip(geo_data['features'], matches, strict=True):
+        props = feature['properties']
+        # Values filled by an earlier overlay run are replaced, not kept as CSV data
+        for prop in props.pop('constituency_filled', ()):
+            props.pop(prop, None)
+        filled = []
+        props['constituencies'] = {
+            kind: [{'name': name, 'fraction': fraction} for name, fraction in pairs]
+            for kind, pairs in found.items()
+        }
+        for kind, pairs in found.items():
+            counts = stats.setdefault(kind, {'filled': 0, 'kept': 0, 'disagree': 0, 'none': 0})
+            prop = KINDS[kind][1]
+            if not pairs:
+                counts['none'] += 1
+            elif not props.get(prop):
+                props[prop] = pairs[0][0]
+                filled.append(prop)
+                counts['filled'] += 1
+            else:
+                counts['kept'] += 1
+                if props[prop].casefold() not in {name.casefold() for name, _ in pairs}:
+                    counts['disagree'] += 1
+        if filled:
+            props['constituency_filled'] = filled
+    return stats
+
+
+def build_constituency_index(geo_data, min_fraction=MIN_FRACTION):
+    """
+    Reverse index from constituency to its LSGs
+
+    LSGs are listed by stable id, search index id (feature position + 1, as
+    stage 05 numbers them), name, district and overlap fraction.
+    """
+    features = geo_data['features']
+    ids = unique_ids(stable_feature_id(f['properties']) for f in features)
+    index = {'format': INDEX_FORMAT, 'min_fraction': min_fraction}
+    for kind in KINDS:
+        members = defaultdict(list)
+        for search_id, (feature, lsg_id) in enumerate(zip(features, ids, strict=True), 1):
+            props = feature['properties']
+            for item in (props.get('constituencies') or {}).get(kind, ()):
+                members[item['name']].append({
+                    'id': lsg_id,
+                    'search_id': search_id,
+                    'name': props.get('name') or '',
+                    'district': props.get('district') or '',
+                    'fraction': item['fraction'],
+                })
+        if members:
+            index[kind] = {name: members[name] for name in sorted(members)}
+    return index
+
+
+class ConstituencyIndex:
+    """Runtime lookups over constituency_index.json; no geometry needed"""
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def load(cls, path=DEFAULT_CONSTITUENCY_INDEX):
+        return cls(load_json(path))
+
+    def names(self, kind):
+        return list(self.data.get(kind, {}))
+
+    def lsgs(self, kind, name, min_fraction=0.0):
+        """LSG items of one constituency, optionally only those mostly inside it"""
+        return [item for item in self.data.get(kind, {}).get(name, ()) if item['fraction'] >= min_fraction]
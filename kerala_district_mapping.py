@@ -311,7 +311,7 @@ def get_kerala_stats():
     }
 
 if __name__ == "__main__":
-    import json
+    from kerala_json_io import dump_json
 
     # Print statistics
     stats = get_kerala_stats()
@@ -325,7 +325,6 @@ if __name__ == "__main__":
 
     # Save mapping to JSON
     mapping = get_lsg_to_district_mapping()
-    with open('district_mapping.json', 'w', encoding='utf-8') as f:
-        json.dump(mapping, f, ensure_ascii=False, indent=2)
+    dump_json(mapping, 'district_mapping.json')
 
     print("\nDistrict mapping saved to: district_mapping.json")
@@ -0,0 +1,123 @@
+# On-disk cache of parsed GeoDataFrames for the geopandas stages
+# Parsing GeoJSON with gpd.read_file() is most of a small stage's run time.
+# The first read of a layer stores its attribute columns and WKB geometries
+# in data/cache/geodata/; later reads unpickle that instead. Entries are
+# keyed by the source path and checked against its size and mtime, falling
+# back to a SHA-256 of the content when only the mtime moved (fresh
+# checkouts, copies). Writing an entry removes older ones for the same file
+# name, so the cache holds one entry per layer. geopandas itself is imported
+# on first use, so scripts that exit early or never touch geometry do not pay
+# for it.
+
+import glob
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+from kerala_json_io import atomic_write_bytes
+
+CACHE_DIR = Path("data/cache/geodata")
+CACHE_FORMAT = 1
+
+# Set KERALA_GEO_CACHE=0 to always parse the source
+CACHE_ENV = 'KERALA_GEO_CACHE'
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """SHA-256 hex digest of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(source, cache_dir=CACHE_DIR):
+    """Cache file for a source path; one entry per source, replaced when it changes"""
+    key = hashlib.sha1(str(Path(source).resolve()).encode('utf-8')).hexdigest()[:16]
+    return Path(cache_dir) / f"{Path(source).stem}.{key}.pickle"
+
+
+def _versions():
+    import geopandas
+    import shapely
+    return {'format': CACHE_FORMAT, 'geopandas': geopandas.__version__, 'shapely': shapely.__version__}
+
+
+def _load_entry(path, source, stat):
+    """Cached payload if it is still valid for the source, else None"""
+    try:
+        with open(path, 'rb') as f:
+            entry = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(entry, dict) or entry.get('versions') != _versions():
+        return None
+    if (entry['size'], entry['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+        return entry
+    # Same size, new mtime: reuse the entry if the content is unchanged
+    if entry['size'] == stat.st_size and entry['sha256'] == file_digest(source):
+        entry['mtime_ns'] = stat.st_mtime_ns
+        atomic_write_bytes(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL), path)
+        return entry
+    return None
+
+
+def _to_entry(gdf, source, stat):
+    import shapely
+    return {
+        'versions': _versions(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': file_digest(source),
+        'geometry_name': gdf.geometry.name,
+        'crs': gdf.crs.to_wkt() if gdf.crs else None,
+        'attributes': gdf.drop(columns=gdf.geometry.name),
+        'wkb': shapely.to_wkb(gdf.geometry.array),
+    }
+
+
+def _from_entry(entry):
+    import geopandas as gpd
+    attributes = entry['attributes']
+    geometry = gpd.GeoSeries.from_wkb(entry['wkb'], index=attributes.index, crs=entry['crs'])
+    return gpd.GeoDataFrame(attributes, geometry=geometry.rename(entry['geometry_name']))
+
+
+def read_geodataframe(source, cache_dir=CACHE_DIR, use_cache=None):
+    """
+    gpd.read_file() with a persistent parse cache
+
+    Args:
+        source: GeoJSON (or any file geopandas reads)
+        cache_dir: Where cache entries live
+        use_cache: False to bypass the cache (default: on unless KERALA_GEO_CACHE=0)
+
+    Returns:
+        (GeoDataFrame, hit) - hit is True when the cache was used
+
+    Raises:
+        ImportError: geopandas is not installed
+    """
+    import geopandas as gpd
+
+    if use_cache is None:
+        use_cache = os.environ.get(CACHE_ENV, '1') != '0'
+    if not use_cache:
+        return gpd.read_file(source), False
+
+    source = Path(source)
+    stat = source.stat()
+    path = cache_path(source, cache_dir)
+    entry = _load_entry(path, source, stat) if path.exists() else None
+    if entry is not None:
+        return _from_entry(entry), True
+
+    gdf = gpd.read_file(source)
+    atomic_write_bytes(pickle.dumps(_to_entry(gdf, source, stat), protocol=pickle.HIGHEST_PROTOCOL), path)
+    # Older entries for a source of the same name (e.g. a moved checkout) are never read again
+    for stale in path.parent.glob(f"{glob.escape(source.stem)}.*.pickle"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    return gdf, False
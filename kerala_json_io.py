@@ -0,0 +1,276 @@
+# Shared JSON I/O for the processing scripts
+# Uses orjson or msgspec when installed and falls back to the standard library
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Output defaults, overridable per call or from the environment so that
+# ./run_all.sh can switch every stage at once:
+#   KERALA_JSON_BACKEND=orjson|msgspec|json
+#   KERALA_JSON_MINIFY=1
+#   KERALA_JSON_PRECISION=6
+DEFAULT_MINIFY = os.environ.get('KERALA_JSON_MINIFY', '') not in ('', '0')
+DEFAULT_PRECISION = int(os.environ['KERALA_JSON_PRECISION']) if os.environ.get('KERALA_JSON_PRECISION') else None
+
+
+def _stdlib_loads(data):
+    return json.loads(data)
+
+def _stdlib_dumps(obj, minify):
+    if minify:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    return text.encode('utf-8')
+
+def _orjson_dumps(obj, minify):
+    option = orjson.OPT_SERIALIZE_NUMPY
+    if not minify:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option)
+
+def _msgspec_dumps(obj, minify):
+    data = msgspec.json.encode(obj)
+    return data if minify else msgspec.json.format(data, indent=2)
+
+BACKENDS = {'json': (_stdlib_loads, _stdlib_dumps)}
+if orjson is not None:
+    BACKENDS['orjson'] = (orjson.loads, _orjson_dumps)
+if msgspec is not None:
+    BACKENDS['msgspec'] = (msgspec.json.decode, _msgspec_dumps)
+
+
+def get_backend(name=None):
+    """
+    Return (name, loads, dumps) for the requested or fastest available backend
+
+    Preference order is orjson, msgspec, then the standard library.
+    """
+    name = name or os.environ.get('KERALA_JSON_BACKEND', '')
+    if name:
+        if name not in BACKENDS:
+            raise ValueError(f"JSON backend '{name}' is not available (installed: {', '.join(BACKENDS)})")
+    else:
+        name = next(n for n in ('orjson', 'msgspec', 'json') if n in BACKENDS)
+    loads, dumps = BACKENDS[name]
+    return name, loads, dumps
+
+
+def round_floats(obj, ndigits):
+    """Round every float in a nested structure of dicts and lists"""
+    if isinstance(obj, float):
+        return round(obj, ndigits)
+    if isinstance(obj, dict):
+        return {k: round_floats(v, ndigits) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [round_floats(v, ndigits) for v in obj]
+    return obj
+
+
+def loads(data, backend=None):
+    """Parse JSON from bytes or str"""
+    return get_backend(backend)[1](data)
+
+def dumps(obj, minify=None, precision=None, backend=None):
+    """
+    Serialize to UTF-8 JSON bytes
+
+    Args:
+        minify: Drop whitespace (default: KERALA_JSON_MINIFY, else indent=2)
+        precision: Round floats to this many decimals, e.g. 6 (~0.1m) for
+                   coordinates (default: KERALA_JSON_PRECISION, else unchanged)
+    """
+    minify = DEFAULT_MINIFY if minify is None else minify
+    precision = DEFAULT_PRECISION if precision is None else precision
+    if precision is not None:
+        obj = round_floats(obj, precision)
+    return get_backend(backend)[2](obj, minify)
+
+
+def load_json(path, backend=None):
+    """Read and parse a JSON file"""
+    with open(path, 'rb') as f:
+        return loads(f.read(), backend)
+
+
+def _tmp_path(path):
+    return path.with_name(f".{path.name}.{os.getpid()}.tmp")
+
+def atomic_write_bytes(data, path):
+    """Write next to the target and rename into place, so readers never see a partial file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _tmp_path(path)
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+def atomic_copy(src, path):
+    """Copy a file next to the target and rename into place"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = _tmp_path(path)
+    try:
+        shutil.copy2(src, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def dump_json(obj, path, minify=None, precision=None, backend=None):
+    """Serialize to a JSON file atomically"""
+    atomic_write_bytes(dumps(obj, minify, precision, backend), path)
+
+
+class FeatureCollectionWriter:
+    """
+    Write a GeoJSON FeatureCollection incrementally with write(feature)
+
+    Output goes to a temp file next to `path` and is renamed into place on
+    close(); if the `with` block raises, the partial file is removed. In the
+    default (non-minified) layout each feature is written on its own line.
+    """
+
+    def __init__(self, path, members=None, minify=None, precision=None, backend=None):
+        self.path = Path(path)
+        self.minify = DEFAULT_MINIFY if minify is None else minify
+        self.precision = DEFAULT_PRECISION if precision is None else precision
+        self._encode = get_backend(backend)[2]
+        self._sep = b',' if self.minify else b',\n'
+        self.count = 0
+
+        members = dict(members or {})
+        members.setdefault('type', 'FeatureCollection')
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = _tmp_path(self.path)
+        self._file = open(self._tmp_path, 'wb')
+        self._file.write(b'{')
+        for key, value in members.items():
+            self._file.write(self._encode(key, True) + b':' + self._encode(value, True) + self._sep)
+        self._file.write(b'"features":[' if self.minify else b'"features":[\n')
+
+    def write(self, feature):
+        if self.count:
+            self._file.write(self._sep)
+        if self.precision is not None:
+            feature = round_floats(feature, self.precision)
+        self._file.write(self._encode(feature, True))
+        self.count += 1
+
+    def write_encoded(self, data):
+        """Write a feature that is already serialized JSON bytes (no rounding applied)"""
+        if self.count:
+            self._file.write(self._sep)
+        self._file.write(data)
+        self.count += 1
+
+    def close(self):
+        """Finish the document and rename it into place"""
+        self._file.write(b']}' if self.minify else b'\n]}\n')
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Drop the partial output"""
+        self._file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def dump_feature_collection(collection, path, minify=None, precision=None, backend=None):
+    """
+    Stream a GeoJSON FeatureCollection to disk one feature at a time
+
+    `collection['features']` may be any iterable (e.g. a generator), so the
+    full serialized document never has to be held in memory.
+    """
+    members = {k: v for k, v in collection.items() if k != 'features'}
+    with FeatureCollectionWriter(path, members, minify, precision, backend) as writer:
+        for feature in collection.get('features', []):
+            writer.write(feature)
+
+
+def iter_features(path, chunk_size=1 << 20):
+    """
+    Yield the features of a GeoJSON FeatureCollection without loading the whole file
+
+    Reads `chunk_size` characters at a time and decodes one feature at a
+    time, so memory stays flat however large the layer is. Expects the
+    "features" member to be the first one named "features" in the file,
+    which holds for ordinary GeoJSON writers.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf, pos = '', 0
+
+        def fill():
+            nonlocal buf, pos
+            # At least double the pending text, so a feature larger than a
+            # chunk is re-decoded only O(log n) times
+            chunk = f.read(max(chunk_size, len(buf) - pos))
+            buf, pos = buf[pos:] + chunk, 0
+            return bool(chunk)
+
+        # Find the start of the features array
+        while True:
+            start = buf.find('"features"', pos)
+            if start >= 0:
+                pos = start + len('"features"')
+                break
+            pos = max(pos, len(buf) - len('"features"'))
+            if not fill():
+                raise ValueError(f"{path} has no \"features\" array")
+        while True:
+            start = buf.find('[', pos)
+            if start >= 0:
+                pos = start + 1
+                break
+            pos = len(buf)
+            if not fill():
+                raise ValueError(f"{path} has no \"features\" array")
+
+        while True:
+            # Skip separators between features
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                if not fill():
+                    raise ValueError(f"{path} ends inside the features array")
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                feature, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Feature continues past the buffer; read more and retry
+                if not fill():
+                    raise
+                continue
+            yield feature
+            pos = end
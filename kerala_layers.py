@@ -0,0 +1,106 @@
+# Separate geometry and attribute artifacts of the final LSG layer
+# kerala_lsg_final.geojson bundles boundaries with officials data that changes
+# far more often. The web app loads the layer as two files joined on the
+# stable feature id instead: kerala_lsg_geometry.geojson (ids, boundaries and
+# bboxes, no properties) only changes when boundaries do, and
+# kerala_lsg_attributes.json (properties by id) is small. kerala_publish
+# content-hashes each file on its own, so an officials refresh re-downloads
+# only the attributes.
+
+import hashlib
+from pathlib import Path
+
+from kerala_json_io import atomic_write_bytes, dump_json, dumps, load_json
+from kerala_lsg_records import stable_feature_id, unique_ids
+
+GEOMETRY_FILE = Path("data/processed/kerala_lsg_geometry.geojson")
+ATTRIBUTES_FILE = Path("data/processed/kerala_lsg_attributes.json")
+ATTRIBUTES_FORMAT = 'kerala-lsg-attributes/1'
+
+_cache = {}
+
+
+def split_layer(geo_data):
+    """
+    Split a FeatureCollection into geometry and attributes keyed by stable id
+
+    Returns:
+        (geometry, attributes) - a FeatureCollection with empty properties,
+        and {'format', 'features': {id: properties}} in the same order
+    """
+    features = geo_data['features']
+    ids = unique_ids(stable_feature_id(f.get('properties') or {}) for f in features)
+
+    geometry = {key: value for key, value in geo_data.items() if key != 'features'}
+    geometry['features'] = []
+    for feature_id, feature in zip(ids, features, strict=True):
+        item = {'type': 'Feature', 'id': feature_id}
+        if feature.get('bbox'):
+            item['bbox'] = feature['bbox']
+        item['properties'] = {}
+        item['geometry'] = feature.get('geometry')
+        geometry['features'].append(item)
+
+    attributes = {
+        'format': ATTRIBUTES_FORMAT,
+        'features': {
+            feature_id: feature.get('properties') or {}
+            for feature_id, feature in zip(ids, features, strict=True)
+        },
+    }
+    return geometry, attributes
+
+
+def join_layer(geometry, attributes):
+    """FeatureCollection with each feature's properties looked up by id (empty when missing)"""
+    by_id = attributes.get('features', {})
+    return {
+        **geometry,
+        'features': [{**f, 'properties': dict(by_id.get(f.get('id')) or {})} for f in geometry['features']],
+    }
+
+
+def write_split_layer(geo_data, geometry_file=GEOMETRY_FILE, attributes_file=ATTRIBUTES_FILE):
+    """
+    Write both artifacts; the geometry file is left untouched if unchanged
+
+    Keeping the geometry file's bytes and modification time means the
+    publish step and any file watchers see no change after an attributes-only
+    refresh.
+
+    Returns:
+        True if the geometry file was (re)written
+    """
+    geometry, attributes = split_layer(geo_data)
+    data = dumps(geometry, minify=True)
+    geometry_file = Path(geometry_file)
+    changed = not geometry_file.exists() or geometry_file.read_bytes() != data
+    if changed:
+        atomic_write_bytes(data, geometry_file)
+
+    # The geometry version these attributes were written against
+    attributes['geometry_sha256'] = hashlib.sha256(data).hexdigest()
+    dump_json(attributes, attributes_file, minify=True)
+    return changed
+
+
+def _load_cached(path):
+    """Parsed JSON file, re-read only when it is replaced or modified"""
+    path = Path(path)
+    stat = path.stat()
+    key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != key:
+        cached = _cache[path] = (key, load_json(path))
+    return cached[1]
+
+
+def load_layer(geometry_file=GEOMETRY_FILE, attributes_file=ATTRIBUTES_FILE):
+    """
+    Final LSG layer joined from its geometry and attributes files
+
+    Each file is cached separately, so after an officials refresh only the
+    attributes are parsed again. Geometries are shared with the cache; copy
+    them before modifying.
+    """
+    return join_layer(_load_cached(geometry_file), _load_cached(attributes_file))
@@ -0,0 +1,202 @@
+# Memory-mapped binary LSG index (search_index.bin)
+# Fixed-width records, a shared UTF-8 string table and a sorted name-key table.
+# Readers mmap the file, so opening it costs almost nothing and every process
+# on a host shares the same page cache instead of parsing its own JSON copy.
+#
+# Layout (little-endian):
+#   header    HEADER                                    magic, version and section offsets
+#   records   RECORD x count, sorted by id              id, district code, type code, centroid,
+#                                                       bbox, name / name_ml / wikidata refs
+#   districts STRING_REF x n_districts                  code -> district name
+#   types     STRING_REF x n_types                      code -> LSG type
+#   keys      KEY x n_keys, sorted by key bytes         casefolded English and Malayalam names
+#   strings   UTF-8 bytes                               every string, each stored once
+
+import bisect
+import mmap
+import struct
+from pathlib import Path
+
+from kerala_lsg_records import SearchEntry
+
+MAGIC = b'KLSGIDX\0'
+VERSION = 1
+
+HEADER = struct.Struct('<8sHHIIIIIIIII')
+RECORD = struct.Struct('<IHH2d4dIHIHIH')
+STRING_REF = struct.Struct('<IH')
+KEY = struct.Struct('<IHI')
+
+DEFAULT_BINARY_INDEX = Path("data/processed/search_index.bin")
+
+
+def name_key(text):
+    """Normalized key for name lookups"""
+    return ' '.join(text.casefold().split())
+
+
+class _StringTable:
+    """Deduplicating UTF-8 string table for the writer"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self._refs = {}
+
+    def ref(self, text):
+        ref = self._refs.get(text)
+        if ref is None:
+            encoded = text.encode('utf-8')
+            if len(encoded) > 0xFFFF:
+                raise ValueError(f"String too long for the binary index: {text[:40]!r}...")
+            ref = self._refs[text] = (len(self.data), len(encoded))
+            self.data += encoded
+        return ref
+
+
+def build_binary_index(entries):
+    """
+    Serialize search entries to the binary index layout
+
+    Args:
+        entries: SearchEntry records (officials fields are not stored)
+
+    Returns:
+        bytes of the whole file
+    """
+    entries = sorted(entries, key=lambda entry: entry.id)
+    strings = _StringTable()
+    districts, types = {}, {}
+    nan = float('nan')
+
+    records = bytearray()
+    keys = []
+    for row, entry in enumerate(entries):
+        district = districts.setdefault(entry.district, len(districts))
+        lsg_type = types.setdefault(entry.lsg_type, len(types))
+        lon, lat = entry.centroid if entry.centroid else (nan, nan)
+        bbox = entry.bbox or (nan, nan, nan, nan)
+        records += RECORD.pack(
+            entry.id, district, lsg_type, lon, lat, *bbox,
+            *strings.ref(entry.name), *strings.ref(entry.name_ml), *strings.ref(entry.wikidata)
+        )
+        for name in {name_key(entry.name), name_key(entry.name_ml)}:
+            if name:
+                keys.append((name.encode('utf-8'), row))
+
+    # UTF-8 byte order matches code point order, so readers can bisect on bytes
+    keys.sort()
+    key_table = b''.join(KEY.pack(*strings.ref(key.decode('utf-8')), row) for key, row in keys)
+    district_table = b''.join(STRING_REF.pack(*strings.ref(name)) for name in districts)
+    type_table = b''.join(STRING_REF.pack(*strings.ref(name)) for name in types)
+
+    records_offset = HEADER.size
+    districts_offset = records_offset + len(records)
+    types_offset = districts_offset + len(district_table)
+    keys_offset = types_offset + len(type_table)
+    strings_offset = keys_offset + len(key_table)
+
+    header = HEADER.pack(
+        MAGIC, VERSION, RECORD.size, len(entries), len(districts), len(types), len(keys),
+        records_offset, districts_offset, types_offset, keys_offset, strings_offset
+    )
+    return b''.join((header, records, district_table, type_table, key_table, bytes(strings.data)))
+
+
+class BinaryLSGIndex:
+    """Read-only, memory-mapped view of search_index.bin"""
+
+    def __init__(self, path=DEFAULT_BINARY_INDEX):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buf = memoryview(self._mmap)
+
+        (magic, version, record_size, self._count, n_districts, n_types, self._n_keys,
+         self._records, districts, types, self._keys, self._strings) = HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} LSG binary index")
+
+        # Category tables are tiny; decode them once
+        self.districts = [self._string(*STRING_REF.unpack_from(self._buf, districts + i * STRING_REF.size))
+                          for i in range(n_districts)]
+        self.lsg_types = [self._string(*STRING_REF.unpack_from(self._buf, types + i * STRING_REF.size))
+                          for i in range(n_types)]
+
+    def close(self):
+        self._buf.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def _string(self, offset, length):
+        start = self._strings + offset
+        return str(self._buf[start:start + length], 'utf-8')
+
+    def _record(self, row):
+        return RECORD.unpack_from(self._buf, self._records + row * RECORD.size)
+
+    def _id(self, row):
+        return struct.unpack_from('<I', self._buf, self._records + row * RECORD.size)[0]
+
+    def _key(self, i):
+        offset, length, _ = KEY.unpack_from(self._buf, self._keys + i * KEY.size)
+        start = self._strings + offset
+        return self._buf[start:start + length].tobytes()
+
+    def entry(self, row):
+        """Materialize one record as a SearchEntry (officials fields empty)"""
+        (entry_id, district, lsg_type, lon, lat, x0, y0, x1, y1,
+         name_off, name_len, ml_off, ml_len, qid_off, qid_len) = self._record(row)
+        return SearchEntry(
+            id=entry_id,
+            name=self._string(name_off, name_len),
+            name_ml=self._string(ml_off, ml_len),
+            lsg_type=self.lsg_types[lsg_type],
+            district=self.districts[district],
+            centroid=() if lon != lon else (lon, lat),
+            wikidata=self._string(qid_off, qid_len),
+            bbox=() if x0 != x0 else (x0, y0, x1, y1),
+        )
+
+    def get(self, entry_id):
+        """Entry by search index id (binary search), or None"""
+        row = bisect.bisect_left(range(self._count), entry_id, key=self._id)
+        if row < self._count and self._id(row) == entry_id:
+            return self.entry(row)
+        return None
+
+    def find(self, prefix, limit=10):
+        """Entries whose English or Malayalam name starts with `prefix` (binary search)"""
+        key = name_key(prefix).encode('utf-8')
+        if not key:
+            return []
+        i = bisect.bisect_left(range(self._n_keys), key, key=self._key)
+        rows = []
+        while i < self._n_keys and len(rows) < limit and self._key(i).startswith(key):
+            row = KEY.unpack_from(self._buf, self._keys + i * KEY.size)[2]
+            if row not in rows:
+                rows.append(row)
+            i += 1
+        return [self.entry(row) for row in rows]
+
+    def filter(self, district=None, lsg_type=None):
+        """Entries in a district and/or of an LSG type"""
+        if district is not None and district not in self.districts:
+            return []
+        if lsg_type is not None and lsg_type not in self.lsg_types:
+            return []
+        district_code = None if district is None else self.districts.index(district)
+        type_code = None if lsg_type is None else self.lsg_types.index(lsg_type)
+        rows = []
+        for row in range(self._count):
+            _, d, t = struct.unpack_from('<IHH', self._buf, self._records + row * RECORD.size)
+            if (district_code is None or d == district_code) and (type_code is None or t == type_code):
+                rows.append(row)
+        return [self.entry(row) for row in rows]
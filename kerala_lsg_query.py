@@ -0,0 +1,135 @@
+# Query library for the generated LSG search index
+# Loads search_index.json into a columnar SearchColumns container
+
+import os
+from pathlib import Path
+
+from kerala_json_io import load_json
+from kerala_lsg_records import SearchColumns
+from kerala_phonetic import MALAYALAM, phonetic_key, phonetic_keys
+from kerala_spatial import GridIndex
+
+DEFAULT_SEARCH_INDEX = Path("data/processed/search_index.json")
+
+
+class LSGIndex:
+    """In-memory index over search_index.json entries"""
+
+    def __init__(self, columns):
+        self.columns = columns
+        self._lower_names = [name.lower() for name in columns.name]
+        self._grid = None
+        self._centroids = None
+        self._phonetic = None
+
+    @classmethod
+    def load(cls, path=DEFAULT_SEARCH_INDEX):
+        return cls(SearchColumns.from_dicts(load_json(path)))
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, entry_id):
+        """Entry by search index id, or None"""
+        row = self.columns.row_of(entry_id)
+        return None if row is None else self.columns.entry(row)
+
+    def filter(self, district=None, lsg_type=None, party=None, mla_constituency=None, mp_constituency=None):
+        """Entries matching every given district, LSG type, president's party and constituency"""
+        conditions = {}
+        if district is not None:
+            conditions['district'] = district
+        if lsg_type is not None:
+            conditions['lsg_type'] = lsg_type
+        if party is not None:
+            conditions['head_party'] = party
+        if mla_constituency is not None:
+            conditions['mla_constituency'] = mla_constituency
+        if mp_constituency is not None:
+            conditions['mp_constituency'] = mp_constituency
+        return [self.columns.entry(row) for row in self.columns.rows_where(**conditions)]
+
+    def in_bbox(self, bbox):
+        """
+        Entries whose bounding box intersects a viewport
+
+        Args:
+            bbox: [min_lon, min_lat, max_lon, max_lat]
+        """
+        if self._grid is None:
+            # Entries without a bbox (older indexes) fall back to their centroid
+            columns = self.columns
+            boxes = []
+            for row in range(len(columns)):
+                lon, lat = columns.lon[row], columns.lat[row]
+                boxes.append(columns.bbox(row) or ((lon, lat, lon, lat) if lon == lon else None))
+            self._grid = GridIndex(range(len(columns)), boxes)
+        return [self.columns.entry(row) for row in self._grid.query(bbox)]
+
+    def centroid_index(self):
+        """kerala_nearest.CentroidIndex over the entry centroids, built on first use"""
+        if self._centroids is None:
+            from kerala_nearest import CentroidIndex
+            columns = self.columns
+            self._centroids = CentroidIndex(list(columns.ids), list(columns.lon), list(columns.lat))
+        return self._centroids
+
+    def nearest(self, lon, lat, k=1):
+        """
+        Ids and km distances of the k entries with the nearest centroids
+
+        Args:
+            lon, lat: Scalars or NumPy arrays of query coordinates
+
+        Returns:
+            (ids, distances_km) NumPy arrays shaped (n, k)
+        """
+        return self.centroid_index().nearest(lon, lat, k)
+
+    def within(self, lon, lat, radius_km):
+        """(point_index, ids, distances_km) of every entry centroid within radius_km of each point"""
+        return self.centroid_index().within(lon, lat, radius_km)
+
+    def phonetic_rows(self, query):
+        """Rows whose English or Malayalam name has the query's phonetic key"""
+        if self._phonetic is None:
+            # Indexes from before stage 05 stored keys get them computed here
+            self._phonetic = {}
+            columns = self.columns
+            for row in range(len(columns)):
+                keys = columns.phonetic[row] or phonetic_keys(columns.name[row], columns.name_ml[row])
+                for key in keys:
+                    self._phonetic.setdefault(key, []).append(row)
+        return self._phonetic.get(phonetic_key(query), [])
+
+    def search(self, query, limit=10):
+        """
+        Substring match on English or Malayalam names, like the web app,
+        followed by names that sound the same (Manjeshwar -> Manjeswaram)
+        """
+        q = query.strip().lower()
+        if not q:
+            return []
+        rows = []
+        names = zip(self._lower_names, self.columns.name_ml, strict=True)
+        for row, (name, name_ml) in enumerate(names):
+            if q in name or (name_ml and q in name_ml):
+                rows.append(row)
+                if len(rows) >= limit:
+                    break
+        if len(rows) < limit:
+            found = set(rows)
+            names = self.columns.name_ml if MALAYALAM.search(q) else self._lower_names
+            # Names sharing a key are few; the closest spellings come first
+            sounds_like = sorted((row for row in self.phonetic_rows(q) if row not in found),
+                                 key=lambda row: -len(os.path.commonprefix([q, names[row]])))
+            rows.extend(sounds_like)
+        return [self.columns.entry(row) for row in rows[:limit]]
+
+    def counts_by(self, column):
+        """Entry counts per value of a categorical column"""
+        table = self.columns.tables[column]
+        counts = [0] * len(table)
+        for code in self.columns.codes[column]:
+            counts[code] += 1
+        return {value: count for value, count in zip(table.values, counts, strict=True) if count}
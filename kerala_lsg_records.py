@@ -0,0 +1,414 @@
+# Typed records for LSG officials data and search index entries
+# Slotted classes keep per-record memory small; repeated strings such as
+# district, lsg_type and party are interned so every record shares one copy
+
+import re
+import sys
+from array import array
+from dataclasses import dataclass, field
+
+from kerala_phonetic import phonetic_keys
+
+
+def _str(value):
+    """CSV/JSON value as a stripped string ('' for None)"""
+    return value.strip() if isinstance(value, str) else ('' if value is None else str(value))
+
+def _intern(value):
+    """Intern short categorical strings so records share them"""
+    return sys.intern(_str(value))
+
+
+def stable_feature_id(props):
+    """
+    Identifier for an LSG that survives re-runs and reordering
+
+    The Wikidata QID when the feature has one, otherwise a slug of
+    district, LSG type and name (e.g. "kasaragod/gram-panchayat/vorkady").
+    Works on GeoJSON properties and search index entries alike.
+    """
+    qid = _str(props.get('wikidata'))
+    if qid:
+        return qid
+    parts = (props.get('district'), props.get('lsg_type'), props.get('name'))
+    return '/'.join(re.sub(r'[^a-z0-9]+', '-', _str(p).lower()).strip('-') for p in parts)
+
+
+def unique_ids(ids):
+    """Suffix repeated ids with "#2", "#3"... in order, so every id is unique"""
+    seen = set()
+    result = []
+    for base in ids:
+        key, n = base, 1
+        while key in seen:
+            n += 1
+            key = f"{base}#{n}"
+        seen.add(key)
+        result.append(key)
+    return result
+
+
+@dataclass(slots=True)
+class Official:
+    """One office holder (president/mayor or secretary)"""
+    name: str = ''
+    party: str = ''
+    contact: str = ''
+    email: str = ''
+
+    def to_dict(self, with_party=True):
+        data = {'name': self.name}
+        if with_party:
+            data['party'] = self.party
+        data['contact'] = self.contact
+        data['email'] = self.email
+        return data
+
+
+@dataclass(slots=True)
+class LSGRecord:
+    """Officials CSV row for one LSG, as merged into the GeoJSON properties"""
+    lsg_id: str = ''
+    lsg_name: str = ''
+    district: str = ''
+    lsg_type: str = ''
+    president: Official = field(default_factory=Official)
+    secretary: Official = field(default_factory=Official)
+    office_address: str = ''
+    website: str = ''
+    wikidata_id: str = ''
+    mla_constituency: str = ''
+    mp_constituency: str = ''
+    notes: str = ''
+
+    @classmethod
+    def from_csv_row(cls, row):
+        get = row.get
+        return cls(
+            lsg_id=_str(get('lsg_id')),
+            lsg_name=_str(get('lsg_name')),
+            district=_intern(get('district')),
+            lsg_type=_intern(get('lsg_type')),
+            president=Official(
+                _str(get('president_name')), _intern(get('president_party')),
+                _str(get('president_contact')), _str(get('president_email'))
+            ),
+            secretary=Official(
+                _str(get('secretary_name')), '',
+                _str(get('secretary_contact')), _str(get('secretary_email'))
+            ),
+            office_address=_str(get('office_address')),
+            website=_str(get('website')),
+            wikidata_id=_str(get('wikidata_id')),
+            mla_constituency=_intern(get('mla_constituency')),
+            mp_constituency=_intern(get('mp_constituency')),
+            notes=_str(get('notes')),
+        )
+
+    @property
+    def has_data(self):
+        """True when the row carries actual data, not just an LSG name"""
+        return bool(self.president.name or self.secretary.name or self.office_address or self.website)
+
+    def apply_to(self, props):
+        """Write the officials structure and non-empty extra fields into GeoJSON properties"""
+        props['officials'] = {
+            'president': self.president.to_dict(),
+            'secretary': self.secretary.to_dict(with_party=False),
+        }
+        for name in ('office_address', 'website', 'mla_constituency', 'mp_constituency', 'notes'):
+            value = getattr(self, name)
+            if value:
+                props[name] = value
+
+
+@dataclass(slots=True)
+class SearchEntry:
+    """One entry of search_index.json"""
+    id: int
+    name: str
+    name_ml: str
+    lsg_type: str
+    district: str
+    centroid: tuple
+    head_name: str = ''
+    head_title: str = ''
+    head_party: str = ''
+    secretary: str = ''
+    website: str = ''
+    wikidata: str = ''
+    mla_constituency: str = ''
+    mp_constituency: str = ''
+    bbox: tuple = ()
+    phonetic: tuple = ()  # kerala_phonetic keys of name and name_ml
+
+    @classmethod
+    def from_feature(cls, entry_id, props, centroid, bbox=None):
+        """Build an entry from merged GeoJSON properties"""
+        lsg_type = _intern(props.get('lsg_type', 'lsg'))
+        name = _str(props.get('name', ''))
+        name_ml = _str(props.get('name_ml', ''))
+        entry = cls(
+            id=entry_id,
+            name=name,
+            name_ml=name_ml,
+            lsg_type=lsg_type,
+            district=_intern(props.get('district', '')),
+            centroid=tuple(centroid),
+            website=_str(props.get('website')),
+            wikidata=_str(props.get('wikidata')),
+            mla_constituency=_intern(props.get('mla_constituency')),
+            mp_constituency=_intern(props.get('mp_constituency')),
+            bbox=tuple(bbox or ()),
+            phonetic=tuple(phonetic_keys(name, name_ml)),
+        )
+
+        officials = props.get('officials')
+        if officials:
+            president = officials.get('president', {})
+            if president.get('name'):
+                entry.head_name = president['name']
+                entry.head_title = 'Mayor' if lsg_type == 'corporation' else 'President'
+                entry.head_party = _intern(president.get('party'))
+            secretary = officials.get('secretary', {})
+            if secretary.get('name'):
+                entry.secretary = secretary['name']
+
+        return entry
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an entry from a search_index.json item"""
+        head = data.get('head') or {}
+        return cls(
+            id=data['id'],
+            name=data.get('name') or '',
+            name_ml=data.get('name_ml') or '',
+            lsg_type=_intern(data.get('lsg_type')),
+            district=_intern(data.get('district')),
+            centroid=tuple(data.get('centroid') or ()),
+            head_name=head.get('name') or '',
+            head_title=_intern(head.get('title')),
+            head_party=_intern(head.get('party')),
+            secretary=data.get('secretary') or '',
+            website=data.get('website') or '',
+            wikidata=data.get('wikidata') or '',
+            mla_constituency=_intern(data.get('mla_constituency')),
+            mp_constituency=_intern(data.get('mp_constituency')),
+            bbox=tuple(data.get('bbox') or ()),
+            phonetic=tuple(data.get('phonetic') or ()),
+        )
+
+    def to_dict(self):
+        """search_index.json layout; empty optional fields are left out"""
+        data = {
+            'id': self.id,
+            'name': self.name,
+            'name_ml': self.name_ml,
+            'lsg_type': self.lsg_type,
+            'district': self.district,
+            'centroid': list(self.centroid),
+        }
+        if self.bbox:
+            data['bbox'] = list(self.bbox)
+        if self.head_name:
+            data['head'] = {'name': self.head_name, 'title': self.head_title}
+            if self.head_party:
+                data['head']['party'] = self.head_party
+        for name in ('secretary', 'website', 'wikidata', 'mla_constituency', 'mp_constituency'):
+            value = getattr(self, name)
+            if value:
+                data[name] = value
+        if self.phonetic:
+            data['phonetic'] = list(self.phonetic)
+        return data
+
+
+@dataclass(slots=True)
+class WardEntry:
+    """One entry of ward_search_index.json"""
+    id: int
+    ward_id: str
+    ward_no: str
+    name: str
+    lsg: str
+    parent_id: str
+    lsg_type: str
+    district: str
+    centroid: tuple
+    bbox: tuple = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            id=data['id'],
+            ward_id=data.get('ward_id') or '',
+            ward_no=_str(data.get('ward_no')),
+            name=data.get('name') or '',
+            lsg=data.get('lsg') or '',
+            parent_id=data.get('parent_id') or '',
+            lsg_type=_intern(data.get('lsg_type')),
+            district=_intern(data.get('district')),
+            centroid=tuple(data.get('centroid') or ()),
+            bbox=tuple(data.get('bbox') or ()),
+        )
+
+    def to_dict(self):
+        """ward_search_index.json layout"""
+        data = {
+            'id': self.id,
+            'ward_id': self.ward_id,
+            'ward_no': self.ward_no,
+            'name': self.name,
+            'lsg': self.lsg,
+            'parent_id': self.parent_id,
+            'lsg_type': self.lsg_type,
+            'district': self.district,
+            'centroid': list(self.centroid),
+        }
+        if self.bbox:
+            data['bbox'] = list(self.bbox)
+        return data
+
+
+class StringTable:
+    """Interned string column: each distinct value stored once, rows hold codes"""
+
+    __slots__ = ('values', '_codes')
+
+    def __init__(self, values=()):
+        self.values = []
+        self._codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        """Code for a value, adding it to the table if new"""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def lookup(self, value):
+        """Code for an existing value, or None"""
+        return self._codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class SearchColumns:
+    """
+    Columnar container for search entries
+
+    Dense fields are parallel arrays; categorical fields are codes into
+    shared StringTables; mostly-empty fields are sparse {row: value} maps.
+    """
+
+    CATEGORICAL = ('district', 'lsg_type', 'head_title', 'head_party', 'mla_constituency', 'mp_constituency')
+    SPARSE = ('head_name', 'secretary', 'website', 'wikidata')
+
+    def __init__(self):
+        self.ids = array('l')
+        self.lon = array('d')
+        self.lat = array('d')
+        self.bounds = array('d')  # min_lon, min_lat, max_lon, max_lat per row (NaN if none)
+        self.name = []
+        self.name_ml = []
+        self.phonetic = []
+        self.tables = {name: StringTable(['']) for name in self.CATEGORICAL}
+        self.codes = {name: array('H') for name in self.CATEGORICAL}
+        self.sparse = {name: {} for name in self.SPARSE}
+        self._row_by_id = {}
+        self._postings = {}
+
+    @classmethod
+    def from_entries(cls, entries):
+        columns = cls()
+        for entry in entries:
+            columns.append(entry)
+        return columns
+
+    @classmethod
+    def from_dicts(cls, items):
+        return cls.from_entries(SearchEntry.from_dict(item) for item in items)
+
+    def append(self, entry):
+        row = len(self.ids)
+        self._row_by_id[entry.id] = row
+        self.ids.append(entry.id)
+        lon, lat = entry.centroid if entry.centroid else (float('nan'), float('nan'))
+        self.lon.append(lon)
+        self.lat.append(lat)
+        self.bounds.extend(entry.bbox if entry.bbox else (float('nan'),) * 4)
+        self.name.append(entry.name)
+        self.name_ml.append(entry.name_ml)
+        self.phonetic.append(entry.phonetic)
+        for name in self.CATEGORICAL:
+            self.codes[name].append(self.tables[name].code(getattr(entry, name)))
+        self._postings.clear()
+        for name in self.SPARSE:
+            value = getattr(entry, name)
+            if value:
+                self.sparse[name][row] = value
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row_of(self, entry_id):
+        """Row number for an entry id, or None"""
+        return self._row_by_id.get(entry_id)
+
+    def bbox(self, row):
+        """Bounding box of a row as a tuple, or () if it has none"""
+        box = tuple(self.bounds[4 * row:4 * row + 4])
+        return () if box[0] != box[0] else box
+
+    def value(self, name, row):
+        """Decoded value of a categorical column"""
+        return self.tables[name].values[self.codes[name][row]]
+
+    def postings(self, name):
+        """Rows per code of a categorical column, built on first use"""
+        postings = self._postings.get(name)
+        if postings is None:
+            postings = [array('l') for _ in self.tables[name].values]
+            for row, code in enumerate(self.codes[name]):
+                postings[code].append(row)
+            self._postings[name] = postings
+        return postings
+
+    def rows_where(self, **conditions):
+        """Rows whose categorical columns equal all the given values"""
+        if not conditions:
+            return list(range(len(self)))
+        wanted = {}
+        for name, value in conditions.items():
+            code = self.tables[name].lookup(value)
+            if code is None:
+                return []
+            wanted[name] = code
+        # Start from the shortest posting list and narrow by the other columns' codes
+        order = sorted(wanted, key=lambda name: len(self.postings(name)[wanted[name]]))
+        rows = self.postings(order[0])[wanted[order[0]]]
+        for name in order[1:]:
+            column, code = self.codes[name], wanted[name]
+            rows = [row for row in rows if column[row] == code]
+        return list(rows)
+
+    def entry(self, row):
+        """Materialize one row as a SearchEntry"""
+        return SearchEntry(
+            id=self.ids[row],
+            name=self.name[row],
+            name_ml=self.name_ml[row],
+            phonetic=self.phonetic[row],
+            centroid=(self.lon[row], self.lat[row]),
+            bbox=self.bbox(row),
+            **{name: self.value(name, row) for name in self.CATEGORICAL},
+            **{name: self.sparse[name].get(row, '') for name in self.SPARSE},
+        )
+
+    def entries(self):
+        return [self.entry(row) for row in range(len(self))]
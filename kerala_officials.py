@@ -0,0 +1,197 @@
+# Columnar ingest and validation of the officials CSV
+# The CSV is read into string columns, and every check and normalization is
+# a vectorized column operation: district names against KERALA_DISTRICTS
+# (with the old English spellings), phone numbers, emails, websites, Wikidata
+# ids, LSG types and repeated lsg_ids. Problems are collected as one row per
+# (CSV line, column, issue) for a report instead of being printed.
+#
+# Severity: an "error" row cannot be joined to any LSG (no name, lsg_id or
+# Wikidata id) and is dropped; a "warning" keeps the value as given.
+#
+# Optional columns: "as_of" (date of the row; with historical rows the newest
+# wins, file order breaks ties) and "ward_no" (ward-level rows, which are kept
+# out of the LSG join).
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from kerala_district_mapping import KERALA_DISTRICTS
+
+OFFICIALS_COLUMNS = [
+    'lsg_id', 'lsg_name', 'lsg_name_ml', 'lsg_type', 'district',
+    'president_name', 'president_party', 'president_contact', 'president_email',
+    'secretary_name', 'secretary_contact', 'secretary_email',
+    'office_address', 'website', 'wikidata_id', 'mla_constituency', 'mp_constituency', 'notes',
+]
+OPTIONAL_COLUMNS = ['as_of', 'ward_no']
+CONTACT_COLUMNS = ['president_contact', 'secretary_contact']
+EMAIL_COLUMNS = ['president_email', 'secretary_email']
+ISSUE_COLUMNS = ['line', 'lsg_id', 'lsg_name', 'column', 'value', 'severity', 'issue']
+
+# Former English names and common misspellings
+DISTRICT_ALIASES = {
+    'trivandrum': 'Thiruvananthapuram', 'quilon': 'Kollam', 'alleppey': 'Alappuzha',
+    'cochin': 'Ernakulam', 'trichur': 'Thrissur', 'palghat': 'Palakkad', 'calicut': 'Kozhikode',
+    'cannanore': 'Kannur', 'kasargod': 'Kasaragod', 'kasaragode': 'Kasaragod',
+    'pathanamthita': 'Pathanamthitta', 'malapuram': 'Malappuram', 'wynad': 'Wayanad',
+}
+LSG_TYPES = {
+    'gram panchayat', 'grama panchayat', 'block panchayat', 'district panchayat',
+    'municipality', 'corporation', 'municipal corporation',
+}
+CONTACT_SEPARATORS = r'\s*[,;/]\s*'
+# LSG type words left off names for joining, longest first
+NAME_SUFFIXES = [
+    ' municipal corporation', ' corporation', ' municipality',
+    ' grama panchayat', ' grama panchayath', ' gramapanchayat', ' gramapanchayath',
+    ' block panchayat', ' district panchayat', ' panchayath', ' panchayat',
+]
+
+EMAIL_PATTERN = r'[^@\s]+@[^@\s]+\.[a-z]{2,}'
+WIKIDATA_PATTERN = r'Q[1-9][0-9]*'
+WEBSITE_PATTERN = r'https?://\S+'
+
+
+def officials_frame(rows):
+    """
+    String columns of officials rows, stripped, with every known column present
+
+    Args:
+        rows: DataFrame, or a list of CSV row dicts
+    """
+    frame = rows if isinstance(rows, pd.DataFrame) else pd.DataFrame(list(rows))
+    columns = OFFICIALS_COLUMNS + [c for c in frame.columns if c not in OFFICIALS_COLUMNS]
+    frame = frame.reindex(columns=columns).fillna('').astype(str)
+    for column in frame.columns:
+        frame[column] = frame[column].str.strip()
+    return frame
+
+
+def read_officials_csv(path):
+    """Officials CSV as string columns (see officials_frame)"""
+    frame = pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8')
+    return officials_frame(frame)
+
+
+def normalize_districts(values):
+    """
+    Canonical KERALA_DISTRICTS names
+
+    Returns:
+        (normalized, unknown) - unknown marks non-empty values that match no
+        district; they are passed through unchanged
+    """
+    canonical = {name.lower(): name for name in KERALA_DISTRICTS}
+    canonical.update(DISTRICT_ALIASES)
+    key = values.str.lower().str.replace(r'\s+district$', '', regex=True).str.replace(r'\s+', ' ', regex=True)
+    mapped = key.map(canonical)
+    return mapped.fillna(values), mapped.isna() & values.ne('')
+
+
+def _format_numbers(numbers):
+    """(formatted, valid) of cells holding one phone number each"""
+    digits = numbers.str.replace(r'[\s\-().]', '', regex=True).str.replace(r'^(\+?91|0091)(?=\d{10}$)', '', regex=True)
+    mobile = digits.str.fullmatch(r'[6-9]\d{9}')
+    landline = digits.str.fullmatch(r'0\d{10}') | digits.str.fullmatch(r'[1-5]\d{9}')
+    formatted = np.where(mobile, '+91' + digits, np.where(landline, '0' + digits.str.lstrip('0'), numbers))
+    return pd.Series(formatted, index=numbers.index, dtype=object), mobile | landline
+
+
+def normalize_contacts(values):
+    """
+    Phone numbers as +91XXXXXXXXXX (mobile) or 0XXXXXXXXXX (landline with STD code)
+
+    Several numbers in one cell (separated by , ; /) are normalized one by one
+    and joined with ", ".
+
+    Returns:
+        (normalized, invalid) - invalid cells are passed through unchanged
+    """
+    multiple = values.str.contains(CONTACT_SEPARATORS, regex=True)
+    formatted, valid = _format_numbers(values[~multiple])
+    if multiple.any():
+        # Only these few cells are split, one row per number, and joined back
+        numbers = values[multiple].str.split(CONTACT_SEPARATORS, regex=True).explode()
+        parts, parts_valid = _format_numbers(numbers[numbers.ne('')])
+        formatted = pd.concat([formatted, parts.groupby(level=0).agg(', '.join)])
+        valid = pd.concat([valid, parts_valid.groupby(level=0).all()])
+    ok = valid.reindex(values.index, fill_value=True).astype(bool) | values.eq('')
+    normalized = formatted.reindex(values.index).fillna('').astype(str)
+    return normalized.where(ok, values), ~ok & values.ne('')
+
+
+def validate_officials(frame):
+    """
+    Normalize a frame from officials_frame in place and collect its problems
+
+    Returns:
+        (frame, issues) - rows that can be joined to an LSG, and an issues
+        DataFrame (ISSUE_COLUMNS; "line" is the CSV line number, header = 1)
+    """
+    problems = []
+
+    def flag(mask, column, issue, severity='warning'):
+        if mask.any():
+            problems.append(pd.DataFrame({
+                'row': frame.index[mask], 'column': column, 'value': frame[column][mask].to_numpy(),
+                'severity': severity, 'issue': issue,
+            }))
+
+    frame['district'], unknown = normalize_districts(frame['district'])
+    flag(unknown, 'district', 'unknown district')
+
+    lsg_type = frame['lsg_type'].str.lower().str.replace(r'\s+', ' ', regex=True)
+    frame['lsg_type'] = lsg_type.where(lsg_type.isin(LSG_TYPES), frame['lsg_type'])
+    flag(~lsg_type.isin(LSG_TYPES) & lsg_type.ne(''), 'lsg_type', 'unknown LSG type')
+
+    for column in CONTACT_COLUMNS:
+        frame[column], invalid = normalize_contacts(frame[column])
+        flag(invalid, column, 'not a phone number')
+
+    for column in EMAIL_COLUMNS:
+        frame[column] = frame[column].str.lower()
+        flag(~frame[column].str.fullmatch(EMAIL_PATTERN) & frame[column].ne(''), column, 'not an email address')
+
+    frame['wikidata_id'] = frame['wikidata_id'].str.upper()
+    flag(~frame['wikidata_id'].str.fullmatch(WIKIDATA_PATTERN) & frame['wikidata_id'].ne(''),
+         'wikidata_id', 'not a Wikidata id')
+    flag(~frame['website'].str.fullmatch(WEBSITE_PATTERN, case=False) & frame['website'].ne(''),
+         'website', 'not an http(s) URL')
+
+    lsg_rows = frame['ward_no'].eq('') if 'ward_no' in frame else pd.Series(True, index=frame.index)
+    unjoinable = frame['lsg_name'].eq('') & frame['lsg_id'].eq('') & frame['wikidata_id'].eq('')
+    flag(unjoinable & lsg_rows, 'lsg_name', 'no lsg_name, lsg_id or wikidata_id', 'error')
+
+    # Repeated ids are expected across dates; on the same date the later row wins
+    as_of = frame['as_of'] if 'as_of' in frame else pd.Series('', index=frame.index)
+    ids = pd.DataFrame({'lsg_id': frame['lsg_id'], 'as_of': as_of})[lsg_rows & frame['lsg_id'].ne('')]
+    flag(frame.index.isin(ids.index[ids.duplicated(keep='last')]), 'lsg_id',
+         'duplicate lsg_id (a later row replaces it)')
+
+    issues = pd.concat(problems, ignore_index=True) if problems else pd.DataFrame(
+        columns=['row', 'column', 'value', 'severity', 'issue'])
+    issues.insert(0, 'line', issues['row'].map(frame.index.get_loc).astype(int) + 2)
+    issues.insert(1, 'lsg_id', frame['lsg_id'].reindex(issues['row']).to_numpy())
+    issues.insert(2, 'lsg_name', frame['lsg_name'].reindex(issues['row']).to_numpy())
+    issues = issues.drop(columns='row').sort_values(['line', 'column'], kind='stable').reset_index(drop=True)
+
+    valid = frame[lsg_rows & ~unjoinable]
+    if 'as_of' in valid:
+        # Oldest first, so the newest row is the one left in each join layer
+        valid = valid.sort_values('as_of', kind='stable')
+    return valid, issues[ISSUE_COLUMNS]
+
+
+def issue_summary(issues):
+    """{(severity, column, issue): count}, most frequent first"""
+    counts = issues.groupby(['severity', 'column', 'issue'], sort=False).size().sort_values(ascending=False)
+    return {key: int(count) for key, count in counts.items()}
+
+
+def name_keys(names):
+    """Vectorized 04_merge_officials_data.normalize_name"""
+    # The earliest-starting suffix wins, as the longest one does in normalize_name
+    pattern = '(?:' + '|'.join(re.escape(s) for s in NAME_SUFFIXES) + ')$'
+    return names.str.lower().str.strip().str.replace(pattern, '', n=1, regex=True).str.strip()
@@ -0,0 +1,143 @@
+# Phonetic search keys for LSG names in English and Malayalam
+# Malayalam is first transliterated to the Latin spelling people type
+# ("Manglish"); romanized text is then folded to a consonant skeleton so
+# spelling variants share one key: Manjeswaram, Manjeshwar and മഞ്ചേശ്വരം
+# all become "mnjsvr". Keys are computed once per entry by stage 05, so a
+# query is one key computation and a dict lookup.
+#
+# web-app/src/lib/utils/phonetic.js implements the same rules for the map's
+# search box; change both together (tests/test_phonetic.py and
+# phonetic.test.js check the same examples).
+
+import re
+import unicodedata
+
+VIRAMA = '്'
+MALAYALAM = re.compile('[ഀ-ൿ]')
+
+VOWELS = {
+    'അ': 'a', 'ആ': 'aa', 'ഇ': 'i', 'ഈ': 'ee', 'ഉ': 'u', 'ഊ': 'oo', 'ഋ': 'ru',
+    'എ': 'e', 'ഏ': 'e', 'ഐ': 'ai', 'ഒ': 'o', 'ഓ': 'o', 'ഔ': 'au',
+}
+VOWEL_SIGNS = {
+    'ാ': 'aa', 'ി': 'i', 'ീ': 'ee', 'ു': 'u', 'ൂ': 'oo', 'ൃ': 'ru',
+    'െ': 'e', 'േ': 'e', 'ൈ': 'ai', 'ൊ': 'o', 'ോ': 'o', 'ൌ': 'au', 'ൗ': 'au',
+}
+CONSONANTS = {
+    'ക': 'k', 'ഖ': 'kh', 'ഗ': 'g', 'ഘ': 'gh', 'ങ': 'ng',
+    'ച': 'ch', 'ഛ': 'chh', 'ജ': 'j', 'ഝ': 'jh', 'ഞ': 'nj',
+    'ട': 't', 'ഠ': 'th', 'ഡ': 'd', 'ഢ': 'dh', 'ണ': 'n',
+    'ത': 'th', 'ഥ': 'th', 'ദ': 'd', 'ധ': 'dh', 'ന': 'n',
+    'പ': 'p', 'ഫ': 'ph', 'ബ': 'b', 'ഭ': 'bh', 'മ': 'm',
+    'യ': 'y', 'ര': 'r', 'ല': 'l', 'വ': 'v', 'ശ': 'sh', 'ഷ': 'sh', 'സ': 's', 'ഹ': 'h',
+    'ള': 'l', 'ഴ': 'zh', 'റ': 'r',
+}
+# Conjuncts spelled differently from their parts
+CONJUNCTS = {
+    'ങ്ക': 'nk', 'ങ്ങ': 'ng', 'ഞ്ച': 'nch', 'ഞ്ഞ': 'nj', 'റ്റ': 'tt', 'ന്റ': 'nt', 'ക്ഷ': 'ksh',
+}
+OTHER = {
+    'ം': 'm', 'ഃ': 'h', 'ൺ': 'n', 'ൻ': 'n', 'ർ': 'r', 'ൽ': 'l', 'ൾ': 'l', 'ൿ': 'k',
+    '\u200c': '', '\u200d': '',  # zero-width (non-)joiners in older chillu spellings
+}
+
+# Romanized spelling variants folded together, applied in order
+FOLDS = [
+    (r'ksh', 'ks'),
+    (r'nch', 'nj'),
+    (r'c(?!h)|q', 'k'),
+    (r'x', 'ks'),
+    (r'sh', 's'),
+    (r'zh', 'z'),
+    (r'ch', 'c'),
+    (r'[td]h|d', 't'),
+    (r'bh', 'b'),
+    (r'ph|f', 'p'),
+    (r'kh', 'k'),
+    (r'gh', 'g'),
+    (r'jh', 'j'),
+    (r'w', 'v'),
+    (r'n[gk]', 'ng'),
+    (r'(.)\1+', r'\1'),
+    (r'(?<=[aeiouy])m$', ''),  # final anusvara: Manjeswaram / Manjeshwar
+]
+_FOLDS = [(re.compile(pattern), replacement) for pattern, replacement in FOLDS]
+
+# Trailing words that name the LSG type rather than the place
+SUFFIX_WORDS = (
+    'grama', 'gram', 'panchayat', 'gramapanchayat', 'block', 'district', 'municipality',
+    'municipal', 'corporation', 'nagarasabha',
+    'ഗ്രാമപഞ്ചായത്ത്', 'പഞ്ചായത്ത്', 'ബ്ലോക്ക്', 'ജില്ലാ', 'നഗരസഭ', 'കോർപ്പറേഷൻ',
+)
+
+
+def transliterate(text):
+    """Malayalam script to a plain Latin spelling; other characters pass through"""
+    out = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        conjunct = text[i:i + 3]
+        if conjunct in CONJUNCTS:
+            out.append(CONJUNCTS[conjunct])
+            i += 3
+        elif char in CONSONANTS:
+            out.append(CONSONANTS[char])
+            i += 1
+        else:
+            out.append(VOWELS.get(char) or OTHER.get(char, char))
+            i += 1
+            continue
+        # Inherent vowel unless a vowel sign or virama follows
+        following = text[i] if i < len(text) else ''
+        if following in VOWEL_SIGNS:
+            out.append(VOWEL_SIGNS[following])
+            i += 1
+        elif following == VIRAMA:
+            i += 1
+        else:
+            out.append('a')
+    return ''.join(out)
+
+
+def _words(text):
+    if MALAYALAM.search(text):
+        text = transliterate(text)
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode('ascii').lower()
+    return re.findall(r'[a-z]+', text)
+
+
+def _fold(text):
+    for pattern, replacement in _FOLDS:
+        text = pattern.sub(replacement, text)
+    if not text:
+        return ''
+    # Keep the first letter (any vowel as "a"), drop the other vowels
+    first = 'a' if text[0] in 'aeiouy' else text[0]
+    return first + re.sub(r'[aeiouy]', '', text[1:])
+
+
+_SUFFIX_KEYS = {_fold(''.join(_words(word))) for word in SUFFIX_WORDS}
+
+
+def phonetic_key(text):
+    """
+    Phonetic key of a name or query in English or Malayalam
+
+    LSG type words at the end ("Grama Panchayath", "നഗരസഭ") are dropped
+    whatever their spelling; word breaks are ignored.
+    """
+    words = _words(text or '')
+    while len(words) > 1 and _fold(words[-1]) in _SUFFIX_KEYS:
+        words.pop()
+    return _fold(''.join(words))
+
+
+def phonetic_keys(*names):
+    """Distinct non-empty keys of several spellings of one name, in order"""
+    keys = []
+    for name in names:
+        key = phonetic_key(name)
+        if key and key not in keys:
+            keys.append(key)
+    return keys
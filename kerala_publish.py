@@ -0,0 +1,137 @@
+# Content-hashed, precompressed publishing of the web app's static data
+# Each file is written as <stem>.<hash><suffix> with .gz and .br variants next
+# to it, and manifest.json maps the plain names to those files. The manifest is
+# replaced last, so the app never sees a name whose file is still being written.
+# Each entry also records the last different version it replaced ("previous"),
+# whose files are kept for pages that loaded the older manifest.
+
+import gzip
+import hashlib
+import re
+import time
+from pathlib import Path
+
+from kerala_json_io import atomic_copy, atomic_write_bytes, dump_json, load_json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_FORMAT = 'kerala-lsg-assets/1'
+HASH_LENGTH = 12
+
+
+def hashed_name(path, digest):
+    """kerala_lsg_final.geojson -> kerala_lsg_final.<digest[:12]>.geojson"""
+    path = Path(path)
+    return f"{path.stem}.{digest[:HASH_LENGTH]}{path.suffix}"
+
+
+def compress_variants(data):
+    """{encoding: (extension, bytes)} at maximum compression"""
+    # mtime=0 keeps the gzip output identical for identical input
+    variants = {'gzip': ('.gz', gzip.compress(data, compresslevel=9, mtime=0))}
+    if brotli is not None:
+        variants['br'] = ('.br', brotli.compress(data, quality=11))
+    return variants
+
+
+def publish_file(src, static_dir):
+    """
+    Write one file's hashed copy and compressed variants
+
+    Existing hashed files are left untouched: same name means same content.
+
+    Returns:
+        Manifest entry for the file
+    """
+    data = Path(src).read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    name = hashed_name(src, digest)
+    target = static_dir / name
+
+    entry = {'path': name, 'sha256': digest, 'bytes': len(data), 'encodings': {}}
+    if not target.exists():
+        atomic_write_bytes(data, target)
+
+    for encoding, (extension, compressed) in compress_variants(data).items():
+        variant = static_dir / (name + extension)
+        if not variant.exists():
+            atomic_write_bytes(compressed, variant)
+        entry['encodings'][encoding] = {'path': variant.name, 'bytes': variant.stat().st_size}
+    return entry
+
+
+def load_manifest(static_dir):
+    manifest_file = static_dir / MANIFEST_NAME
+    if manifest_file.exists():
+        return load_json(manifest_file)
+    return {'format': MANIFEST_FORMAT, 'files': {}}
+
+
+def referenced_files(manifest):
+    """Every file name a manifest points at, including each entry's previous version"""
+    names = set()
+    for entry in manifest.get('files', {}).values():
+        for version in (entry, entry.get('previous')):
+            if version:
+                names.add(version['path'])
+                names.update(variant['path'] for variant in version.get('encodings', {}).values())
+    return names
+
+
+def prune(static_dir, keep, sources):
+    """Remove hashed copies of `sources` that are not in `keep`"""
+    removed = []
+    for src in sources:
+        src = Path(src)
+        pattern = re.compile(rf"{re.escape(src.stem)}\.[0-9a-f]{{{HASH_LENGTH}}}{re.escape(src.suffix)}(\.gz|\.br)?")
+        for path in static_dir.iterdir():
+            if pattern.fullmatch(path.name) and path.name not in keep:
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def publish(sources, static_dir, keep_plain=True):
+    """
+    Publish files into the static directory and swap in a new manifest
+
+    Args:
+        sources: Files to publish
+        static_dir: Web app static data directory
+        keep_plain: Also copy each file under its plain name (for clients without the manifest)
+
+    Returns:
+        (manifest, removed) - the new manifest and the stale files deleted
+    """
+    static_dir = Path(static_dir)
+    previous = load_manifest(static_dir)
+
+    files = dict(previous.get('files', {}))
+    for src in sources:
+        src = Path(src)
+        entry = publish_file(src, static_dir)
+        old = files.get(src.name)
+        if old and old['path'] != entry['path']:
+            entry['previous'] = {'path': old['path'], 'encodings': old.get('encodings', {})}
+        elif old and old.get('previous'):
+            # Republishing the same content keeps the version before it
+            entry['previous'] = old['previous']
+        files[src.name] = entry
+        if keep_plain:
+            atomic_copy(src, static_dir / src.name)
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'files': dict(sorted(files.items())),
+    }
+    dump_json(manifest, static_dir / MANIFEST_NAME, minify=False)
+
+    # Keep the previous generation for clients that loaded the old manifest
+    keep = referenced_files(manifest)
+    removed = prune(static_dir, keep, sources)
+    return manifest, removed
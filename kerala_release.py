@@ -0,0 +1,228 @@
+# Per-feature content hashes and delta patches between dataset releases
+# A patch lists features added, removed and changed (by stable id) so that
+# clients holding one release can update to the next without a full download
+
+import hashlib
+import json
+
+from kerala_lsg_records import stable_feature_id, unique_ids
+from kerala_spatial import geometry_bounds
+
+PATCH_FORMAT = 'kerala-lsg-patch/1'
+# Feature members that make up (or derive from) the hashed parts
+GEOJSON_PARTS = ('type', 'geometry', 'properties', 'bbox')
+
+
+def content_hash(obj):
+    """
+    Short SHA-256 of a value's canonical JSON
+
+    Always uses the standard library encoder with sorted keys, so hashes do
+    not change with the installed JSON backend.
+    """
+    data = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+
+
+def dataset_kind(data):
+    """'geojson' for a FeatureCollection, 'search_index' for a list of entries"""
+    return 'geojson' if isinstance(data, dict) and 'features' in data else 'search_index'
+
+
+def split_item(item, kind):
+    """(geometry, properties) parts of a feature or search entry"""
+    if kind == 'geojson':
+        return item.get('geometry'), item.get('properties') or {}
+    # The positional "id" of a search entry is a member (item_members), so
+    # renumbering after an insert does not change every later entry's hash
+    return item.get('centroid'), {k: v for k, v in item.items() if k not in ('centroid', 'id')}
+
+
+def item_members(item, kind):
+    """
+    Top-level members kept beside the hashed parts, such as a feature's "id"
+
+    They are not hashed: GeoJSON feature ids are the stable ids items are
+    keyed by, and a search entry's id is only its position in stage 05's
+    output. Patches carry member changes separately.
+    """
+    if kind == 'geojson':
+        return {k: v for k, v in item.items() if k not in GEOJSON_PARTS}
+    return {'id': item['id']} if 'id' in item else {}
+
+
+def join_item(item, geometry, properties, kind):
+    """Rebuild `item` from (possibly updated) geometry and properties parts"""
+    if kind == 'geojson':
+        joined = {**item, 'geometry': geometry, 'properties': properties}
+        # The bbox member is derived from the geometry, so it is not hashed
+        if 'bbox' in item and geometry is not item.get('geometry'):
+            joined['bbox'] = geometry_bounds(geometry)
+        return joined
+    # Search entries keep stage 05's layout: id first, centroid after district
+    joined = {'id': item['id']} if 'id' in item else {}
+    for key, value in properties.items():
+        joined[key] = value
+        if key == 'district':
+            joined['centroid'] = geometry
+    joined.setdefault('centroid', geometry)
+    return joined
+
+
+def index_items(data):
+    """
+    Key every feature/entry by stable id
+
+    Returns:
+        (kind, {id: item}) - ids that repeat get a "#2", "#3"... suffix in file order
+    """
+    kind = dataset_kind(data)
+    items = data['features'] if kind == 'geojson' else data
+    ids = unique_ids(stable_feature_id(split_item(item, kind)[1]) for item in items)
+    return kind, dict(zip(ids, items, strict=True))
+
+
+def hash_items(items_by_id, kind):
+    """{id: [geometry_hash, properties_hash]}"""
+    hashes = {}
+    for key, item in items_by_id.items():
+        geometry, properties = split_item(item, kind)
+        hashes[key] = [content_hash(geometry), content_hash(properties)]
+    return hashes
+
+
+def dataset_hash(hashes):
+    """Order-independent hash of a whole release, from its feature hashes"""
+    digest = hashlib.sha256()
+    for key in sorted(hashes):
+        geometry_hash, properties_hash = hashes[key]
+        digest.update(f"{key}\t{geometry_hash}\t{properties_hash}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def diff_hashes(old_hashes, new_hashes):
+    """
+    Compare two releases' feature hashes
+
+    Returns:
+        (added, removed, changed) - id lists; changed maps id -> ['geometry'] / ['properties'] / both
+    """
+    added = [key for key in new_hashes if key not in old_hashes]
+    removed = [key for key in old_hashes if key not in new_hashes]
+    changed = {}
+    for key, (geometry_hash, properties_hash) in new_hashes.items():
+        old = old_hashes.get(key)
+        if old is None:
+            continue
+        parts = []
+        if old[0] != geometry_hash:
+            parts.append('geometry')
+        if old[1] != properties_hash:
+            parts.append('properties')
+        if parts:
+            changed[key] = parts
+    return added, removed, changed
+
+
+def members_of(items_by_id, kind):
+    """{id: item_members} of the items that have any"""
+    members = {}
+    for key, item in items_by_id.items():
+        item_extra = item_members(item, kind)
+        if item_extra:
+            members[key] = item_extra
+    return members
+
+
+def make_patch(old_hashes, new_hashes, new_items_by_id, kind, from_version, to_version, old_members=None):
+    """
+    Patch carrying only added items and the changed parts of changed items
+
+    Args:
+        old_members: members_of() the old release; without it the patch sets
+                     the members of every kept item
+
+    A kept item whose members changed gets its full new member dict under
+    'members' (empty when they were all removed).
+    """
+    added, removed, changed = diff_hashes(old_hashes, new_hashes)
+    members = {}
+    for key, item in new_items_by_id.items():
+        if key not in old_hashes:
+            continue
+        new = item_members(item, kind)
+        if old_members is None or old_members.get(key, {}) != new:
+            members[key] = new
+
+    changed_items = []
+    for key, parts in changed.items():
+        geometry, properties = split_item(new_items_by_id[key], kind)
+        change = {'id': key}
+        if 'geometry' in parts:
+            change['geometry'] = geometry
+        if 'properties' in parts:
+            change['properties'] = properties
+        changed_items.append(change)
+
+    return {
+        'format': PATCH_FORMAT,
+        'kind': kind,
+        'from_version': from_version,
+        'to_version': to_version,
+        'from_hash': dataset_hash(old_hashes),
+        'to_hash': dataset_hash(new_hashes),
+        'added': [{'id': key, 'item': new_items_by_id[key]} for key in added],
+        'removed': removed,
+        'changed': changed_items,
+        'members': members,
+    }
+
+
+def _replace_members(item, members, kind):
+    """Item with its members replaced by `members`, keys kept in place"""
+    old = item_members(item, kind)
+    result = {key: members[key] if key in old else value
+              for key, value in item.items() if key not in old or key in members}
+    result.update((key, value) for key, value in members.items() if key not in old)
+    return result
+
+
+def apply_patch(data, patch):
+    """
+    Apply a patch to a loaded release and return the next release
+
+    Unchanged items keep their order; added items are appended. Raises
+    ValueError if the input or the result does not match the patch hashes.
+    """
+    kind, by_id = index_items(data)
+    if kind != patch['kind']:
+        raise ValueError(f"Patch is for {patch['kind']}, data is {kind}")
+    if dataset_hash(hash_items(by_id, kind)) != patch['from_hash']:
+        raise ValueError(f"Data is not release v{patch['from_version']}")
+
+    for key in patch['removed']:
+        del by_id[key]
+
+    for change in patch['changed']:
+        item = by_id[change['id']]
+        geometry, properties = split_item(item, kind)
+        by_id[change['id']] = join_item(
+            item,
+            change.get('geometry', geometry),
+            change.get('properties', properties),
+            kind
+        )
+
+    for key, members in patch.get('members', {}).items():
+        by_id[key] = _replace_members(by_id[key], members, kind)
+
+    for added in patch['added']:
+        by_id[added['id']] = added['item']
+
+    if dataset_hash(hash_items(by_id, kind)) != patch['to_hash']:
+        raise ValueError(f"Patched data does not match release v{patch['to_version']}")
+
+    items = list(by_id.values())
+    if kind == 'geojson':
+        return {**data, 'features': items}
+    return items
@@ -0,0 +1,167 @@
+# Precomputed aggregates of the final LSG layer (a small rollup cube)
+# Counts, areas and officials coverage are summed once per release for every
+# grouping of district x LSG type x president's party, from the whole state
+# down to single cells, so readers look a total up instead of scanning the
+# features. data/processed/rollup.json:
+#
+#   {"format", "dimensions": [...], "measures": [...],
+#    "groups": {"district,lsg_type": {"Kollam|municipality": [lsgs, area_sq_km, ...], ...},
+#               "": {"": [...]}, ...}}
+#
+# Group names join the grouped dimensions with "," (in DIMENSIONS order) and
+# cell keys join their values with "|"; "" is the state total.
+
+import json
+from itertools import combinations
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from kerala_json_io import load_json
+
+ROLLUP_FILE = Path("data/processed/rollup.json")
+ROLLUP_FORMAT = 'kerala-lsg-rollup/1'
+
+DIMENSIONS = ['district', 'lsg_type', 'party']
+MEASURES = ['lsgs', 'area_sq_km', 'with_officials', 'with_contact']
+# Value of a dimension the feature does not have
+UNKNOWN = {'district': 'Unknown', 'lsg_type': 'unknown', 'party': 'Unknown'}
+
+# WGS 84 semi-major axis and squared eccentricity
+WGS84_A_KM = 6378.137
+WGS84_E2 = 0.00669437999014
+
+
+def areas_sq_km(geoms):
+    """
+    Areas of lon/lat geometries in km²
+
+    Each geometry is measured on the equal-area sinusoidal projection of the
+    unit sphere, then scaled by the ellipsoid's radii of curvature at its
+    centroid latitude (within 0.1% of an ellipsoidal equal-area projection
+    for LSG-sized extents).
+    """
+    def sinusoidal(coords):
+        lon, lat = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+        return np.column_stack([lon * np.cos(lat), lat])
+
+    sin2 = np.sin(np.radians(shapely.get_y(shapely.centroid(geoms)))) ** 2
+    meridian = WGS84_A_KM * (1 - WGS84_E2) / (1 - WGS84_E2 * sin2) ** 1.5
+    normal = WGS84_A_KM / np.sqrt(1 - WGS84_E2 * sin2)
+    # Features without a geometry count as 0 km²
+    return np.nan_to_num(shapely.area(shapely.transform(geoms, sinusoidal)) * meridian * normal)
+
+
+def feature_frame(geo_data):
+    """One row per feature: its DIMENSIONS values and MEASURES"""
+    features = geo_data['features']
+    props = [f.get('properties') or {} for f in features]
+    president = [(p.get('officials') or {}).get('president') or {} for p in props]
+    secretary = [(p.get('officials') or {}).get('secretary') or {} for p in props]
+    geoms = shapely.from_geojson(
+        np.array([json.dumps(f['geometry']) if f.get('geometry') else None for f in features], dtype=object)
+    )
+
+    frame = pd.DataFrame({
+        'district': [p.get('district') or '' for p in props],
+        'lsg_type': [p.get('lsg_type') or '' for p in props],
+        'party': [h.get('party') or '' for h in president],
+        'lsgs': 1,
+        'area_sq_km': areas_sq_km(geoms),
+        'with_officials': [
+            bool(h.get('name') or s.get('name')) for h, s in zip(president, secretary, strict=True)
+        ],
+        'with_contact': [
+            bool(h.get('contact') or h.get('email') or s.get('contact') or s.get('email'))
+            for h, s in zip(president, secretary, strict=True)
+        ],
+    }, index=pd.RangeIndex(len(features)))
+    for dimension in DIMENSIONS:
+        frame[dimension] = frame[dimension].astype(str).str.strip().replace('', UNKNOWN[dimension])
+    return frame
+
+
+def build_rollup(frame):
+    """
+    Sum the MEASURES of a feature_frame over every subset of DIMENSIONS
+
+    Returns:
+        Rollup dict (see the module header), areas rounded to 0.01 km²
+    """
+    groups = {}
+    for size in range(len(DIMENSIONS) + 1):
+        for dims in combinations(DIMENSIONS, size):
+            if dims:
+                sums = frame.groupby(list(dims), sort=True)[MEASURES].sum()
+                keys = ['|'.join(key) if isinstance(key, tuple) else key for key in sums.index]
+            else:
+                sums = frame[MEASURES].sum().to_frame().T
+                keys = ['']
+            values = sums.to_numpy(dtype=float).tolist()
+            cells = zip(keys, values, strict=True)
+            groups[','.join(dims)] = {key: _cell(row) for key, row in cells}
+    return {'format': ROLLUP_FORMAT, 'dimensions': DIMENSIONS, 'measures': MEASURES, 'groups': groups}
+
+
+def _cell(row):
+    return [
+        round(value, 2) if name == 'area_sq_km' else int(value)
+        for name, value in zip(MEASURES, row, strict=True)
+    ]
+
+
+class Rollup:
+    """Reads totals from a rollup dict without touching the features"""
+
+    def __init__(self, data):
+        if data.get('format') != ROLLUP_FORMAT:
+            raise ValueError(f"Not a {ROLLUP_FORMAT} file: {data.get('format')}")
+        self.dimensions = data['dimensions']
+        self.measures = data['measures']
+        self.groups = data['groups']
+
+    @classmethod
+    def load(cls, path=ROLLUP_FILE):
+        return cls(load_json(path))
+
+    def _group(self, dims):
+        ordered = [d for d in self.dimensions if d in dims]
+        unknown = set(dims) - set(ordered)
+        if unknown:
+            raise ValueError(f"Unknown dimension(s): {', '.join(sorted(unknown))}")
+        return ordered, self.groups[','.join(ordered)]
+
+    def get(self, **filters):
+        """
+        Measures of one cell, e.g. get(district='Kollam', lsg_type='municipality')
+
+        Dimensions left out are summed over; a cell with no LSGs is all zeros.
+        """
+        dims, group = self._group(filters)
+        values = group.get('|'.join(filters[d] for d in dims))
+        return dict(zip(self.measures, values or [0] * len(self.measures), strict=True))
+
+    def breakdown(self, by, **filters):
+        """{value of `by`: measures} within the filtered cell, e.g. breakdown('party', district='Kollam')"""
+        dims, group = self._group([by, *filters])
+        position = dims.index(by)
+        fixed = [(i, filters[d]) for i, d in enumerate(dims) if d != by]
+        result = {}
+        for key, values in group.items():
+            parts = key.split('|')
+            if all(parts[i] == value for i, value in fixed):
+                result[parts[position]] = dict(zip(self.measures, values, strict=True))
+        return result
+
+    def coverage(self, **filters):
+        """Share of the cell's LSGs with officials data (0 when empty)"""
+        cell = self.get(**filters)
+        return cell['with_officials'] / cell['lsgs'] if cell['lsgs'] else 0.0
+
+
+def rollup_features(geo_data):
+    """Rollup dict of a FeatureCollection"""
+    return build_rollup(feature_frame(geo_data))
+
@@ -0,0 +1,223 @@
+# Content-addressed snapshot store for dataset releases over time
+# Each snapshot (e.g. one per local body election or delimitation) records,
+# for every dataset, the list of feature ids with the hashes of their
+# geometry and properties (kerala_release.hash_items). The geometries and
+# properties themselves are stored once per distinct content under
+# objects/, so features unchanged between snapshots are shared and a dozen
+# releases cost little more than one plus what actually changed.
+#
+# Members of a feature outside its geometry and properties (its "id") are
+# kept in the manifest row, as a fourth element when there are any.
+#
+# Layout under the store root:
+#   snapshots/<name>.json        one manifest per snapshot
+#   objects/<hh>/<hash>.json     geometry or properties, keyed by content hash
+
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from kerala_json_io import atomic_write_bytes, dump_json, dumps, load_json
+from kerala_release import (
+    GEOJSON_PARTS,
+    dataset_hash,
+    hash_items,
+    index_items,
+    item_members,
+    join_item,
+    split_item,
+)
+
+SNAPSHOT_DIR = Path("data/snapshots")
+SNAPSHOT_FORMAT = 'kerala-lsg-snapshot/1'
+
+
+def _date(value):
+    """ISO date string of a date, datetime or string"""
+    return value.isoformat()[:10] if hasattr(value, 'isoformat') else str(value)
+
+
+class SnapshotStore:
+    """Snapshots of datasets sharing one content-addressed object store"""
+
+    def __init__(self, root=SNAPSHOT_DIR):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.snapshots_dir = self.root / "snapshots"
+        self._manifest = lru_cache(maxsize=None)(self._read_manifest)
+        self._object = lru_cache(maxsize=65536)(self._read_object)
+        self._rows = lru_cache(maxsize=None)(self._read_rows)
+
+    def _object_path(self, digest):
+        return self.objects_dir / digest[:2] / f"{digest}.json"
+
+    def _read_object(self, digest):
+        return load_json(self._object_path(digest))
+
+    def _read_manifest(self, name):
+        return load_json(self.snapshots_dir / f"{name}.json")
+
+    def _read_rows(self, name, dataset):
+        """{feature id: (geometry hash, properties hash)} of one dataset in a snapshot"""
+        entry = self._manifest(name)['datasets'].get(dataset)
+        return None if entry is None else {row[0]: (row[1], row[2]) for row in entry['features']}
+
+    def commit(self, datasets, date, name=None):
+        """
+        Record a snapshot of loaded datasets
+
+        Args:
+            datasets: {dataset name: loaded data} (FeatureCollection or search index list)
+            date: Date the snapshot describes (e.g. the election date), as-of queries use it
+            name: Snapshot name (default: the date)
+
+        Returns:
+            Stats dict: 'features', 'objects' and 'bytes' newly written, 'shared' objects reused
+
+        Raises:
+            ValueError: A snapshot with this name already exists
+        """
+        date = _date(date)
+        name = name or date
+        manifest_file = self.snapshots_dir / f"{name}.json"
+        if manifest_file.exists():
+            raise ValueError(f"Snapshot {name} already exists")
+
+        stats = {'features': 0, 'objects': 0, 'bytes': 0, 'shared': 0}
+        written = set()
+        manifest = {
+            'format': SNAPSHOT_FORMAT,
+            'name': name,
+            'date': date,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'datasets': {},
+        }
+        for dataset, data in datasets.items():
+            kind, items_by_id = index_items(data)
+            hashes = hash_items(items_by_id, kind)
+            for key, item in items_by_id.items():
+                for part, digest in zip(split_item(item, kind), hashes[key], strict=True):
+                    path = self._object_path(digest)
+                    if digest in written or path.exists():
+                        stats['shared'] += 1
+                        continue
+                    data_bytes = dumps(part, minify=True)
+                    atomic_write_bytes(data_bytes, path)
+                    written.add(digest)
+                    stats['objects'] += 1
+                    stats['bytes'] += len(data_bytes)
+
+            entry = {'kind': kind, 'hash': dataset_hash(hashes)}
+            if kind == 'geojson':
+                entry['members'] = {k: v for k, v in data.items() if k != 'features'}
+                first = data['features'][0] if data['features'] else {}
+                # Member order of a feature; a bbox is recomputed from the geometry
+                entry['template'] = {k: first[k] if k == 'type' else None for k in first}
+            entry['features'] = []
+            for key, item in items_by_id.items():
+                members = item_members(item, kind)
+                entry['features'].append([key, *hashes[key], members] if members else [key, *hashes[key]])
+            manifest['datasets'][dataset] = entry
+            stats['features'] += len(items_by_id)
+
+        # The manifest is written last, so a snapshot never names missing objects
+        dump_json(manifest, manifest_file, minify=True)
+        return stats
+
+    def snapshots(self):
+        """Snapshot summaries ({'name', 'date', 'created', 'datasets'}), oldest date first"""
+        if not self.snapshots_dir.exists():
+            return []
+        summaries = []
+        for path in self.snapshots_dir.glob("*.json"):
+            manifest = self._manifest(path.stem)
+            summaries.append({
+                'name': manifest['name'],
+                'date': manifest['date'],
+                'created': manifest['created'],
+                'datasets': {name: len(entry['features']) for name, entry in manifest['datasets'].items()},
+            })
+        return sorted(summaries, key=lambda s: (s['date'], s['created']))
+
+    def as_of(self, date):
+        """Name of the latest snapshot dated on or before `date`, or None"""
+        date = _date(date)
+        names = [s['name'] for s in self.snapshots() if s['date'] <= date]
+        return names[-1] if names else None
+
+    def load(self, name, dataset):
+        """
+        Rebuild a dataset as it was in a snapshot
+
+        Geometries and properties are shared with the object cache; copy
+        them before modifying.
+
+        Raises:
+            KeyError: The snapshot does not contain the dataset
+        """
+        entry = self._manifest(name)['datasets'][dataset]
+        kind = entry['kind']
+        template = entry.get('template', {})
+        items = []
+        for _, geometry, properties, *rest in entry['features']:
+            members = rest[0] if rest else {}
+            # The template gives member order; members this feature lacks are left out
+            base = {k: v for k, v in template.items() if k in GEOJSON_PARTS or k in members}
+            base.update(members)
+            items.append(join_item(base, self._object(geometry), self._object(properties), kind))
+        if kind == 'geojson':
+            return {**entry['members'], 'features': items}
+        return items
+
+    def load_as_of(self, date, dataset):
+        """Dataset as of a date, or None if no snapshot is that old"""
+        name = self.as_of(date)
+        return None if name is None else self.load(name, dataset)
+
+    def history(self, feature_id, dataset):
+        """
+        How one feature changed across snapshots
+
+        Returns:
+            List of {'snapshot', 'date', 'change'} in date order, one per
+            snapshot where the feature was added, removed or changed ('change'
+            is 'added', 'removed', 'geometry', 'properties' or 'both'), with
+            'geometry' and 'properties' hashes of the feature at that point
+        """
+        events = []
+        previous = None
+        for summary in self.snapshots():
+            rows = self._rows(summary['name'], dataset)
+            if rows is None:
+                continue
+            current = rows.get(feature_id)
+            if current == previous:
+                continue
+            if current is None:
+                change = 'removed'
+            elif previous is None:
+                change = 'added'
+            else:
+                names = ('geometry', 'properties')
+                hashes = zip(previous, current, strict=True)
+                parts = [name for name, (a, b) in zip(names, hashes, strict=True) if a != b]
+                change = parts[0] if len(parts) == 1 else 'both'
+            events.append({
+                'snapshot': summary['name'],
+                'date': summary['date'],
+                'change': change,
+                'geometry': current[0] if current else None,
+                'properties': current[1] if current else None,
+            })
+            previous = current
+        return events
+
+    def feature(self, name, dataset, feature_id):
+        """(geometry, properties) of one feature in a snapshot, or None"""
+        hashes = (self._rows(name, dataset) or {}).get(feature_id)
+        return None if hashes is None else (self._object(hashes[0]), self._object(hashes[1]))
+
+    def size(self):
+        """(object count, object bytes) in the store"""
+        files = list(self.objects_dir.glob("*/*.json")) if self.objects_dir.exists() else []
+        return len(files), sum(f.stat().st_size for f in files)
@@ -0,0 +1,234 @@
+# Bounding boxes and a fixed-cell grid index for viewport culling
+# Boxes are [min_lon, min_lat, max_lon, max_lat], the GeoJSON "bbox" layout.
+# Bounds are computed in one vectorized shapely.bounds() call when shapely is
+# installed, with a pure-Python coordinate walk as the fallback.
+
+import json
+import math
+
+try:
+    import numpy as np
+    import shapely
+    from shapely.geometry import shape
+except ImportError:
+    shapely = None
+
+GRID_CELL = 0.05  # degrees, ~5.5 km
+GRID_FORMAT = 'kerala-lsg-grid/1'
+BBOX_PRECISION = 6
+# Coordinate grid for stage 01 snapping: 1e-6° (~11 cm), far below boundary
+# accuracy and 100x below the finest LOD tolerance; pick with benchmark_precision.py
+DEFAULT_GRID_SIZE = 1e-6
+
+
+def _walk_bounds(coords, box):
+    """Extend `box` in place with every position in nested coordinates"""
+    if coords and isinstance(coords[0], (int, float)):
+        x, y = coords[0], coords[1]
+        if x < box[0]:
+            box[0] = x
+        if y < box[1]:
+            box[1] = y
+        if x > box[2]:
+            box[2] = x
+        if y > box[3]:
+            box[3] = y
+        return
+    for part in coords:
+        _walk_bounds(part, box)
+
+
+def geometry_bounds(geometry, precision=BBOX_PRECISION):
+    """Bounding box of one GeoJSON geometry, or None if it has no coordinates"""
+    if not geometry:
+        return None
+    box = [math.inf, math.inf, -math.inf, -math.inf]
+    if geometry.get('type') == 'GeometryCollection':
+        for part in geometry.get('geometries', []):
+            _walk_bounds(part.get('coordinates') or [], box)
+    else:
+        _walk_bounds(geometry.get('coordinates') or [], box)
+    if box[0] == math.inf:
+        return None
+    return [round(v, precision) for v in box]
+
+
+def feature_bounds(features, precision=BBOX_PRECISION):
+    """
+    Bounding boxes of many GeoJSON features in one pass
+
+    Args:
+        features: Sequence of GeoJSON feature dicts
+        precision: Decimal places kept in the boxes
+
+    Returns:
+        List of boxes aligned with `features` (None for empty geometries)
+    """
+    if shapely is None:
+        return [geometry_bounds(f.get('geometry'), precision) for f in features]
+
+    geometries = np.array(
+        [shape(f['geometry']) if f.get('geometry') else None for f in features],
+        dtype=object
+    )
+    bounds = np.round(shapely.bounds(geometries), precision)
+    return [None if np.isnan(row[0]) else row.tolist() for row in bounds]
+
+
+def repair_geometries(geoms):
+    """Fix invalid shapely geometries in place with buffer(0), as stage 03 does; returns the count"""
+    invalid = ~shapely.is_valid(geoms) & ~shapely.is_missing(geoms)
+    if invalid.any():
+        geoms[invalid] = shapely.buffer(geoms[invalid], 0)
+    return int(invalid.sum())
+
+
+def snap_geometries(geoms, grid_size):
+    """
+    Snap shapely geometries to a precision grid (degrees)
+
+    Vertices shared by neighbours land on the same grid point, so unions
+    see exactly coincident edges instead of near-misses that leave slivers.
+    The grid is not kept on the result: GEOS overlays on fixed-precision
+    geometries use snap-rounding, which is ~2-3x slower than the floating
+    overlay once the coordinates already sit on the grid.
+    """
+    if not grid_size:
+        return geoms
+    snapped = shapely.set_precision(geoms, grid_size, mode='valid_output')
+    return shapely.set_precision(snapped, 0)
+
+
+def snap_features(features, grid_size):
+    """Snap GeoJSON feature geometries in place; returns (vertices before, vertices after)"""
+    present = [f for f in features if f.get('geometry')]
+    geoms = shapely.from_geojson([json.dumps(f['geometry']) for f in present])
+    snapped = snap_geometries(geoms, grid_size)
+    for feature, text in zip(present, shapely.to_geojson(snapped), strict=True):
+        feature['geometry'] = json.loads(text)
+    return int(shapely.get_num_coordinates(geoms).sum()), int(shapely.get_num_coordinates(snapped).sum())
+
+
+def shared_vertex_report(geoms, tolerance):
+    """
+    Check that neighbouring polygons share exact vertices along their borders
+
+    A border vertex is one of A's vertices within `tolerance` of B's
+    boundary; it is matched when B has a vertex at exactly the same
+    coordinates. Overlap is the summed area where neighbours intersect.
+
+    Returns:
+        {'pairs', 'border_vertices', 'unmatched', 'overlap_area'}
+    """
+    geoms = np.asarray(geoms, dtype=object)
+    left, right = shapely.STRtree(geoms).query(geoms, predicate='intersects')
+    keep = left < right
+    left, right = left[keep], right[keep]
+
+    coords = [np.unique(shapely.get_coordinates(g), axis=0) for g in geoms]
+    vertex_sets = [None] * len(geoms)
+    boundaries = shapely.boundary(geoms)
+    border = unmatched = 0
+    for a, b in zip(left.tolist(), right.tolist(), strict=True):
+        for this, other in ((a, b), (b, a)):
+            points = coords[this]
+            near = shapely.dwithin(shapely.points(points), boundaries[other], tolerance)
+            if not near.any():
+                continue
+            if vertex_sets[other] is None:
+                vertex_sets[other] = set(map(tuple, coords[other].tolist()))
+            on_border = points[near].tolist()
+            border += len(on_border)
+            unmatched += sum(1 for xy in on_border if tuple(xy) not in vertex_sets[other])
+    overlap = shapely.area(shapely.intersection(geoms[left], geoms[right])).sum() if len(left) else 0.0
+    return {'pairs': len(left), 'border_vertices': border, 'unmatched': unmatched,
+            'overlap_area': float(overlap)}
+
+
+def lod_precision(tolerance):
+    """Decimal places that keep rounding error ~10x below a simplification tolerance"""
+    return math.ceil(-math.log10(tolerance)) + 1
+
+
+def lod_max_zoom(tolerance):
+    """Highest web-map zoom at which a tolerance stays under ~1 pixel (256px tiles)"""
+    return math.floor(math.log2(360 / (256 * tolerance)))
+
+
+def union_bounds(boxes):
+    """Box covering every non-empty box, or None"""
+    boxes = [b for b in boxes if b]
+    if not boxes:
+        return None
+    return [
+        min(b[0] for b in boxes), min(b[1] for b in boxes),
+        max(b[2] for b in boxes), max(b[3] for b in boxes),
+    ]
+
+
+def group_bounds(keys, boxes):
+    """{key: union box} for boxes grouped by a parallel key list (e.g. district)"""
+    groups = {}
+    for key, box in zip(keys, boxes, strict=True):
+        if key and box:
+            groups.setdefault(key, []).append(box)
+    return {key: union_bounds(group) for key, group in sorted(groups.items())}
+
+
+def intersects(a, b):
+    """True when two boxes overlap or touch"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def cell_key(ix, iy):
+    return f"{ix}:{iy}"
+
+
+def cells_for_bbox(bbox, cell=GRID_CELL):
+    """Keys of every grid cell a box touches"""
+    x0, y0 = math.floor(bbox[0] / cell), math.floor(bbox[1] / cell)
+    x1, y1 = math.floor(bbox[2] / cell), math.floor(bbox[3] / cell)
+    for ix in range(x0, x1 + 1):
+        for iy in range(y0, y1 + 1):
+            yield cell_key(ix, iy)
+
+
+def build_grid(ids, boxes, cell=GRID_CELL):
+    """
+    Static grid index: cell key "ix:iy" -> ids of features whose box touches it
+
+    Cell (ix, iy) covers lon [ix*cell, (ix+1)*cell) and lat [iy*cell, (iy+1)*cell).
+    """
+    cells = {}
+    for feature_id, box in zip(ids, boxes, strict=True):
+        if box:
+            for key in cells_for_bbox(box, cell):
+                cells.setdefault(key, []).append(feature_id)
+    return {'format': GRID_FORMAT, 'cell': cell, 'cells': cells}
+
+
+class GridIndex:
+    """Viewport queries over feature boxes, via the fixed-cell grid"""
+
+    def __init__(self, ids, boxes, cell=GRID_CELL):
+        self.cell = cell
+        self.boxes = {i: b for i, b in zip(ids, boxes, strict=True) if b}
+        self.cells = build_grid(self.boxes.keys(), self.boxes.values(), cell)['cells']
+        self.extent = union_bounds(self.boxes.values())
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def query(self, bbox):
+        """Ids of features whose box intersects `bbox`, in first-seen cell order"""
+        if not self.extent or not intersects(self.extent, bbox):
+            return []
+        # Clip to the data extent so a zoomed-out viewport walks few cells
+        clipped = [max(bbox[0], self.extent[0]), max(bbox[1], self.extent[1]),
+                   min(bbox[2], self.extent[2]), min(bbox[3], self.extent[3])]
+        found = {}
+        for key in cells_for_bbox(clipped, self.cell):
+            for feature_id in self.cells.get(key, ()):
+                if feature_id not in found and intersects(self.boxes[feature_id], bbox):
+                    found[feature_id] = None
+        return list(found)
@@ -0,0 +1,147 @@
+# Pre-rendered SVG boundary thumbnails for LSGs and districts
+# An LSG is drawn filled inside its district, with the district's other LSGs
+# as faint outlines; a district is drawn inside the state. Geometry is
+# simplified to the image's pixel grid, so a thumbnail is a few KB however
+# detailed the boundary.
+#
+# Every image is named by a hash of everything drawn in it (the feature, its
+# context, the size and RENDER_VERSION), so a rerun only renders thumbnails
+# whose geometry or surroundings changed. Work is split into one task per
+# district (render_group), which shares the district's context drawing
+# between its LSGs and runs in a process pool.
+
+import hashlib
+import math
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from kerala_json_io import atomic_write_bytes
+
+THUMBNAIL_SIZE = 128  # pixels along the longer side
+PADDING = 4
+RENDER_VERSION = 1  # bump when the drawing changes, so every thumbnail is redrawn
+MIN_TARGET_PX = 4  # features smaller than this also get a dot, so they stay visible
+
+STYLE = {
+    'context': 'fill="#f1f5f9" stroke="#cbd5e1" stroke-width="0.5"',
+    'outline': 'fill="none" stroke="#0d9488" stroke-width="1.2"',
+    'target': 'fill="#10b981" fill-opacity="0.85" stroke="#047857" stroke-width="1"',
+    'dot': 'fill="#047857"',
+}
+
+
+class Viewport:
+    """Maps lon/lat into a thumbnail's pixels, keeping the shape's proportions"""
+
+    def __init__(self, bounds, size=THUMBNAIL_SIZE, padding=PADDING):
+        minx, miny, maxx, maxy = bounds
+        # A degree of longitude is shorter than one of latitude away from the equator
+        self.kx = math.cos(math.radians((miny + maxy) / 2))
+        width, height = (maxx - minx) * self.kx, maxy - miny
+        self.scale = (size - 2 * padding) / max(width, height, 1e-9)
+        self.origin = (minx, maxy)
+        self.padding = padding
+        self.width = math.ceil(width * self.scale) + 2 * padding
+        self.height = math.ceil(height * self.scale) + 2 * padding
+        # Half a pixel, in degrees
+        self.tolerance = 0.5 / self.scale
+
+    def pixels(self, coords):
+        x = (coords[:, 0] - self.origin[0]) * self.kx * self.scale + self.padding
+        y = (self.origin[1] - coords[:, 1]) * self.scale + self.padding
+        return np.round(np.column_stack([x, y]), 1)
+
+    def path(self, geoms):
+        """SVG path data of (multi)polygons, simplified to the pixel grid"""
+        geoms = np.atleast_1d(np.asarray(geoms, dtype=object))
+        simplified = shapely.simplify(geoms, self.tolerance, preserve_topology=True)
+        rings = shapely.get_rings(shapely.get_parts(simplified))
+        coords, ring_index = shapely.get_coordinates(rings, return_index=True)
+        if not len(coords):
+            return ''
+        xy = self.pixels(coords)
+        # Drop points that land on the previous one's pixel
+        keep = np.r_[True, (xy[1:] != xy[:-1]).any(axis=1) | (ring_index[1:] != ring_index[:-1])]
+        xy, ring_index = xy[keep], ring_index[keep]
+
+        commands = []
+        starts = np.r_[0, np.flatnonzero(ring_index[1:] != ring_index[:-1]) + 1, len(xy)]
+        for start, end in zip(starts[:-1].tolist(), starts[1:].tolist(), strict=True):
+            # Z closes the ring, so its repeated first point is left out
+            if end - start < 4:
+                continue
+            points = ' '.join(f"{x:g},{y:g}" for x, y in xy[start:end - 1].tolist())
+            commands.append(f"M{points}Z")
+        return ''.join(commands)
+
+    def extent(self, geom):
+        """Larger side of a geometry's bounding box, in pixels"""
+        minx, miny, maxx, maxy = shapely.bounds(geom)
+        return max((maxx - minx) * self.kx, maxy - miny) * self.scale
+
+
+def render_svg(viewport, target, context_path='', outline_path=''):
+    """SVG document with the target drawn over the (pre-rendered) context paths"""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{viewport.width}" height="{viewport.height}" '
+        f'viewBox="0 0 {viewport.width} {viewport.height}">'
+    ]
+    if context_path:
+        parts.append(f'<path d="{context_path}" {STYLE["context"]} fill-rule="evenodd"/>')
+    if outline_path:
+        parts.append(f'<path d="{outline_path}" {STYLE["outline"]} fill-rule="evenodd"/>')
+    target_path = viewport.path(target)
+    if target_path:
+        parts.append(f'<path d="{target_path}" {STYLE["target"]} fill-rule="evenodd"/>')
+    if not target_path or viewport.extent(target) < MIN_TARGET_PX:
+        x, y = viewport.pixels(shapely.get_coordinates(shapely.point_on_surface(target)))[0].tolist()
+        parts.append(f'<circle cx="{x:g}" cy="{y:g}" r="2.5" {STYLE["dot"]}/>')
+    parts.append('</svg>')
+    return '\n'.join(parts).encode('utf-8')
+
+
+def group_digests(group, size=THUMBNAIL_SIZE):
+    """
+    Content hash of every thumbnail in a group
+
+    Args:
+        group: {'bounds', 'context' (WKB list), 'outline' (WKB or None),
+                'targets' ([(key, WKB), ...])}
+
+    Returns:
+        {key: 16-character hex digest}
+    """
+    base = hashlib.sha256(f"{RENDER_VERSION}:{size}:{group['bounds']}".encode('utf-8'))
+    for wkb in group['context']:
+        base.update(wkb)
+    base.update(b'outline:' + (group['outline'] or b''))
+    digests = {}
+    for key, wkb in group['targets']:
+        digest = base.copy()
+        digest.update(b'target:' + wkb)
+        digests[key] = digest.hexdigest()[:16]
+    return digests
+
+
+def render_group(group, out_dir, size=THUMBNAIL_SIZE):
+    """
+    Render one group's thumbnails to <out_dir>/<digest>.svg
+
+    Runs in a worker process; `group` holds WKB so it pickles cheaply, and
+    its 'targets' are only the thumbnails that need drawing.
+
+    Returns:
+        Bytes written
+    """
+    viewport = Viewport(group['bounds'], size)
+    context_path = viewport.path(shapely.from_wkb(group['context'])) if group['context'] else ''
+    outline_path = viewport.path(shapely.from_wkb(group['outline'])) if group['outline'] else ''
+
+    written = 0
+    for digest, wkb in group['targets']:
+        data = render_svg(viewport, shapely.from_wkb(wkb), context_path, outline_path)
+        atomic_write_bytes(data, Path(out_dir) / f"{digest}.svg")
+        written += len(data)
+    return written
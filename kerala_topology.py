@@ -0,0 +1,203 @@
+# Shared-edge topology of the LSG layer
+# Every polygon ring is cut into arcs at junctions (vertices where three or
+# more edges meet) and each arc is stored once, however many LSGs use it.
+# Simplifying the arcs instead of the polygons moves a shared border the same
+# way on both sides, and a district is assembled from the arcs used by only
+# one of its LSGs, so LSG and district layers built from one Topology line up
+# exactly at every tolerance. Dropping internal arcs is also much cheaper
+# than a polygon union.
+#
+# Arcs are matched on exact coordinates. Stage 01 snaps the layer to a
+# precision grid so neighbours share vertices. Gaps and unmatched vertices on
+# a border still assemble correctly; a district whose LSGs overlap fails the
+# area check in dissolve() and is left for the caller to union instead.
+
+import numpy as np
+import shapely
+
+POLYGON = 3  # shapely type id; anything else comes back as a MultiPolygon
+AREA_TOLERANCE = 1e-9  # relative; a clean coverage's union area is the sum of its parts
+
+
+class Topology:
+    """Arcs and per-ring arc references of a polygon coverage"""
+
+    def __init__(self, geometries):
+        geoms = np.asarray(geometries, dtype=object)
+        self.size = len(geoms)
+        self.types = shapely.get_type_id(geoms)
+
+        parts, part_feature = shapely.get_parts(geoms, return_index=True)
+        rings, ring_part = shapely.get_rings(parts, return_index=True)
+        coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+        self.part_feature = part_feature
+        self.ring_part = ring_part
+        self.exterior = np.r_[True, ring_part[1:] != ring_part[:-1]]
+
+        # Open rings without repeated points
+        last = np.r_[coord_ring[1:] != coord_ring[:-1], True]
+        repeat = np.r_[False, (coords[1:] == coords[:-1]).all(axis=1) & (coord_ring[1:] == coord_ring[:-1])]
+        keep = ~last & ~repeat
+        coords, coord_ring = coords[keep], coord_ring[keep]
+
+        xy = np.ascontiguousarray(coords).view(np.complex128).ravel()
+        unique, vertex = np.unique(xy, return_inverse=True)
+        self.xy = np.column_stack([unique.real, unique.imag])
+
+        # Junctions: vertices with other than two distinct neighbours
+        starts = np.r_[0, np.flatnonzero(coord_ring[1:] != coord_ring[:-1]) + 1]
+        ends = np.r_[starts[1:], len(vertex)]
+        following = np.arange(1, len(vertex) + 1)
+        following[ends - 1] = starts
+        n = len(unique)
+        lo = np.minimum(vertex, vertex[following]).astype(np.int64)
+        hi = np.maximum(vertex, vertex[following]).astype(np.int64)
+        edges = np.unique(lo * n + hi)
+        edges = edges[edges // n != edges % n]
+        junction = np.bincount(np.r_[edges // n, edges % n], minlength=n) != 2
+
+        arc_index = {}
+        self.arcs = []
+        self.ring_refs = [None] * len(rings)
+        rings_at = coord_ring[starts].tolist()
+        for ring, start, end in zip(rings_at, starts.tolist(), ends.tolist(), strict=True):
+            v = vertex[start:end]
+            if len(v) > 1 and v[-1] == v[0]:
+                v = v[:-1]
+            if len(v) < 3:
+                continue
+            cuts = np.flatnonzero(junction[v])
+            if len(cuts) == 0:
+                # A ring on its own (island, enclave): start at its lowest vertex
+                # so every copy of it yields the same arc
+                first = int(np.argmin(v))
+                pieces = [np.r_[v[first:], v[:first], v[first]]]
+            else:
+                closed = np.r_[v[cuts[0]:], v[:cuts[0] + 1]]
+                bounds = np.r_[cuts - cuts[0], len(v)]
+                pieces = [closed[bounds[i]:bounds[i + 1] + 1] for i in range(len(cuts))]
+
+            refs = []
+            for piece in pieces:
+                forward = piece[0] < piece[-1] or (piece[0] == piece[-1] and piece[1] <= piece[-2])
+                arc = piece if forward else piece[::-1]
+                key = arc.tobytes()
+                index = arc_index.get(key)
+                if index is None:
+                    index = arc_index[key] = len(self.arcs)
+                    self.arcs.append(arc)
+                refs.append(index if forward else ~index)
+            self.ring_refs[ring] = refs
+
+    def __len__(self):
+        return len(self.arcs)
+
+    def arc_coordinates(self, tolerance=None):
+        """
+        Coordinates of every arc, optionally simplified
+
+        All arcs are simplified together with topology preserved, so no arc
+        crosses or collapses onto another and arc ends (junctions) stay put.
+
+        Returns:
+            List of (n, 2) arrays, one per arc
+        """
+        base = [self.xy[arc] for arc in self.arcs]
+        if not tolerance or not base:
+            return base
+        lengths = np.array([len(arc) for arc in self.arcs])
+        lines = shapely.linestrings(np.concatenate(base), indices=np.repeat(np.arange(len(base)), lengths))
+        simplified = shapely.get_parts(shapely.simplify(shapely.multilinestrings(lines), tolerance,
+                                                        preserve_topology=True))
+        if len(simplified) != len(base):
+            raise ValueError("Simplification changed the number of arcs")
+        return [shapely.get_coordinates(line) for line in simplified]
+
+    def _ring_coordinates(self, refs, arcs):
+        pieces = [arcs[ref] if ref >= 0 else arcs[~ref][::-1] for ref in refs]
+        return np.concatenate([pieces[0]] + [piece[1:] for piece in pieces[1:]])
+
+    def polygons(self, arcs=None):
+        """
+        The input geometries rebuilt from (simplified) arcs
+
+        Returns:
+            Object array of one geometry per input, None where the input had none
+        """
+        arcs = self.arc_coordinates() if arcs is None else arcs
+        usable = [r for r, refs in enumerate(self.ring_refs) if refs is not None]
+        # A part whose shell collapsed is dropped with its holes
+        shells = {self.ring_part[r] for r in usable if self.exterior[r]}
+        usable = [r for r in usable if self.ring_part[r] in shells]
+
+        out = np.full(self.size, None, dtype=object)
+        if not usable:
+            return out
+        ring_coords = [self._ring_coordinates(self.ring_refs[r], arcs) for r in usable]
+        rings = shapely.linearrings(np.concatenate(ring_coords),
+                                    indices=np.repeat(np.arange(len(usable)), [len(c) for c in ring_coords]))
+        parts_of_rings = self.ring_part[usable]
+        parts = shapely.polygons(rings, indices=np.unique(parts_of_rings, return_inverse=True)[1])
+        part_ids = np.unique(parts_of_rings)
+        features = self.part_feature[part_ids]
+        feature_ids, feature_slot = np.unique(features, return_inverse=True)
+        multi = shapely.multipolygons(parts, indices=feature_slot)
+        single = self.types[feature_ids] == POLYGON
+        multi[single] = shapely.get_geometry(multi[single], 0)
+        out[feature_ids] = multi
+        return out
+
+    def dissolve(self, labels, arcs=None):
+        """
+        Merge the polygons of each label by dropping the arcs shared inside it
+
+        Args:
+            labels: One group label per input geometry (None to leave out)
+            arcs: arc_coordinates() at the wanted tolerance (default: unsimplified)
+
+        Returns:
+            {label: (geometry, ok)} - ok is False when the merged area differs
+            from the members' total, i.e. they are not a clean coverage
+        """
+        arcs = self.arc_coordinates() if arcs is None else arcs
+        members = self.polygons(arcs)
+        areas = shapely.area(members)
+        groups = {}
+        for feature, label in enumerate(labels):
+            if label is not None and members[feature] is not None:
+                groups.setdefault(label, []).append(feature)
+
+        # Arc uses per feature, for counting uses inside a group
+        uses = {}
+        for ring, refs in enumerate(self.ring_refs):
+            if refs is not None:
+                feature = int(self.part_feature[self.ring_part[ring]])
+                uses.setdefault(feature, []).extend(ref if ref >= 0 else ~ref for ref in refs)
+
+        result = {}
+        for label, features in groups.items():
+            used = np.concatenate([np.asarray(uses.get(f, []), dtype=np.int64) for f in features])
+            arc_ids, counts = np.unique(used, return_counts=True)
+            outline = arc_ids[counts % 2 == 1]
+            geometry = _assemble([arcs[a] for a in outline.tolist()])
+            expected = areas[features].sum()
+            ok = geometry is not None and shapely.is_valid(geometry) and \
+                abs(shapely.area(geometry) - expected) <= AREA_TOLERANCE * max(expected, 1e-12)
+            result[label] = (geometry, bool(ok))
+        return result
+
+
+def _assemble(lines):
+    """Polygon(s) enclosed by outline arcs; faces nested an odd number of times are holes"""
+    if not lines:
+        return None
+    lines = shapely.linestrings(np.concatenate(lines),
+                                indices=np.repeat(np.arange(len(lines)), [len(line) for line in lines]))
+    faces = shapely.get_parts(shapely.polygonize(lines))
+    if len(faces) == 0:
+        return None
+    shells = shapely.polygons(shapely.get_exterior_ring(faces))
+    inside, _ = shapely.STRtree(shells).query(shapely.point_on_surface(faces), predicate='within')
+    depth = np.bincount(inside, minlength=len(faces)) - 1
+    kept = faces[depth % 2 == 0]
+    return kept[0] if len(kept) == 1 else shapely.multipolygons(kept)
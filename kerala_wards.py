@@ -0,0 +1,232 @@
+# Ward-level processing: ~21,900 wards under ~1200 LSGs
+# Wards are streamed from disk, matched to their parent LSG and spooled into
+# one line-delimited file per district. Each district is then processed on
+# its own (dissolve wards -> LSGs -> district, simplify, index), so peak
+# memory is bounded by the largest district rather than the whole state.
+
+import re
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+from kerala_json_io import dumps, iter_features, loads
+from kerala_lsg_records import WardEntry, stable_feature_id, unique_ids
+from kerala_spatial import lod_precision, repair_geometries
+
+# Simplification per level (degrees); wards are ~1-3 km across
+WARD_TOLERANCES = [0.0001, 0.0005]
+LSG_TOLERANCE = 0.001
+DISTRICT_TOLERANCE = 0.005
+FULL_PRECISION = 7  # ~1 cm, for the unsimplified ward layer
+
+# Ward properties that may hold the parent LSG key, tried in order
+PARENT_PROPERTIES = ('lsg_id', 'lsg_wikidata', 'lsg_code', 'lsg', 'lsg_name')
+WARD_NAME_PROPERTIES = ('ward_name', 'name')
+WARD_NO_PROPERTIES = ('ward_no', 'ward_number', 'ward')
+
+UNMATCHED = 'Unknown'
+
+_SUFFIX = re.compile(
+    r'\s+(municipal corporation|corporation|municipality|grama ?panchayath?|'
+    r'block panchayat|district panchayat|panchayath?)$'
+)
+
+
+def lsg_name_key(name):
+    """Casefolded LSG name without its type suffix ("Vorkady Grama Panchayat" -> "vorkady")"""
+    key = ' '.join(str(name or '').casefold().split())
+    return _SUFFIX.sub('', key)
+
+
+def _first(props, names):
+    for name in names:
+        value = props.get(name)
+        if value not in (None, ''):
+            return str(value).strip()
+    return ''
+
+
+class ParentIndex:
+    """Finds a ward's parent LSG by wikidata id, lsg_id, stable id or name"""
+
+    def __init__(self, lsg_features):
+        self.by_key = {}
+        self.by_district_name = {}
+        names = defaultdict(list)
+
+        props_list = [feature['properties'] for feature in lsg_features]
+        parent_ids = unique_ids(stable_feature_id(p) for p in props_list)
+        for props, parent_id in zip(props_list, parent_ids, strict=True):
+            parent = {
+                'parent_id': parent_id,
+                'lsg': props.get('name') or '',
+                'lsg_type': props.get('lsg_type') or '',
+                'district': props.get('district') or UNMATCHED,
+            }
+            for key in (props.get('wikidata'), props.get('lsg_id'), parent_id):
+                if key:
+                    self.by_key[str(key).strip().upper()] = parent
+            name = lsg_name_key(parent['lsg'])
+            names[name].append(parent)
+            self.by_district_name[(parent['district'].casefold(), name)] = parent
+
+        # A bare name only identifies an LSG if no other district uses it
+        self.by_name = {name: parents[0] for name, parents in names.items() if len(parents) == 1}
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def find(self, value, district=''):
+        """Parent dict for a ward's parent key, or None"""
+        if not value:
+            return None
+        parent = self.by_key.get(value.upper())
+        if parent is None:
+            name = lsg_name_key(value)
+            parent = self.by_district_name.get((district.casefold(), name)) or self.by_name.get(name)
+        return parent
+
+
+def annotate_ward(props, parents, parent_property=None):
+    """
+    Replace a raw ward's properties with the pipeline's ward properties
+
+    Returns:
+        The annotated properties (district is 'Unknown' when no parent matched)
+    """
+    key = props.get(parent_property) if parent_property else _first(props, PARENT_PROPERTIES)
+    parent = parents.find(str(key or '').strip(), _first(props, ('district', 'District')))
+    annotated = {
+        'name': _first(props, WARD_NAME_PROPERTIES),
+        'ward_no': _first(props, WARD_NO_PROPERTIES),
+    }
+    if parent:
+        annotated.update(parent)
+    else:
+        annotated.update({'parent_id': '', 'lsg': str(key or ''), 'lsg_type': '', 'district': UNMATCHED})
+    return annotated
+
+
+def partition_wards(ward_file, parents, spool_dir, parent_property=None, chunk_size=1 << 20):
+    """
+    Stream a ward layer into one spool file per district
+
+    Each spool line is the annotated properties and the geometry as two
+    JSON documents separated by a tab, so geometries can later be parsed
+    in one vectorized shapely.from_geojson() call.
+
+    Returns:
+        {district: ward count}
+    """
+    spool_dir = Path(spool_dir)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    handles = {}
+    counts = defaultdict(int)
+    try:
+        for feature in iter_features(ward_file, chunk_size):
+            props = annotate_ward(feature.get('properties') or {}, parents, parent_property)
+            district = props['district']
+            handle = handles.get(district)
+            if handle is None:
+                handle = handles[district] = open(spool_dir / f"{district}.jsonl", 'wb')
+            handle.write(dumps(props, minify=True) + b'\t' + dumps(feature.get('geometry'), minify=True) + b'\n')
+            counts[district] += 1
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return dict(counts)
+
+
+def read_partition(spool_file):
+    """(properties list, geometry JSON list) of one spooled district"""
+    props, geometries = [], []
+    with open(spool_file, 'rb') as f:
+        for line in f:
+            props_json, geometry_json = line.rstrip(b'\n').split(b'\t', 1)
+            props.append(loads(props_json))
+            geometries.append(None if geometry_json == b'null' else geometry_json.decode('utf-8'))
+    return props, geometries
+
+
+def geojson_strings(geoms, precision):
+    """GeoJSON geometry strings with coordinates rounded, all in vectorized calls"""
+    rounded = shapely.transform(geoms, lambda coords: np.round(coords, precision))
+    return shapely.to_geojson(rounded)
+
+
+def encode_feature(feature_id, props, geometry_json):
+    """Serialized GeoJSON feature from its parts and a geometry JSON string"""
+    head = dumps({'type': 'Feature', 'id': feature_id, 'properties': props}, minify=True)
+    return head[:-1] + b',"geometry":' + geometry_json.encode('utf-8') + b'}'
+
+
+def process_partition(props, geometries, ward_tolerances=WARD_TOLERANCES,
+                      lsg_tolerance=LSG_TOLERANCE, district_tolerance=DISTRICT_TOLERANCE):
+    """
+    Dissolve, simplify and index one district's wards
+
+    Args:
+        props, geometries: One spooled district, from read_partition
+
+    Returns:
+        Dict of serialized features - 'wards' (full resolution), 'ward_levels'
+        ({tolerance: features}), 'lsgs' and 'district' (dissolved; None for
+        unmatched wards) - plus 'entries' (WardEntry without ids) and 'repaired'
+    """
+    geoms = shapely.from_geojson(np.array(geometries, dtype=object))
+    repaired = repair_geometries(geoms)
+    present = ~shapely.is_missing(geoms)
+    rows = np.flatnonzero(present)
+
+    district = props[0]['district'] if props else UNMATCHED
+    ward_ids = unique_ids(
+        f"{p['parent_id'] or 'unmatched'}/ward-{p['ward_no'] or lsg_name_key(p['name']).replace(' ', '-')}"
+        for p in props
+    )
+
+    def encode_level(level_geoms, precision):
+        strings = geojson_strings(level_geoms[rows], precision)
+        return [encode_feature(ward_ids[i], props[i], text)
+                for i, text in zip(rows, strings, strict=True)]
+
+    result = {'wards': encode_level(geoms, FULL_PRECISION), 'ward_levels': {}, 'lsgs': [], 'district': None}
+    for tolerance in ward_tolerances:
+        simplified = shapely.simplify(geoms, tolerance, preserve_topology=True)
+        repaired += repair_geometries(simplified)
+        result['ward_levels'][tolerance] = encode_level(simplified, lod_precision(tolerance))
+    result['repaired'] = repaired
+
+    centroids = np.round(shapely.get_coordinates(shapely.centroid(geoms[rows])), 6)
+    bounds = np.round(shapely.bounds(geoms[rows]), 6)
+    result['entries'] = [
+        WardEntry(
+            id=0, ward_id=ward_ids[i], ward_no=props[i]['ward_no'], name=props[i]['name'],
+            lsg=props[i]['lsg'], parent_id=props[i]['parent_id'], lsg_type=props[i]['lsg_type'],
+            district=props[i]['district'], centroid=tuple(centroid.tolist()), bbox=tuple(box.tolist()),
+        )
+        for i, centroid, box in zip(rows, centroids, bounds, strict=True)
+    ]
+
+    if district == UNMATCHED:
+        return result
+
+    # Hierarchical dissolve: wards -> LSGs -> district
+    groups = defaultdict(list)
+    for i in rows:
+        groups[props[i]['parent_id']].append(i)
+    parent_ids = list(groups)
+    lsg_geoms = np.array([shapely.union_all(geoms[members]) for members in groups.values()], dtype=object)
+    lsg_strings = geojson_strings(shapely.simplify(lsg_geoms, lsg_tolerance), lod_precision(lsg_tolerance))
+    for parent_id, members, text in zip(parent_ids, groups.values(), lsg_strings, strict=True):
+        p = props[members[0]]
+        lsg_props = {'name': p['lsg'], 'district': district, 'lsg_type': p['lsg_type'], 'ward_count': len(members)}
+        result['lsgs'].append(encode_feature(parent_id, lsg_props, text))
+
+    district_geom = shapely.simplify(shapely.union_all(lsg_geoms), district_tolerance)
+    district_props = {'name': district, 'district': district, 'lsg_count': len(groups), 'ward_count': len(rows)}
+    result['district'] = encode_feature(
+        district, district_props, geojson_strings(np.array([district_geom]), lod_precision(district_tolerance))[0]
+    )
+    return result
@@ -23,9 +23,18 @@ if [ ! -f "data/raw/kerala_lsg_data.geojson" ]; then
     exit 1
 fi
 
+# Scripts import shared modules (kerala_district_mapping, kerala_json_io) from the repo root
+export PYTHONPATH="$(pwd)${PYTHONPATH:+:$PYTHONPATH}"
+
 echo "✓ Environment ready"
 echo ""
 
+# --parallel: run independent stages side by side (scripts/run_pipeline.py)
+if [ "$1" = "--parallel" ]; then
+    shift
+    exec python scripts/run_pipeline.py "$@"
+fi
+
 # Script 1: Add district field
 echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
 echo "Step 1/5: Adding district field to LSG data"
@@ -59,6 +68,12 @@ if [ $? -ne 0 ]; then
 fi
 echo ""
 
+# Boundary thumbnails for result cards and reports (cached; only changed ones are redrawn)
+if ! python scripts/render_thumbnails.py; then
+    echo "⚠️  Thumbnail rendering failed; the map works without thumbnails"
+fi
+echo ""
+
 # Check if officials data exists
 if [ -f "data/raw/lsg_officials.csv" ]; then
     HAS_OFFICIALS=true
@@ -87,6 +102,19 @@ else
 fi
 echo ""
 
+# Optional: constituency overlay (only when boundary files have been added)
+if [ "$SKIP_SEARCH" = false ] && { [ -f "data/raw/assembly_constituencies.geojson" ] || [ -f "data/raw/parliamentary_constituencies.geojson" ]; }; then
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    echo "Optional: Overlaying constituency boundaries"
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    python scripts/overlay_constituencies.py
+    if [ $? -ne 0 ]; then
+        echo "❌ Constituency overlay failed"
+        exit 1
+    fi
+    echo ""
+fi
+
 # Script 5: Generate search index
 if [ "$SKIP_SEARCH" = false ]; then
     echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -97,6 +125,13 @@ if [ "$SKIP_SEARCH" = false ]; then
         echo "❌ Script 5 failed"
         exit 1
     fi
+
+    # District / LSG type / party aggregates for the query library and the web app
+    python scripts/build_rollup.py
+    if [ $? -ne 0 ]; then
+        echo "❌ Rollup failed"
+        exit 1
+    fi
 else
     echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
     echo "Step 5/5: Skipping search index (no final data)"
@@ -104,6 +139,19 @@ else
 fi
 echo ""
 
+# Optional: ward layer (only when a raw ward layer has been added)
+if [ -f "data/raw/kerala_wards.geojson" ]; then
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    echo "Optional: Processing ward layer"
+    echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+    python scripts/06_process_wards.py
+    if [ $? -ne 0 ]; then
+        echo "❌ Script 6 failed"
+        exit 1
+    fi
+    echo ""
+fi
+
 # Summary
 echo "========================================="
 echo "PROCESSING COMPLETE!"
@@ -118,6 +166,7 @@ echo "  ✓ data/processed/kerala_districts_simplified.geojson"
 if [ "$SKIP_SEARCH" = false ]; then
     echo "  ✓ data/processed/kerala_lsg_final.geojson"
     echo "  ✓ data/processed/search_index.json"
+    echo "  ✓ data/processed/rollup.json"
 else
     echo "  ⚠️  kerala_lsg_final.geojson (partial - no officials data)"
     echo "  ⚠️  search_index.json (not generated)"
@@ -145,16 +194,9 @@ echo "   - kerala_districts_simplified.geojson - Base layer"
 echo "   - search_index.json - Search functionality"
 echo ""
 
-# Automated copy to web app
+# Publish to web app: content-hashed names, gzip/brotli variants and manifest.json
 echo "Syncing data with web application..."
-mkdir -p web-app/static/data
-cp data/processed/kerala_lsg_final.geojson web-app/static/data/
-cp data/processed/kerala_districts.geojson web-app/static/data/
-cp data/processed/search_index.json web-app/static/data/
-# Copy Mahe if exists
-if [ -f data/raw/mahe_boundary.geojson ]; then
-    cp data/raw/mahe_boundary.geojson web-app/static/data/
-fi
+python scripts/publish_static.py
 echo "✓ Data synced to web-app/static/data/"
 echo ""
 
@@ -4,12 +4,24 @@ Script 1: Add district field to LSG GeoJSON
 Matches LSG names to districts using the district mapping
 """
 
+import argparse
 import json
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
 # Import district mapping
-from kerala_district_mapping import get_lsg_to_district_mapping
+from kerala_district_mapping import get_lsg_to_district_mapping  # noqa: E402
+from kerala_json_io import dump_feature_collection, load_json  # noqa: E402
+
+try:
+    import shapely
+
+    from kerala_spatial import DEFAULT_GRID_SIZE, shared_vertex_report, snap_features
+except ImportError:
+    shapely = None
+    DEFAULT_GRID_SIZE = 0
 
 
 def normalize_name(name):
@@ -43,14 +55,29 @@ def normalize_name(name):
 
     return normalized.title()
 
-def add_district_field(input_file, output_file):
-    """Add district field to each LSG feature in GeoJSON"""
+def snap_to_grid(features, grid_size):
+    """Snap geometries to the precision grid and check neighbours still share border vertices"""
+    if shapely is None:
+        print("\nNote: shapely is not installed, skipping precision snapping (pip install shapely)")
+        return
+    before, after = snap_features(features, grid_size)
+    print(f"\nSnapped to a {grid_size:g}° grid: {before:,} -> {after:,} vertices")
+    geoms = shapely.from_geojson([json.dumps(f['geometry']) for f in features if f.get('geometry')])
+    report = shared_vertex_report(geoms, grid_size * 2)
+    print(f"  Neighbour pairs: {report['pairs']:,}, border vertices: {report['border_vertices']:,}")
+    if report['unmatched']:
+        print(f"  Warning: {report['unmatched']} border vertices have no exact match on the neighbour "
+              "(T-junctions or a grid too coarse)")
+    if report['overlap_area']:
+        print(f"  Warning: neighbours overlap by {report['overlap_area']:.3g} sq deg")
+
+def add_district_field(input_file, output_file, grid_size=DEFAULT_GRID_SIZE):
+    """Add district field to each LSG feature in GeoJSON, snapping geometries to `grid_size` degrees (0 = off)"""
 
     print(f"Reading {input_file}...")
 
     try:
-        with open(input_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = load_json(input_file)
     except FileNotFoundError:
         print(f"Error: File not found: {input_file}")
         print("Please run setup.sh first to download the data")
@@ -131,10 +158,12 @@ def add_district_field(input_file, output_file):
         props['lsg_type'] = lsg_type
         features_by_type[lsg_type] = features_by_type.get(lsg_type, 0) + 1
 
+    if grid_size:
+        snap_to_grid(data['features'], grid_size)
+
     # Save updated GeoJSON
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    dump_feature_collection(data, output_file)
 
     # Print summary
     print("\n" + "="*60)
@@ -166,6 +195,11 @@ def add_district_field(input_file, output_file):
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Add district and LSG type fields to the raw LSG layer")
+    parser.add_argument('--grid-size', type=float, default=DEFAULT_GRID_SIZE,
+                        help=f"Precision grid for coordinates in degrees, 0 to keep them as-is "
+                             f"(default: {DEFAULT_GRID_SIZE:g}); compare with scripts/benchmark_precision.py")
+    args = parser.parse_args()
 
     # File paths
     input_file = Path("data/raw/kerala_lsg_data.geojson")
@@ -175,7 +209,7 @@ def main():
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Process data
-    add_district_field(input_file, output_file)
+    add_district_field(input_file, output_file, args.grid_size)
 
 if __name__ == "__main__":
     main()
@@ -2,30 +2,62 @@
 """
 Script 2: Extract district-level boundaries from LSG data
 Creates a separate GeoJSON with just district boundaries
+Districts are merged from the LSG layer's shared-edge topology by default,
+so their borders are exactly the LSG borders (--method dissolve for a
+polygon union)
 """
 
+import argparse
 import sys
 from pathlib import Path
 
-try:
-    import geopandas as gpd
-except ImportError:
-    print("Error: geopandas is not installed")
-    print("Please run: pip install geopandas")
-    sys.exit(1)
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_geo_cache import read_geodataframe  # noqa: E402
+
+
+def dissolve_by_topology(gdf):
+    """
+    Merge LSGs into districts by dropping the edges shared inside each district
 
-def extract_districts(input_file, output_file):
+    Districts whose LSGs overlap are unioned instead.
+
+    Returns:
+        (GeoDataFrame with district and geometry, names of unioned districts)
+    """
+    import geopandas as gpd
+    import shapely
+
+    from kerala_topology import Topology
+
+    geoms = gdf.geometry.to_numpy()
+    merged = Topology(geoms).dissolve(gdf['district'].tolist())
+    unioned = []
+    rows = []
+    for district in sorted(merged):
+        geometry, ok = merged[district]
+        if not ok:
+            geometry = shapely.union_all(geoms[(gdf['district'] == district).to_numpy()])
+            unioned.append(district)
+        rows.append({'district': district, 'geometry': geometry})
+    return gpd.GeoDataFrame(rows, geometry='geometry', crs=gdf.crs), unioned
+
+def extract_districts(input_file, output_file, method='topology'):
     """Extract and dissolve LSG boundaries by district"""
 
     print(f"Reading {input_file}...")
 
     try:
-        gdf = gpd.read_file(input_file)
+        gdf, cached = read_geodataframe(input_file)
+    except ImportError:
+        print("Error: geopandas is not installed")
+        print("Please run: pip install geopandas")
+        sys.exit(1)
     except Exception as e:
         print(f"Error reading file: {e}")
         sys.exit(1)
 
-    print(f"Loaded {len(gdf)} LSG features")
+    print(f"Loaded {len(gdf)} LSG features{' (from cache)' if cached else ''}")
 
     # Check if district field exists
     if 'district' not in gdf.columns:
@@ -34,25 +66,30 @@ def extract_districts(input_file, output_file):
         sys.exit(1)
 
     # Remove features with unknown district
-    unknown_count = len(gdf[gdf['district'] == 'Unknown'])
+    unknown_count = int((gdf['district'] == 'Unknown').sum())
     if unknown_count > 0:
         print(f"\nWarning: {unknown_count} features have district='Unknown'")
         print("These will be excluded from district boundaries")
         gdf = gdf[gdf['district'] != 'Unknown']
 
     print("\nDistricts found:")
-    districts = gdf['district'].unique()
-    for i, district in enumerate(sorted(districts), 1):
-        count = len(gdf[gdf['district'] == district])
+    counts = gdf['district'].value_counts().sort_index()
+    districts = counts.index
+    for i, (district, count) in enumerate(counts.items(), 1):
         print(f"  {i}. {district}: {count} LSGs")
 
     # Dissolve by district
-    print(f"\nDissolving {len(gdf)} LSGs into {len(districts)} districts...")
-    districts_gdf = gdf.dissolve(
-        by='district',
-        as_index=False,
-        aggfunc='first'  # Use first for simplicity as we only need district and geometry
-    )
+    print(f"\nDissolving {len(gdf)} LSGs into {len(districts)} districts ({method})...")
+    if method == 'topology':
+        districts_gdf, unioned = dissolve_by_topology(gdf)
+        if unioned:
+            print(f"Warning: LSGs overlap in {', '.join(unioned)}; used a polygon union there")
+    else:
+        districts_gdf = gdf.dissolve(
+            by='district',
+            as_index=False,
+            aggfunc='first'  # Use first for simplicity as we only need district and geometry
+        )
 
     # Keep only essential fields
     districts_gdf = districts_gdf[['district', 'geometry']]
@@ -90,6 +127,10 @@ def extract_districts(input_file, output_file):
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Extract district boundaries from the LSG layer")
+    parser.add_argument('--method', choices=['topology', 'dissolve'], default='topology',
+                        help="Merge shared LSG edges (default) or union the polygons")
+    args = parser.parse_args()
 
     # File paths
     input_file = Path("data/processed/kerala_lsg_with_districts.geojson")
@@ -105,7 +146,7 @@ def main():
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Extract districts
-    extract_districts(input_file, output_file)
+    extract_districts(input_file, output_file, args.method)
 
 if __name__ == "__main__":
     main()
@@ -2,23 +2,145 @@
 """
 Script 3: Simplify GeoJSON files for better web performance
 Reduces file size while maintaining visual accuracy
+Reads each layer once and writes several levels of detail (LOD) in parallel
+By default both layers are simplified through the LSG layer's shared-edge
+topology, so LSG and district borders line up exactly at every level
 """
 
+import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_geo_cache import CACHE_DIR, read_geodataframe  # noqa: E402
+from kerala_json_io import dump_feature_collection, dump_json, load_json  # noqa: E402
+from kerala_lsg_records import stable_feature_id, unique_ids  # noqa: E402
+from kerala_spatial import lod_max_zoom, lod_precision  # noqa: E402
+
 try:
-    import geopandas as gpd
-except ImportError:
-    print("Error: geopandas is not installed")
-    print("Please run: pip install geopandas")
-    sys.exit(1)
+    import fcntl
+except ImportError:  # Windows: per-layer runs are not started in parallel there
+    fcntl = None
+
+# Levels of detail written for every layer, finest first
+#   0.0001 = very detailed (11m)    - zoomed in to wards
+#   0.001  = detailed (111m)        - district view
+#   0.005  = simplified (555m)      - whole state
+LOD_TOLERANCES = [0.0001, 0.001, 0.005]
+LOD_DIR = Path("data/processed/lod")
+LSG_FILE = Path("data/processed/kerala_lsg_with_districts.geojson")
+
+# Layers simplified by this stage
+LAYERS = [
+    {
+        'input': LSG_FILE,
+        'output': Path("data/processed/kerala_lsg_simplified.geojson"),
+        'tolerance': 0.001,  # ~111m - good for LSG boundaries
+        'description': 'LSG boundaries',
+        'layer': 'kerala_lsg',
+        'id_property': None,
+        'group_by': None  # rebuilt from the LSG topology as-is
+    },
+    {
+        'input': Path("data/processed/kerala_districts.geojson"),
+        'output': Path("data/processed/kerala_districts_simplified.geojson"),
+        'tolerance': 0.005,  # ~555m - districts can be more simplified
+        'description': 'District boundaries',
+        'layer': 'kerala_districts',
+        'id_property': 'name',
+        'group_by': 'district'  # LSGs merged per district from the LSG topology
+    }
+]
 
 def get_file_size(filepath):
     """Get file size in KB"""
     return filepath.stat().st_size / 1024
 
-def simplify_geojson(input_file, output_file, tolerance=0.001, preserve_topology=True):
+def count_coordinates(geometries):
+    """Count exterior ring coordinates of polygon geometries"""
+    return sum(len(geom.exterior.coords) if geom.geom_type == 'Polygon'
+               else sum(len(p.exterior.coords) for p in geom.geoms)
+               if geom.geom_type == 'MultiPolygon' else 0
+               for geom in geometries)
+
+def simplify_geometries(geometry, tolerance, preserve_topology=True):
+    """Simplify a GeoSeries and repair any geometry made invalid"""
+    simplified = geometry.simplify(tolerance=tolerance, preserve_topology=preserve_topology)
+
+    invalid = ~simplified.is_valid
+    if invalid.any():
+        print(f"Warning: {invalid.sum()} invalid geometries at tolerance {tolerance}, fixing...")
+        simplified.loc[invalid] = simplified.loc[invalid].buffer(0)
+
+    return simplified
+
+def topology_levels(gdf, tolerances, group_by=None, lsg_file=LSG_FILE, cache_dir=CACHE_DIR):
+    """
+    Simplify every level from the LSG layer's shared-edge topology
+
+    Each shared border is simplified once, so neighbouring LSGs and the
+    districts merged from them keep identical borders at every tolerance.
+
+    Args:
+        gdf: The layer being simplified
+        tolerances: Tolerances to produce
+        group_by: None when gdf is the LSG layer; otherwise the column naming
+                  the LSGs (by their own column of that name) merged into each row
+        lsg_file: LSG layer the topology is built from when group_by is set
+        cache_dir: kerala_geo_cache directory for reading lsg_file
+
+    Returns:
+        {tolerance: GeoSeries} like simplify_geometries(), one per tolerance
+    """
+    import geopandas as gpd
+    import numpy as np
+
+    from kerala_topology import Topology
+
+    lsgs = gdf if group_by is None else read_geodataframe(lsg_file, cache_dir)[0]
+    topology = Topology(lsgs.geometry.to_numpy())
+    print(f"  {len(topology):,} shared-edge arcs")
+    with ThreadPoolExecutor(max_workers=len(tolerances)) as pool:
+        arcs = dict(zip(tolerances, pool.map(topology.arc_coordinates, tolerances), strict=True))
+
+    levels = {}
+    for tolerance in tolerances:
+        if group_by is None:
+            geoms = topology.polygons(arcs[tolerance])
+            rebuilt = np.array([geom is not None for geom in geoms])
+        else:
+            merged = topology.dissolve(lsgs[group_by].tolist(), arcs[tolerance])
+            found = [merged.get(value, (None, False)) for value in gdf[group_by]]
+            geoms = np.array([geom for geom, _ in found], dtype=object)
+            rebuilt = np.array([ok for _, ok in found])
+        level = gpd.GeoSeries(geoms, index=gdf.index, crs=gdf.crs)
+        if not rebuilt.all():
+            print(f"Warning: {(~rebuilt).sum()} feature(s) not rebuilt from shared edges at tolerance "
+                  f"{tolerance}, simplifying them on their own")
+            level[~rebuilt] = simplify_geometries(gdf.geometry[~rebuilt], tolerance)
+        invalid = ~level.is_valid
+        if invalid.any():
+            print(f"Warning: {invalid.sum()} invalid geometries at tolerance {tolerance}, fixing...")
+            level[invalid] = level[invalid].buffer(0)
+        levels[tolerance] = level
+    return levels
+
+def write_lod_level(gdf, simplified, tolerance, output_file):
+    """Write one LOD level with stable ids as the GeoJSON feature id"""
+    level = gdf.set_geometry(simplified)
+    features = level.iterfeatures(na='drop', drop_id=False)
+    dump_feature_collection(
+        {'type': 'FeatureCollection', 'features': features},
+        output_file,
+        minify=True,
+        precision=lod_precision(tolerance)
+    )
+
+def simplify_geojson(input_file, output_file, tolerance=0.001, preserve_topology=True,
+                     layer=None, id_property=None, lod_tolerances=LOD_TOLERANCES, lod_dir=LOD_DIR,
+                     topology=None, cache_dir=CACHE_DIR):
     """
     Simplify geometry to reduce file size
 
@@ -32,6 +154,15 @@ def simplify_geojson(input_file, output_file, tolerance=0.001, preserve_topology
                   0.005 = simplified (555m)
                   0.01 = very simplified (1.1km)
         preserve_topology: Ensure no invalid geometries are created
+        layer: Name used for the LOD files and manifest entry (None to skip LODs)
+        id_property: Property holding the feature id (default: stable_feature_id)
+        lod_tolerances: Extra tolerances to write from the same parse
+        topology: topology_levels() keyword arguments to simplify through the
+                  LSG topology (None: simplify each geometry on its own)
+        cache_dir: kerala_geo_cache directory for the parsed layers
+
+    Returns:
+        LOD manifest entry for the layer, or None on failure
     """
 
     print(f"\nProcessing: {input_file.name}")
@@ -41,50 +172,57 @@ def simplify_geojson(input_file, output_file, tolerance=0.001, preserve_topology
     # Check if input exists
     if not input_file.exists():
         print(f"Error: Input file not found: {input_file}")
-        return False
+        return None
 
     # Get original file size
     original_size = get_file_size(input_file)
     print(f"Original size: {original_size:,.2f} KB")
 
-    # Read GeoJSON
+    # Read GeoJSON once for every level
     print("Reading GeoJSON...")
-    gdf = gpd.read_file(input_file)
+    try:
+        gdf, cached = read_geodataframe(input_file, cache_dir)
+    except ImportError:
+        print("Error: geopandas is not installed")
+        print("Please run: pip install geopandas")
+        sys.exit(1)
+    if cached:
+        print("  (parsed layer reused from cache)")
 
-    original_coords = sum(len(geom.exterior.coords) if geom.geom_type == 'Polygon'
-                         else sum(len(p.exterior.coords) for p in geom.geoms)
-                         if geom.geom_type == 'MultiPolygon' else 0
-                         for geom in gdf.geometry)
+    original_coords = count_coordinates(gdf.geometry)
 
     print(f"Features: {len(gdf)}")
     print(f"Coordinate points: {original_coords:,}")
 
-    # Simplify geometry
-    print("Simplifying...")
-    gdf['geometry'] = gdf['geometry'].simplify(
-        tolerance=tolerance,
-        preserve_topology=preserve_topology
-    )
-
-    # Check for invalid geometries
-    invalid = ~gdf.is_valid
-    if invalid.any():
-        print(f"Warning: {invalid.sum()} invalid geometries after simplification")
-        print("Attempting to fix...")
-        gdf.loc[invalid, 'geometry'] = gdf.loc[invalid, 'geometry'].buffer(0)
+    # Stable ids so clients can match features across levels
+    if id_property:
+        ids = gdf[id_property].astype(str)
+    else:
+        # Missing values read as NaN; blank them so they fall back to the slug
+        attributes = gdf.drop(columns='geometry')
+        records = attributes.astype(object).where(attributes.notna(), None).to_dict('records')
+        ids = [stable_feature_id(props) for props in records]
+    gdf.index = unique_ids(ids)
 
-    # Count new coordinates
-    simplified_coords = sum(len(geom.exterior.coords) if geom.geom_type == 'Polygon'
-                           else sum(len(p.exterior.coords) for p in geom.geoms)
-                           if geom.geom_type == 'MultiPolygon' else 0
-                           for geom in gdf.geometry)
+    # Simplify every level in parallel; shapely releases the GIL
+    tolerances = sorted(set(lod_tolerances if layer else []) | {tolerance})
+    print(f"Simplifying {len(tolerances)} level(s): {', '.join(str(t) for t in tolerances)}...")
+    if topology is not None:
+        levels = topology_levels(gdf, tolerances, cache_dir=cache_dir, **topology)
+    else:
+        with ThreadPoolExecutor(max_workers=len(tolerances)) as pool:
+            simplified = pool.map(
+                lambda t: simplify_geometries(gdf.geometry, t, preserve_topology), tolerances
+            )
+            levels = dict(zip(tolerances, simplified, strict=True))
 
     # Save simplified version
     print("Saving...")
-    gdf.to_file(output_file, driver='GeoJSON')
+    gdf.set_geometry(levels[tolerance]).reset_index(drop=True).to_file(output_file, driver='GeoJSON')
 
     # Get new file size
     simplified_size = get_file_size(output_file)
+    simplified_coords = count_coordinates(levels[tolerance])
 
     # Print results
     size_reduction = 100 * (1 - simplified_size / original_size)
@@ -96,41 +234,89 @@ def simplify_geojson(input_file, output_file, tolerance=0.001, preserve_topology
     print(f"  Coordinate points: {simplified_coords:,}")
     print(f"  Coordinate reduction: {coord_reduction:.1f}%")
 
-    return True
+    if not layer:
+        return {}
+
+    # Write levels of detail, finest first
+    lod_entry = {'id': 'feature.id', 'features': len(gdf), 'levels': []}
+    print("\nLevels of detail:")
+    with ThreadPoolExecutor(max_workers=len(tolerances)) as pool:
+        lod_files = {t: lod_dir / f"{layer}.lod_{t}.geojson" for t in tolerances}
+        list(pool.map(lambda t: write_lod_level(gdf, levels[t], t, lod_files[t]), tolerances))
+
+    for i, t in enumerate(tolerances):
+        lod_file = lod_files[t]
+        coords = count_coordinates(levels[t])
+        print(f"  {t:<8} {get_file_size(lod_file):10,.2f} KB  {coords:10,} points  -> {lod_file.name}")
+        lod_entry['levels'].append({
+            'tolerance': t,
+            'approx_m': int(t * 111_000),
+            # Finest level has no upper zoom limit
+            'max_zoom': None if i == 0 else lod_max_zoom(t),
+            'file': lod_file.name,
+            'bytes': lod_file.stat().st_size,
+            'coordinates': coords,
+        })
+
+    return lod_entry
+
+def update_lod_manifest(layers, manifest_file, replace=True):
+    """
+    Write the LOD manifest's layer entries
+
+    With replace=False, entries are merged into the existing manifest under
+    a file lock, so per-layer runs in parallel do not drop each other's.
+    """
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(manifest_file.with_suffix('.lock'), 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest = {'levels': LOD_TOLERANCES, 'layers': {}}
+        if not replace and manifest_file.exists():
+            existing = load_json(manifest_file)
+            if existing.get('levels') == LOD_TOLERANCES:
+                manifest['layers'].update(existing.get('layers', {}))
+        manifest['layers'].update(layers)
+        dump_json(manifest, manifest_file, minify=False)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="Simplify GeoJSON layers and write levels of detail")
+    parser.add_argument('--layer', action='append', choices=[config['layer'] for config in LAYERS],
+                        help="Only simplify this layer (repeatable; default: all)")
+    parser.add_argument('--method', choices=['topology', 'simplify'], default='topology',
+                        help="Simplify shared LSG edges once for both layers (default) "
+                             "or each geometry on its own")
+    args = parser.parse_args()
 
-    # File paths and tolerances
-    files_to_simplify = [
-        {
-            'input': Path("data/processed/kerala_lsg_with_districts.geojson"),
-            'output': Path("data/processed/kerala_lsg_simplified.geojson"),
-            'tolerance': 0.001,  # ~111m - good for LSG boundaries
-            'description': 'LSG boundaries'
-        },
-        {
-            'input': Path("data/processed/kerala_districts.geojson"),
-            'output': Path("data/processed/kerala_districts_simplified.geojson"),
-            'tolerance': 0.005,  # ~555m - districts can be more simplified
-            'description': 'District boundaries'
-        }
-    ]
+    files_to_simplify = [config for config in LAYERS if not args.layer or config['layer'] in args.layer]
 
     print("="*60)
     print("GEOJSON SIMPLIFICATION FOR WEB")
     print("="*60)
 
     success_count = 0
+    lod_layers = {}
 
     for config in files_to_simplify:
         if config['input'].exists():
-            if simplify_geojson(config['input'], config['output'], config['tolerance']):
+            lod_entry = simplify_geojson(
+                config['input'], config['output'], config['tolerance'],
+                layer=config['layer'], id_property=config['id_property'],
+                topology={'group_by': config['group_by']} if args.method == 'topology' else None
+            )
+            if lod_entry is not None:
                 success_count += 1
+                lod_layers[config['layer']] = lod_entry
         else:
             print(f"\nSkipping: {config['description']} (file not found)")
             print(f"  Expected: {config['input']}")
 
+    if lod_layers:
+        manifest_file = LOD_DIR / "manifest.json"
+        update_lod_manifest(lod_layers, manifest_file, replace=not args.layer)
+        print(f"\n✓ LOD manifest saved to: {manifest_file}")
+
     # Summary
     print("\n" + "="*60)
     print(f"Successfully simplified {success_count}/{len(files_to_simplify)} files")
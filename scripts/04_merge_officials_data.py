@@ -1,32 +1,248 @@
 #!/usr/bin/env python3
 """
 Script 4: Merge officials data with GeoJSON
-Adds officials information from CSV to the GeoJSON properties
+Adds officials information from CSV to the GeoJSON properties, and writes
+the layer's geometry and attributes as separate files for the web app
 """
 
-import csv
-import json
-import shutil
 import sys
 from pathlib import Path
 
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dump_feature_collection, load_json  # noqa: E402
+from kerala_layers import ATTRIBUTES_FILE, GEOMETRY_FILE, write_split_layer  # noqa: E402
+from kerala_lsg_records import LSGRecord  # noqa: E402
+from kerala_officials import (  # noqa: E402
+    NAME_SUFFIXES,
+    issue_summary,
+    name_keys,
+    officials_frame,
+    read_officials_csv,
+    validate_officials,
+)
+from kerala_publish import publish  # noqa: E402
+from kerala_spatial import feature_bounds, group_bounds, union_bounds  # noqa: E402
+
 
 def normalize_name(name):
     """Normalize LSG names for better matching"""
     if not name:
         return ""
     normalized = name.lower().strip()
-    suffixes = [
-        ' municipal corporation', ' corporation', ' municipality',
-        ' grama panchayat', ' grama panchayath', ' gramapanchayat', ' gramapanchayath',
-        ' block panchayat', ' district panchayat', ' panchayath', ' panchayat'
-    ]
-    for suffix in suffixes:
+    for suffix in NAME_SUFFIXES:
         if normalized.endswith(suffix):
             normalized = normalized[:-len(suffix)].strip()
             break
     return normalized
 
+# Row-level report of officials CSV problems (kerala_officials.validate_officials)
+VALIDATION_FILE = Path("data/processed/officials_validation.csv")
+
+# Join keys, most exact first; a feature takes the first layer that matches
+JOIN_LAYERS = ('wikidata', 'lsg_id', 'district_name', 'name')
+
+def record_join_keys(record):
+    """
+    Join key per layer for an officials CSV record (None where the column is empty)
+
+    Only rows without a district are keyed by bare name; a row that names its
+    district must not match a same-named LSG in another district.
+    """
+    name = normalize_name(record.lsg_name)
+    district = record.district.lower()
+    return {
+        'wikidata': record.wikidata_id.upper() or None,
+        'lsg_id': record.lsg_id or None,
+        'district_name': (district, name) if district and name else None,
+        'name': name if name and not district else None,
+    }
+
+def feature_join_keys(props):
+    """Join key per layer for GeoJSON feature properties"""
+    name = normalize_name(props.get('name') or '')
+    district = (props.get('district') or '').strip().lower()
+    return {
+        'wikidata': (props.get('wikidata') or '').strip().upper() or None,
+        'lsg_id': (props.get('lsg_id') or '').strip() or None,
+        'district_name': (district, name) if district and name else None,
+        'name': name or None,
+    }
+
+class OfficialsLookup:
+    """
+    Layered hash-join index over officials CSV rows
+
+    Each layer maps its key to an LSGRecord. Later rows replace earlier ones
+    with the same key (newest row wins for historical data); such
+    replacements are counted as collisions. The name layer only holds rows
+    without a district, and a bare name shared by rows in different districts
+    (or with and without one) is ambiguous and never matches on it.
+    """
+
+    def __init__(self):
+        self.layers = {layer: {} for layer in JOIN_LAYERS}
+        self.collisions = dict.fromkeys(JOIN_LAYERS, 0)
+        self._name_districts = {}
+
+    def add(self, record):
+        keys = record_join_keys(record)
+        for layer, key in keys.items():
+            if key is None:
+                continue
+            index = self.layers[layer]
+            if key in index:
+                self.collisions[layer] += 1
+            index[key] = record
+        name = normalize_name(record.lsg_name)
+        if name:
+            self._name_districts.setdefault(name, set()).add(record.district.lower())
+
+    @classmethod
+    def from_frame(cls, frame):
+        """
+        Build every layer with column operations instead of row by row
+
+        The last row per key is kept, as add() would; only the rows left in
+        some layer are turned into LSGRecords.
+        """
+        lookup = cls()
+        names = name_keys(frame['lsg_name'])
+        districts = frame['district'].str.lower()
+        keys = pd.DataFrame({
+            'wikidata': frame['wikidata_id'].str.upper(),
+            'lsg_id': frame['lsg_id'],
+            'district_name': (districts + '\x1f' + names).where(districts.ne('') & names.ne(''), ''),
+            'name': names.where(districts.eq(''), ''),
+        }).to_numpy()
+
+        kept = {}
+        for column, layer in enumerate(JOIN_LAYERS):
+            values = pd.Series(keys[:, column])
+            present = values[values.ne('')]
+            last = present[~present.duplicated(keep='last')]
+            lookup.collisions[layer] = len(present) - len(last)
+            kept[layer] = last
+        rows = sorted(set().union(*(last.index for last in kept.values())))
+        csv_rows = frame.iloc[rows].to_dict('records')
+        records = dict(zip(rows, (LSGRecord.from_csv_row(row) for row in csv_rows), strict=True))
+
+        for layer, last in kept.items():
+            key_values = last.tolist()
+            if layer == 'district_name':
+                key_values = [tuple(key.split('\x1f', 1)) for key in key_values]
+            layer_records = (records[row] for row in last.index)
+            lookup.layers[layer] = dict(zip(key_values, layer_records, strict=True))
+
+        named = pd.DataFrame({'name': names, 'district': districts})[names.ne('')]
+        lookup._name_districts = named.groupby('name', sort=False)['district'].agg(set).to_dict()
+        return lookup
+
+    def ambiguous_names(self):
+        return {name for name, districts in self._name_districts.items() if len(districts) > 1}
+
+    def records(self):
+        """Distinct records reachable through any layer"""
+        unique = {}
+        for index in self.layers.values():
+            for record in index.values():
+                unique[id(record)] = record
+        return list(unique.values())
+
+    def __len__(self):
+        return len(self.records())
+
+def build_officials_lookup(officials_records):
+    """
+    Index officials CSV rows as LSGRecords by wikidata id, lsg_id, (district, name) and name
+
+    Args:
+        officials_records: Frame from kerala_officials.validate_officials, or
+                           a list of CSV row dicts
+    """
+    frame = officials_frame(officials_records)
+    frame = frame[frame['lsg_name'].ne('') | frame['wikidata_id'].ne('') | frame['lsg_id'].ne('')]
+    return OfficialsLookup.from_frame(frame)
+
+def apply_officials(geo_data, lookup, report=None):
+    """
+    Add officials information to the feature properties in place
+
+    One pass over the features; each tries the join layers in order and
+    takes the first hit.
+
+    Args:
+        geo_data: FeatureCollection dict
+        lookup: OfficialsLookup from build_officials_lookup
+        report: Optional dict filled with per-layer counts: matched (features
+                joined on the layer), missed (features with a key on the layer
+                but no row) and collisions (CSV rows replaced by later rows),
+                plus 'shared' (rows joined to more than one feature) and
+                'unused' (rows no feature joined to)
+
+    Returns:
+        (matched, updated) - features found in the CSV, and those with actual data
+    """
+    matched = 0
+    updated = 0
+    stats = {layer: {'matched': 0, 'missed': 0, 'collisions': lookup.collisions[layer]}
+             for layer in JOIN_LAYERS}
+    ambiguous = lookup.ambiguous_names()
+    uses = {}
+
+    for feature in geo_data['features']:
+        props = feature['properties']
+        keys = feature_join_keys(props)
+        if keys['name'] in ambiguous:
+            keys['name'] = None
+
+        record = None
+        for layer in JOIN_LAYERS:
+            key = keys[layer]
+            if key is None:
+                continue
+            record = lookup.layers[layer].get(key)
+            if record is None:
+                stats[layer]['missed'] += 1
+                continue
+            stats[layer]['matched'] += 1
+            break
+
+        if record is not None:
+            matched += 1
+            uses[id(record)] = uses.get(id(record), 0) + 1
+            if record.has_data:
+                updated += 1
+            record.apply_to(props)
+            if record.lsg_id:
+                props.setdefault('lsg_id', record.lsg_id)
+
+    if report is not None:
+        report.update(stats)
+        report['shared'] = sum(1 for count in uses.values() if count > 1)
+        report['unused'] = sum(1 for record in lookup.records() if id(record) not in uses)
+
+    return matched, updated
+
+def add_bounds(geo_data):
+    """
+    Add a GeoJSON "bbox" to every feature and to the collection, in one pass
+
+    Returns:
+        {district: bbox} for the features' districts
+    """
+    features = geo_data['features']
+    boxes = feature_bounds(features)
+    for feature, box in zip(features, boxes, strict=True):
+        if box:
+            feature['bbox'] = box
+        else:
+            feature.pop('bbox', None)
+    geo_data['bbox'] = union_bounds(boxes)
+    return group_bounds([f['properties'].get('district') for f in features], boxes)
+
 def merge_officials_data(geojson_file, officials_csv, output_file):
     """Merge officials information into GeoJSON properties"""
 
@@ -44,102 +260,70 @@ def merge_officials_data(geojson_file, officials_csv, output_file):
         return False
 
     # Read GeoJSON
-    with open(geojson_file, 'r', encoding='utf-8') as f:
-        geo_data = json.load(f)
+    geo_data = load_json(geojson_file)
 
     print(f"  Features: {len(geo_data['features'])}")
 
-    # Read officials CSV using standard csv module
+    # Read officials CSV into string columns and validate them column by column
     print(f"\nReading officials data: {officials_csv}...")
     try:
-        with open(officials_csv, mode='r', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            officials_records = list(reader)
+        officials = read_officials_csv(officials_csv)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return False
 
-    print(f"  Records: {len(officials_records)}")
+    print(f"  Records: {len(officials)}")
+    officials, issues = validate_officials(officials)
+    if len(issues):
+        issues.to_csv(VALIDATION_FILE, index=False, encoding='utf-8')
+        print(f"  Validation: {len(issues)} issue(s), see {VALIDATION_FILE}")
+        for (severity, column, issue), count in issue_summary(issues).items():
+            print(f"    {count:5d} {severity:7s} {column}: {issue}")
+    else:
+        VALIDATION_FILE.unlink(missing_ok=True)
+        print("  Validation: no issues")
 
-    # Create lookup dictionary by normalized LSG name
-    officials_dict = {}
-    for row in officials_records:
-        lsg_name = row.get('lsg_name', '')
-        if lsg_name:
-            officials_dict[normalize_name(lsg_name)] = row
+    # Layered join index: wikidata id, lsg_id, (district, name), name
+    officials_lookup = build_officials_lookup(officials)
 
-    print(f"  Unique LSGs in CSV: {len(officials_dict)}")
+    print(f"  Unique LSGs in CSV: {len(officials_lookup)}")
 
     # Merge data
     print("\nMerging data...")
-    matched = 0
-    updated = 0
-
-    for feature in geo_data['features']:
-        props = feature['properties']
-        lsg_name = props.get('name', '')
-        norm_name = normalize_name(lsg_name)
+    report = {}
+    matched, updated = apply_officials(geo_data, officials_lookup, report)
 
-        if norm_name in officials_dict:
-            matched += 1
-            officials_info = officials_dict[norm_name]
-
-            # Check if there's actual data (not just empty fields)
-            has_data = any([
-                officials_info.get('president_name'),
-                officials_info.get('secretary_name'),
-                officials_info.get('office_address'),
-                officials_info.get('website')
-            ])
-
-            if has_data:
-                updated += 1
-
-            # Add officials structure
-            props['officials'] = {
-                'president': {
-                    'name': officials_info.get('president_name', ''),
-                    'party': officials_info.get('president_party', ''),
-                    'contact': officials_info.get('president_contact', ''),
-                    'email': officials_info.get('president_email', '')
-                },
-                'secretary': {
-                    'name': officials_info.get('secretary_name', ''),
-                    'contact': officials_info.get('secretary_contact', ''),
-                    'email': officials_info.get('secretary_email', '')
-                }
-            }
-
-            # Add other fields
-            if officials_info.get('office_address'):
-                props['office_address'] = officials_info['office_address']
-
-            if officials_info.get('website'):
-                props['website'] = officials_info['website']
-
-            if officials_info.get('mla_constituency'):
-                props['mla_constituency'] = officials_info['mla_constituency']
-
-            if officials_info.get('mp_constituency'):
-                props['mp_constituency'] = officials_info['mp_constituency']
-
-            if officials_info.get('notes'):
-                props['notes'] = officials_info['notes']
+    # Bounding boxes for zoom-to-feature and viewport culling
+    district_bounds = add_bounds(geo_data)
 
     # Save merged GeoJSON
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(geo_data, f, ensure_ascii=False, indent=2)
+    dump_feature_collection(geo_data, output_file)
+
+    # Geometry and attributes for the web app, joined on stable feature ids
+    geometry_changed = write_split_layer(geo_data, GEOMETRY_FILE, ATTRIBUTES_FILE)
 
     # Print summary
     print("\n" + "="*60)
     print("OFFICIALS DATA MERGE COMPLETE")
     print("="*60)
     print(f"Total LSGs in GeoJSON: {len(geo_data['features'])}")
-    print(f"Officials records in CSV: {len(officials_dict)}")
+    print(f"Officials records in CSV: {len(officials_lookup)}")
     print(f"Matched LSGs: {matched}")
+    print(f"\n  {'join layer':16s} {'matched':>8s} {'missed':>8s} {'collisions':>11s}")
+    for layer in JOIN_LAYERS:
+        stats = report[layer]
+        print(f"  {layer:16s} {stats['matched']:8d} {stats['missed']:8d} {stats['collisions']:11d}")
+    if report['shared']:
+        print(f"  Warning: {report['shared']} CSV rows matched more than one LSG")
+    if report['unused']:
+        print(f"  CSV rows not matched to any LSG: {report['unused']}")
+    print()
     print(f"LSGs with actual data: {updated}")
     print(f"Coverage: {100*updated/len(geo_data['features']):.1f}%")
+    print(f"Bounding boxes: {len(geo_data['features'])} features, {len(district_bounds)} districts")
+    print(f"Geometry: {'updated' if geometry_changed else 'unchanged'} ({GEOMETRY_FILE.name}); "
+          f"attributes: {ATTRIBUTES_FILE.name}")
 
     if matched < len(geo_data['features']):
         unmatched = len(geo_data['features']) - matched
@@ -180,12 +364,12 @@ def main():
     success = merge_officials_data(geojson_file, officials_csv, output_file)
 
     if success:
-        # Sync to web app static directory
-        static_output = Path("web-app/static/data/kerala_lsg_final.geojson")
+        # Sync to web app static directory (hashed, precompressed, manifest updated)
+        static_dir = Path("web-app/static/data")
         try:
-            static_output.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(output_file, static_output)
-            print(f"✓ Synced to web app: {static_output}")
+            manifest, _ = publish([GEOMETRY_FILE, ATTRIBUTES_FILE], static_dir)
+            for published in (GEOMETRY_FILE, ATTRIBUTES_FILE):
+                print(f"✓ Synced to web app: {static_dir / manifest['files'][published.name]['path']}")
         except Exception as e:
             print(f"Warning: Could not sync to web app: {e}")
     else:
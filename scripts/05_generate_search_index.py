@@ -4,10 +4,17 @@ Script 5: Generate search index for fast client-side search
 Creates a lightweight JSON file for searching LSGs
 """
 
-import json
 import sys
 from pathlib import Path
 
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import atomic_write_bytes, dump_json, load_json  # noqa: E402
+from kerala_lsg_binary import build_binary_index  # noqa: E402
+from kerala_lsg_records import SearchEntry  # noqa: E402
+from kerala_publish import publish  # noqa: E402
+from kerala_spatial import GRID_CELL, build_grid, feature_bounds, group_bounds, union_bounds  # noqa: E402
+
 
 def calculate_centroid(geometry):
     """Calculate simple centroid for a geometry"""
@@ -43,26 +50,24 @@ def calculate_centroid(geometry):
 
     return None
 
-def generate_search_index(geojson_file, output_file):
-    """Create a lightweight search index"""
-
-    print(f"Reading {geojson_file}...")
-
-    if not geojson_file.exists():
-        print(f"Error: File not found: {geojson_file}")
-        return False
-
-    with open(geojson_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def build_search_index(data):
+    """
+    Build search entries for every feature with a usable geometry
 
-    print(f"Processing {len(data['features'])} features...")
+    Returns:
+        (search_index, skipped) - SearchEntry records, and the count without a centroid
+    """
 
     search_index = []
     skipped = 0
 
-    for i, feature in enumerate(data['features'], 1):
-        props = feature['properties']
+    # Reuse stage 04's boxes; compute the rest in one vectorized pass
+    features = data['features']
+    missing = [f for f in features if not f.get('bbox')]
+    computed = iter(feature_bounds(missing))
+    boxes = [f.get('bbox') or next(computed) for f in features]
 
+    for i, (feature, bbox) in enumerate(zip(features, boxes, strict=True), 1):
         # Calculate centroid
         centroid = calculate_centroid(feature.get('geometry', {}))
 
@@ -70,53 +75,54 @@ def generate_search_index(geojson_file, output_file):
             skipped += 1
             continue
 
-        # Create search entry with essential information
-        search_entry = {
-            'id': i,
-            'name': props.get('name', ''),
-            'name_ml': props.get('name_ml', ''),
-            'lsg_type': props.get('lsg_type', 'lsg'),
-            'district': props.get('district', ''),
-            'centroid': centroid,
-        }
-
-        # Add officials if available
-        if 'officials' in props:
-            officials = props['officials']
-
-            # Extract president/mayor info
-            president = officials.get('president', {})
-            if president.get('name'):
-                search_entry['head'] = {
-                    'name': president.get('name', ''),
-                    'title': 'Mayor' if search_entry['lsg_type'] == 'corporation' else 'President'
-                }
-
-            # Extract secretary info
-            secretary = officials.get('secretary', {})
-            if secretary.get('name'):
-                search_entry['secretary'] = secretary.get('name', '')
-
-        # Add contact info if available
-        if props.get('website'):
-            search_entry['website'] = props['website']
-
-        if props.get('wikidata'):
-            search_entry['wikidata'] = props['wikidata']
-
-        # Add constituency info
-        if props.get('mla_constituency'):
-            search_entry['mla_constituency'] = props['mla_constituency']
-
-        if props.get('mp_constituency'):
-            search_entry['mp_constituency'] = props['mp_constituency']
-
-        search_index.append(search_entry)
+        search_index.append(SearchEntry.from_feature(i, feature['properties'], centroid, bbox))
+
+    return search_index, skipped
+
+def build_spatial_index(search_index, cell=GRID_CELL):
+    """
+    Static viewport index over search entries
+
+    Returns:
+        Dict with the state and per-district bounding boxes, and a grid of
+        `cell`-degree cells ("ix:iy") mapped to the ids of entries touching them
+    """
+    ids = [entry.id for entry in search_index]
+    boxes = [list(entry.bbox) if entry.bbox else None for entry in search_index]
+
+    spatial_index = build_grid(ids, boxes, cell)
+    cells = spatial_index.pop('cells')
+    spatial_index['bbox'] = union_bounds(boxes)
+    spatial_index['districts'] = group_bounds([entry.district for entry in search_index], boxes)
+    spatial_index['cells'] = cells
+    return spatial_index
+
+def generate_search_index(geojson_file, output_file, spatial_file=None, binary_file=None):
+    """Create a lightweight search index"""
+
+    print(f"Reading {geojson_file}...")
+
+    if not geojson_file.exists():
+        print(f"Error: File not found: {geojson_file}")
+        return False
+
+    data = load_json(geojson_file)
+
+    print(f"Processing {len(data['features'])} features...")
+
+    search_index, skipped = build_search_index(data)
 
     # Save search index
     print(f"\nSaving to {output_file}...")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(search_index, f, ensure_ascii=False, indent=2)
+    dump_json([entry.to_dict() for entry in search_index], output_file)
+
+    if spatial_file:
+        spatial_index = build_spatial_index(search_index)
+        dump_json(spatial_index, spatial_file, minify=True)
+
+    if binary_file:
+        # mmap-able copy for Python consumers (kerala_lsg_binary.BinaryLSGIndex)
+        atomic_write_bytes(build_binary_index(search_index), binary_file)
 
     # Calculate file sizes
     input_size = geojson_file.stat().st_size / 1024
@@ -134,8 +140,8 @@ def generate_search_index(geojson_file, output_file):
     district_counts = {}
 
     for entry in search_index:
-        lsg_type = entry.get('lsg_type', 'unknown')
-        district = entry.get('district', 'Unknown')
+        lsg_type = entry.lsg_type or 'unknown'
+        district = entry.district or 'Unknown'
 
         type_counts[lsg_type] = type_counts.get(lsg_type, 0) + 1
         district_counts[district] = district_counts.get(district, 0) + 1
@@ -152,8 +158,17 @@ def generate_search_index(geojson_file, output_file):
     print(f"  Original GeoJSON: {input_size:,.2f} KB")
     print(f"  Search index: {output_size:,.2f} KB")
     print(f"  Reduction: {100 * (1 - output_size/input_size):.1f}%")
+    if spatial_file:
+        print(f"  Spatial index: {spatial_file.stat().st_size / 1024:,.2f} KB "
+              f"({len(spatial_index['cells'])} cells of {spatial_index['cell']}°)")
+    if binary_file:
+        print(f"  Binary index: {binary_file.stat().st_size / 1024:,.2f} KB")
 
     print(f"\n✓ Search index saved to: {output_file}")
+    if spatial_file:
+        print(f"✓ Spatial index saved to: {spatial_file}")
+    if binary_file:
+        print(f"✓ Binary index saved to: {binary_file}")
 
     # Generate usage example
     usage_example = f"""
@@ -191,18 +206,19 @@ def main():
     # File paths
     geojson_file = Path("data/processed/kerala_lsg_final.geojson")
     output_file = Path("data/processed/search_index.json")
+    spatial_file = Path("data/processed/spatial_index.json")
+    binary_file = Path("data/processed/search_index.bin")
 
     # Generate search index
-    success = generate_search_index(geojson_file, output_file)
+    success = generate_search_index(geojson_file, output_file, spatial_file, binary_file)
 
     if success:
-        # Sync to web app static directory
-        static_output = Path("web-app/static/data/search_index.json")
+        # Sync to web app static directory (hashed, precompressed, manifest updated)
+        static_dir = Path("web-app/static/data")
         try:
-            import shutil
-            static_output.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(output_file, static_output)
-            print(f"✓ Synced to web app: {static_output}")
+            manifest, _ = publish([output_file, spatial_file], static_dir)
+            for path in (output_file, spatial_file):
+                print(f"✓ Synced to web app: {static_dir / manifest['files'][path.name]['path']}")
         except Exception as e:
             print(f"Warning: Could not sync to web app: {e}")
     else:
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Script 6 (optional): Process the ward-level layer
+Matches ~21,900 wards to their parent LSGs, dissolves wards -> LSGs ->
+districts, simplifies each level and writes a ward search index.
+Streams the input and works one district at a time, so memory stays
+bounded by the largest district.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows: peak memory is not reported there
+    resource = None
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+try:
+    import kerala_wards
+except ImportError as e:
+    print(f"Error: {e}")
+    print("Please run: pip install geopandas")
+    sys.exit(1)
+
+from kerala_json_io import FeatureCollectionWriter, dump_json, load_json  # noqa: E402
+from kerala_publish import publish  # noqa: E402
+from kerala_spatial import build_grid, lod_max_zoom  # noqa: E402
+
+WARD_FILE = Path("data/raw/kerala_wards.geojson")
+LSG_FILE = Path("data/processed/kerala_lsg_with_districts.geojson")
+OUTPUT_DIR = Path("data/processed/wards")
+STATIC_DIR = Path("web-app/static/data")
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process so far (Linux reports KB), or None"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage / 1024 if sys.platform != 'darwin' else usage / (1024 * 1024)
+
+
+def process_wards(ward_file, lsg_file, output_dir, parent_property=None, chunk_size=1 << 20):
+    """
+    Run the ward pipeline
+
+    Args:
+        ward_file: Raw ward GeoJSON with a parent-LSG key per ward
+        lsg_file: LSG layer from stage 01 (district and type per LSG)
+        output_dir: Directory for the ward outputs
+        parent_property: Ward property holding the parent key
+                         (default: first of kerala_wards.PARENT_PROPERTIES present)
+        chunk_size: Characters read per chunk when streaming the ward layer
+
+    Returns:
+        Summary dict (counts, per-phase seconds, output files)
+    """
+    output_dir = Path(output_dir)
+    timings = {}
+    start = time.perf_counter()
+
+    parents = kerala_wards.ParentIndex(load_json(lsg_file)['features'])
+    timings['parents'] = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory(prefix="wards-") as spool_dir:
+        # Pass 1: stream wards, attach parents, spool per district
+        t = time.perf_counter()
+        counts = kerala_wards.partition_wards(ward_file, parents, spool_dir, parent_property, chunk_size)
+        timings['partition'] = time.perf_counter() - t
+
+        # Pass 2: one district at a time into every output
+        t = time.perf_counter()
+        files = {
+            'wards': output_dir / "kerala_wards.geojson",
+            'lsgs': output_dir / "kerala_lsg_from_wards.geojson",
+            'districts': output_dir / "kerala_districts_from_wards.geojson",
+        }
+        level_files = {tol: output_dir / f"kerala_wards.lod_{tol}.geojson" for tol in kerala_wards.WARD_TOLERANCES}
+
+        # Features arrive serialized with coordinates already rounded per level
+        writers = {
+            'wards': FeatureCollectionWriter(files['wards']),
+            'lsgs': FeatureCollectionWriter(files['lsgs'], minify=True),
+            'districts': FeatureCollectionWriter(files['districts'], minify=True),
+        }
+        for tol, path in level_files.items():
+            writers[tol] = FeatureCollectionWriter(path, minify=True)
+
+        entries = []
+        repaired = 0
+        try:
+            # Unmatched wards last, so matched districts keep stable entry ids
+            for district in sorted(counts, key=lambda d: (d == kerala_wards.UNMATCHED, d)):
+                props, geometries = kerala_wards.read_partition(Path(spool_dir) / f"{district}.jsonl")
+                result = kerala_wards.process_partition(props, geometries)
+                del props, geometries
+
+                for feature in result['wards']:
+                    writers['wards'].write_encoded(feature)
+                for tol, features in result['ward_levels'].items():
+                    for feature in features:
+                        writers[tol].write_encoded(feature)
+                for feature in result['lsgs']:
+                    writers['lsgs'].write_encoded(feature)
+                if result['district']:
+                    writers['districts'].write_encoded(result['district'])
+                entries.extend(result['entries'])
+                repaired += result['repaired']
+        except BaseException:
+            for writer in writers.values():
+                writer.abort()
+            raise
+        for writer in writers.values():
+            writer.close()
+        timings['districts'] = time.perf_counter() - t
+
+    # Ward-aware search index and viewport grid
+    t = time.perf_counter()
+    for i, entry in enumerate(entries, 1):
+        entry.id = i
+    search_file = output_dir / "ward_search_index.json"
+    spatial_file = output_dir / "ward_spatial_index.json"
+    dump_json([entry.to_dict() for entry in entries], search_file, minify=True)
+    dump_json(build_grid([e.id for e in entries], [list(e.bbox) for e in entries]), spatial_file, minify=True)
+    timings['index'] = time.perf_counter() - t
+
+    levels = [
+        {'tolerance': tol, 'approx_m': int(tol * 111_000), 'max_zoom': None if i == 0 else lod_max_zoom(tol),
+         'file': path.name, 'bytes': path.stat().st_size}
+        for i, (tol, path) in enumerate(level_files.items())
+    ]
+    dump_json({
+        'wards': writers['wards'].count,
+        'lsgs': writers['lsgs'].count,
+        'districts': writers['districts'].count,
+        'unmatched': counts.get(kerala_wards.UNMATCHED, 0),
+        'id': 'feature.id',
+        'levels': levels,
+    }, output_dir / "manifest.json", minify=False)
+
+    timings['total'] = time.perf_counter() - start
+    return {
+        'counts': counts,
+        'wards': writers['wards'].count,
+        'lsgs': writers['lsgs'].count,
+        'districts': writers['districts'].count,
+        'repaired': repaired,
+        'timings': timings,
+        'files': [*files.values(), *level_files.values(), search_file, spatial_file],
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Process the ward-level layer")
+    parser.add_argument('--input', type=Path, default=WARD_FILE)
+    parser.add_argument('--lsg-layer', type=Path, default=LSG_FILE)
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--parent-property', help="Ward property with the parent LSG key "
+                        f"(default: first of {', '.join(kerala_wards.PARENT_PROPERTIES)})")
+    parser.add_argument('--publish', action='store_true',
+                        help=f"Publish the coarsest ward level and ward search index to {STATIC_DIR}")
+    args = parser.parse_args()
+
+    for path in (args.input, args.lsg_layer):
+        if not path.exists():
+            print(f"Error: File not found: {path}")
+            if path == args.lsg_layer:
+                print("Please run scripts/01_add_district_field.py first")
+            sys.exit(1)
+
+    print("="*60)
+    print("WARD LAYER PROCESSING")
+    print("="*60)
+
+    summary = process_wards(args.input, args.lsg_layer, args.output_dir, args.parent_property)
+
+    print(f"\nWards: {summary['wards']:,} in {len(summary['counts'])} partitions")
+    for district, count in sorted(summary['counts'].items()):
+        print(f"  {district:25s} {count:8,}")
+    if summary['counts'].get(kerala_wards.UNMATCHED):
+        print(f"Warning: {summary['counts'][kerala_wards.UNMATCHED]} wards did not match a parent LSG")
+    if summary['repaired']:
+        print(f"Repaired {summary['repaired']} invalid geometries")
+    print(f"Dissolved into {summary['lsgs']:,} LSGs and {summary['districts']} districts")
+
+    print("\nTimings:")
+    for phase, seconds in summary['timings'].items():
+        print(f"  {phase:12s} {seconds:8.2f}s")
+    if summary['peak_rss_mb'] is not None:
+        print(f"Peak memory: {summary['peak_rss_mb']:,.0f} MB")
+
+    print("\nOutputs:")
+    for path in summary['files']:
+        print(f"  {path} ({path.stat().st_size / 1024:,.1f} KB)")
+
+    if args.publish:
+        coarsest = args.output_dir / f"kerala_wards.lod_{kerala_wards.WARD_TOLERANCES[-1]}.geojson"
+        publish([coarsest, args.output_dir / "ward_search_index.json"], STATIC_DIR)
+        print(f"\n✓ Published to: {STATIC_DIR}")
+
+
+if __name__ == "__main__":
+    main()
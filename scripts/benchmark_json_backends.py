@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON backends on the processed data files
+Compares parse time, serialize time and output size for each installed
+backend, in the default (indent=2) and minified layouts
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import BACKENDS, dumps, loads  # noqa: E402
+
+DEFAULT_FILES = [
+    Path("data/processed/kerala_lsg_final.geojson"),
+    Path("data/processed/kerala_districts.geojson"),
+    Path("data/processed/kerala_districts_simplified.geojson"),
+    Path("data/processed/search_index.json"),
+]
+
+
+def best_of(func, repeat):
+    """Fastest wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def benchmark_file(path, repeat, precision):
+    """Print one table of backend timings for a file"""
+    raw = path.read_bytes()
+    data = loads(raw, 'json')
+
+    print(f"\n{path.name} ({len(raw) / 1024:,.1f} KB)")
+    print(f"  {'backend':10s} {'parse ms':>10s} {'dump ms':>10s} {'min ms':>10s} "
+          f"{'size KB':>10s} {'min KB':>10s} {f'min+p{precision} KB':>12s}")
+
+    for name in BACKENDS:
+        parse_ms = best_of(lambda name=name: loads(raw, name), repeat)
+        dump_ms = best_of(
+            lambda name=name: dumps(data, minify=False, precision=None, backend=name), repeat
+        )
+        min_ms = best_of(
+            lambda name=name: dumps(data, minify=True, precision=None, backend=name), repeat
+        )
+        pretty_size = len(dumps(data, minify=False, precision=None, backend=name))
+        min_size = len(dumps(data, minify=True, precision=None, backend=name))
+        rounded_size = len(dumps(data, minify=True, precision=precision, backend=name))
+        print(f"  {name:10s} {parse_ms:10.1f} {dump_ms:10.1f} {min_ms:10.1f} "
+              f"{pretty_size / 1024:10,.1f} {min_size / 1024:10,.1f} {rounded_size / 1024:12,.1f}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark JSON backends on processed files")
+    parser.add_argument('files', nargs='*', type=Path, help="Files to benchmark (default: processed outputs)")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement (default: 5)")
+    parser.add_argument('--precision', type=int, default=6, help="Float precision for the rounded column")
+    args = parser.parse_args()
+
+    files = [f for f in (args.files or DEFAULT_FILES) if f.exists()]
+    if not files:
+        print("Error: No processed files found. Run ./run_all.sh first")
+        sys.exit(1)
+
+    print("="*60)
+    print("JSON BACKEND BENCHMARK")
+    print("="*60)
+    print(f"Installed backends: {', '.join(BACKENDS)}")
+    print(f"Best of {args.repeat} runs")
+
+    for path in files:
+        benchmark_file(path, args.repeat, args.precision)
+
+
+if __name__ == "__main__":
+    main()
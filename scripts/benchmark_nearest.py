@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark nearest-LSG queries
+Samples points around the Kerala coast (offshore and in the backwaters,
+where point-in-polygon finds nothing) and reports queries per second for
+the centroid grid index, the polygon STRtree and a brute-force scan
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dumps, load_json  # noqa: E402
+from kerala_lsg_query import LSGIndex  # noqa: E402
+from kerala_nearest import BoundaryIndex, local_distance_km  # noqa: E402
+
+SEARCH_INDEX = Path("data/processed/search_index.json")
+LSG_FILE = Path("data/processed/kerala_lsg_final.geojson")
+
+
+def coast_points(lsg_file, count, spread, seed=0):
+    """Random points scattered around the state outline's west-facing (sea) vertices"""
+    features = load_json(lsg_file)['features']
+    geoms = shapely.from_geojson([dumps(f['geometry'], minify=True) for f in features if f.get('geometry')])
+    outline = shapely.union_all(shapely.make_valid(geoms))
+    coords = shapely.get_coordinates(shapely.boundary(outline))
+    # Coast: vertices with open sea (outside the state) a few km to the west
+    coast = coords[~shapely.contains_xy(outline, coords[:, 0] - 0.05, coords[:, 1])]
+    rng = np.random.default_rng(seed)
+    picks = coast[rng.integers(0, len(coast), count)]
+    return picks[:, 0] + rng.normal(0, spread, count), picks[:, 1] + rng.normal(0, spread, count)
+
+
+def timed(func):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark nearest-LSG queries")
+    parser.add_argument('--search-index', type=Path, default=SEARCH_INDEX)
+    parser.add_argument('--lsg-layer', type=Path, default=LSG_FILE)
+    parser.add_argument('--points', type=int, default=1_000_000)
+    parser.add_argument('--spread', type=float, default=0.05, help="Std. dev. of points around the coast (degrees)")
+    parser.add_argument('--radius', type=float, default=5.0, help="Radius for within queries (km)")
+    args = parser.parse_args()
+
+    for path in (args.search_index, args.lsg_layer):
+        if not path.exists():
+            print(f"Error: File not found: {path}")
+            print("Run the processing pipeline first (./run_all.sh)")
+            sys.exit(1)
+
+    print("="*60)
+    print("NEAREST-LSG BENCHMARK")
+    print("="*60)
+
+    lon, lat = coast_points(args.lsg_layer, args.points, args.spread)
+    index = LSGIndex.load(args.search_index)
+    centroids, build_s = timed(index.centroid_index)
+    # Candidate tables are built once per k / radius; keep that out of the query timings
+    _, table_s = timed(lambda: (centroids.nearest(lon[:1], lat[:1]), centroids.nearest(lon[:1], lat[:1], k=5),
+                                centroids.within(lon[:1], lat[:1], args.radius)))
+    boundaries, tree_s = timed(lambda: BoundaryIndex.from_geojson(args.lsg_layer))
+    print(f"Points: {len(lon):,} around the coast (spread {args.spread} deg)")
+    print(f"Centroids: {len(centroids):,} (index {build_s * 1000:.0f} ms, candidate tables {table_s * 1000:.0f} ms)")
+    print(f"Polygons: {len(boundaries.ids):,} (STRtree {tree_s * 1000:.0f} ms)")
+
+    runs = [
+        ("centroids, nearest", lambda: centroids.nearest(lon, lat)),
+        ("centroids, 5 nearest", lambda: centroids.nearest(lon, lat, k=5)),
+        (f"centroids, within {args.radius:g} km", lambda: centroids.within(lon, lat, args.radius)),
+        ("polygons, nearest", lambda: boundaries.nearest(lon, lat)),
+    ]
+    print(f"\n  {'query':28s} {'seconds':>8s} {'queries/s':>12s}")
+    results = {}
+    for name, func in runs:
+        results[name], seconds = timed(func)
+        print(f"  {name:28s} {seconds:8.2f} {len(lon) / seconds:12,.0f}")
+
+    # Brute force on a sample, which also checks the grid answers
+    sample = min(len(lon), 20_000)
+    dist, seconds = timed(lambda: local_distance_km(
+        lon[:sample, None], lat[:sample, None], centroids.lon, centroids.lat
+    ))
+    brute_ids = centroids.ids[np.argmin(dist, axis=1)]
+    print(f"  {'brute force, nearest':28s} {seconds:8.2f} {sample / seconds:12,.0f}  ({sample:,} points)")
+
+    ids, distances = results["centroids, nearest"]
+    mismatches = int((ids[:sample, 0] != brute_ids).sum())
+    print(f"\nGrid vs brute force: {mismatches} mismatches in {sample:,} points")
+    inside = results["polygons, nearest"][1] == 0
+    print(f"Points inside an LSG polygon: {inside.mean():.1%}; "
+          f"median distance to the nearest centroid {np.median(distances[:, 0]):.1f} km")
+
+
+if __name__ == "__main__":
+    main()
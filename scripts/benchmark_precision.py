@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark precision-grid snapping before dissolve and simplify
+For each grid size, snaps the LSG layer and reports what stage 02's
+district dissolve and stage 03's simplify cost and produce: time, vertex
+counts, output size, slivers and whether neighbours still share vertices
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import load_json  # noqa: E402
+from kerala_spatial import DEFAULT_GRID_SIZE, shared_vertex_report, snap_geometries  # noqa: E402
+
+LSG_FILE = Path("data/processed/kerala_lsg_with_districts.geojson")
+GRID_SIZES = sorted({0, 1e-8, 1e-7, 1e-6, 1e-5, DEFAULT_GRID_SIZE})
+SIMPLIFY_TOLERANCE = 0.001  # stage 03's LSG tolerance
+SLIVER_AREA = 1e-8  # sq deg, ~0.01 ha
+
+
+def timed(func):
+    """(result, seconds)"""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def jitter(geom, seed, size):
+    """
+    Move every vertex by up to `size`, differently in each geometry
+
+    The offset depends only on the coordinate and the seed, so ring closing
+    points stay equal while a vertex shared with a neighbour drifts apart.
+    """
+    def shift(coords):
+        phase = coords[:, ::-1] * 1e7 + seed
+        return coords + size * np.sin(phase * 12.9898) * np.cos(phase * 78.233)
+    return shapely.make_valid(shapely.transform(geom, shift))
+
+
+def slivers(geoms):
+    """Holes and tiny parts left in dissolved districts"""
+    parts = shapely.get_parts(geoms)
+    rings = shapely.get_num_interior_rings(parts).sum()
+    return int(rings + (shapely.area(parts) < SLIVER_AREA).sum())
+
+
+def measure(geoms, districts, grid_size):
+    """One row of the report for one grid size"""
+    snapped, snap_s = timed(lambda: snap_geometries(geoms, grid_size))
+
+    groups = defaultdict(list)
+    for i, district in enumerate(districts):
+        if district != 'Unknown':
+            groups[district].append(i)
+    dissolved, dissolve_s = timed(lambda: np.array(
+        [shapely.union_all(snapped[rows]) for rows in groups.values()], dtype=object
+    ))
+    simplified, simplify_s = timed(lambda: shapely.simplify(snapped, SIMPLIFY_TOLERANCE, preserve_topology=True))
+    check = shared_vertex_report(snapped, max(grid_size, 1e-9) * 2)
+
+    output_bytes = sum(len(text) for text in shapely.to_geojson(snapped))
+    return {
+        'grid': grid_size,
+        'snap_s': snap_s,
+        'dissolve_s': dissolve_s,
+        'simplify_s': simplify_s,
+        'vertices': int(shapely.get_num_coordinates(snapped).sum()),
+        'district_vertices': int(shapely.get_num_coordinates(dissolved).sum()),
+        'slivers': slivers(dissolved),
+        'output_mb': output_bytes / 1024 / 1024,
+        'simplified_vertices': int(shapely.get_num_coordinates(simplified).sum()),
+        'unmatched': check['unmatched'],
+        'overlap': check['overlap_area'],
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark precision-grid snapping")
+    parser.add_argument('--input', type=Path, default=LSG_FILE,
+                        help="Stage 01 output; run it with --grid-size 0 to compare against unsnapped data")
+    parser.add_argument('--grid-sizes', type=float, nargs='+', default=GRID_SIZES)
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help="Perturb vertices by up to this many degrees first, to emulate noisy sources")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: File not found: {args.input}")
+        print("Please run scripts/01_add_district_field.py first")
+        sys.exit(1)
+
+    features = [f for f in load_json(args.input)['features'] if f.get('geometry')]
+    geoms = shapely.from_geojson([json.dumps(f['geometry']) for f in features])
+    districts = [f['properties'].get('district', 'Unknown') for f in features]
+    if args.jitter:
+        geoms = np.array([jitter(geom, i, args.jitter) for i, geom in enumerate(geoms)], dtype=object)
+
+    print("="*60)
+    print("PRECISION GRID BENCHMARK")
+    print("="*60)
+    print(f"LSGs: {len(geoms):,}" + (f" (jittered by {args.jitter:g}°)" if args.jitter else ""))
+
+    rows = [measure(geoms, districts, grid_size) for grid_size in args.grid_sizes]
+
+    print(f"\n  {'grid':>8s} {'snap s':>7s} {'dissolve s':>10s} {'simplify s':>10s} {'vertices':>10s} "
+          f"{'district v':>10s} {'simple v':>9s} {'slivers':>8s} {'MB':>6s} {'unmatched':>9s} {'overlap':>9s}")
+    for row in rows:
+        grid = f"{row['grid']:g}" if row['grid'] else "as-is"
+        print(f"  {grid:>8s} {row['snap_s']:7.2f} {row['dissolve_s']:10.2f} {row['simplify_s']:10.2f} "
+              f"{row['vertices']:10,} {row['district_vertices']:10,} {row['simplified_vertices']:9,} {row['slivers']:8,} "
+              f"{row['output_mb']:6.1f} {row['unmatched']:9,} {row['overlap']:9.2g}")
+
+    print("\nvertices / district v / simple v: LSG, dissolved district and simplified LSG vertex counts")
+    print("slivers: holes and parts under ~0.01 ha left in dissolved districts; MB: LSG layer as GeoJSON")
+    print("unmatched: border vertices with no exact twin on the neighbouring LSG")
+
+
+if __name__ == "__main__":
+    main()
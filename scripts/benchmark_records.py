@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark record models for the search index
+Compares memory and lookup time of plain dicts, SearchEntry records and
+the columnar SearchColumns container on search_index.json, and startup
+time of JSON parsing against opening the mmap binary index
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dumps, load_json, loads  # noqa: E402
+from kerala_lsg_binary import BinaryLSGIndex, build_binary_index  # noqa: E402
+from kerala_lsg_records import SearchColumns, SearchEntry  # noqa: E402
+
+
+def measure(build):
+    """Return (result, bytes still allocated once it is built)"""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size
+
+
+def best_of(func, repeat):
+    """Fastest wall time of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark search index record models")
+    parser.add_argument('--input', type=Path, default=Path("data/processed/search_index.json"))
+    parser.add_argument('--scale', type=int, default=20,
+                        help="Replicate entries this many times, e.g. ~20x for ward level (default: 20)")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: File not found: {args.input}")
+        sys.exit(1)
+
+    raw = load_json(args.input)
+    items = [dict(item, id=n * len(raw) + item['id']) for n in range(args.scale) for item in raw]
+    payload = dumps(items, minify=True)
+    districts = sorted({item['district'] for item in raw})
+    del raw, items
+
+    print("="*60)
+    print("RECORD MODEL BENCHMARK")
+    print("="*60)
+    print(f"Entries: {args.scale} x {args.input.name}")
+
+    # Every model is built from its own parse of the same JSON; intermediate
+    # dicts are dropped before measuring, so sizes are what each model retains
+    dicts, dict_bytes = measure(lambda: loads(payload))
+    entries, entry_bytes = measure(lambda: [SearchEntry.from_dict(item) for item in loads(payload)])
+    columns, column_bytes = measure(lambda: SearchColumns.from_dicts(loads(payload)))
+    print(f"         {len(dicts):,} entries")
+
+    def filter_dicts():
+        for district in districts:
+            [item for item in dicts if item['district'] == district and item['lsg_type'] == 'municipality']
+
+    def filter_entries():
+        for district in districts:
+            [e for e in entries if e.district == district and e.lsg_type == 'municipality']
+
+    def filter_columns():
+        for district in districts:
+            columns.rows_where(district=district, lsg_type='municipality')
+
+    print(f"\n  {'model':16s} {'memory KB':>12s} {'filter ms':>12s}")
+    for name, size, func in (
+        ('dicts', dict_bytes, filter_dicts),
+        ('SearchEntry', entry_bytes, filter_entries),
+        ('SearchColumns', column_bytes, filter_columns),
+    ):
+        print(f"  {name:16s} {size / 1024:12,.1f} {best_of(func, args.repeat):12.2f}")
+
+    # Startup: what a short-lived worker pays before its first lookup
+    with tempfile.TemporaryDirectory() as tmp:
+        json_file = Path(tmp) / "search_index.json"
+        binary_file = Path(tmp) / "search_index.bin"
+        json_file.write_bytes(payload)
+        binary_file.write_bytes(build_binary_index(entries))
+        last_id = entries[-1].id
+
+        def start_json():
+            SearchColumns.from_dicts(load_json(json_file)).row_of(last_id)
+
+        def start_binary():
+            with BinaryLSGIndex(binary_file) as index:
+                index.get(last_id)
+
+        print(f"\n  {'startup':16s} {'file KB':>12s} {'open+get ms':>12s}")
+        print(f"  {'json':16s} {json_file.stat().st_size / 1024:12,.1f} {best_of(start_json, args.repeat):12.2f}")
+        print(f"  {'binary (mmap)':16s} {binary_file.stat().st_size / 1024:12,.1f} "
+              f"{best_of(start_binary, args.repeat):12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ward pipeline at full ward scale
+Cuts every LSG into grid cells to build a synthetic ~21,900-ward layer,
+runs scripts/06_process_wards.py on it in a subprocess and compares its
+peak memory with loading the same layer whole in geopandas
+"""
+
+import argparse
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import shapely
+from shapely.geometry import box, mapping, shape
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import FeatureCollectionWriter, load_json  # noqa: E402
+
+LSG_FILE = Path("data/processed/kerala_lsg_with_districts.geojson")
+
+
+def make_wards(lsg_file, ward_file, target):
+    """Write a synthetic ward layer with about `target` wards; returns the count"""
+    lsgs = load_json(lsg_file)['features']
+    per_lsg = max(1, target / len(lsgs))
+    count = 0
+    with FeatureCollectionWriter(ward_file, minify=True) as writer:
+        for feature in lsgs:
+            props = feature['properties']
+            geom = shape(feature['geometry'])
+            x0, y0, x1, y1 = geom.bounds
+            n = max(1, math.ceil(math.sqrt(per_lsg * 1.3)))
+            dx, dy = (x1 - x0) / n, (y1 - y0) / n
+            cells = [box(x0 + i * dx, y0 + j * dy, x0 + (i + 1) * dx, y0 + (j + 1) * dy)
+                     for i in range(n) for j in range(n)]
+            parts = [part for part in shapely.intersection(geom, cells) if not part.is_empty]
+            for ward_no, part in enumerate(parts[:math.ceil(per_lsg)] if len(parts) > per_lsg else parts, 1):
+                writer.write({
+                    'type': 'Feature',
+                    'properties': {
+                        'ward_no': ward_no,
+                        'ward_name': f"Ward {ward_no}",
+                        'lsg': props.get('wikidata') or props.get('name'),
+                        'district': props.get('district'),
+                    },
+                    'geometry': mapping(part),
+                })
+                count += 1
+    return count
+
+
+def run(args):
+    """Run a Python subprocess from the repo root; return (seconds, stdout)"""
+    start = time.perf_counter()
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stdout[-2000:])
+        print(result.stderr[-2000:])
+        sys.exit(1)
+    return time.perf_counter() - start, result.stdout
+
+
+def peak_from(output):
+    """'Peak memory: N MB' line printed by the measured process"""
+    return next(float(line.split()[2].replace(',', ''))
+                for line in output.splitlines() if line.startswith("Peak memory:"))
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Benchmark the ward pipeline at full scale")
+    parser.add_argument('--lsg-layer', type=Path, default=LSG_FILE)
+    parser.add_argument('--wards', type=int, default=21_900)
+    args = parser.parse_args()
+
+    lsg_layer = args.lsg_layer.resolve()
+    if not lsg_layer.exists():
+        print(f"Error: File not found: {args.lsg_layer}")
+        print("Please run scripts/01_add_district_field.py first")
+        sys.exit(1)
+
+    print("="*60)
+    print("WARD SCALE BENCHMARK")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory(prefix="ward-bench-") as tmp:
+        ward_file = Path(tmp) / "wards.geojson"
+        start = time.perf_counter()
+        count = make_wards(lsg_layer, ward_file, args.wards)
+        print(f"Synthetic wards: {count:,} ({ward_file.stat().st_size / 1024 / 1024:,.1f} MB) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        # Baseline: the whole layer in one GeoDataFrame, dissolved to LSGs
+        baseline_code = (
+            "import resource, geopandas as gpd\n"
+            f"gdf = gpd.read_file({str(ward_file)!r})\n"
+            "gdf.dissolve(by='lsg')\n"
+            "print(f'Peak memory: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB')\n"
+        )
+        base_s, base_output = run(['-c', baseline_code])
+        ward_s, output = run([
+            str(ROOT / "scripts" / "06_process_wards.py"),
+            '--input', str(ward_file), '--lsg-layer', str(lsg_layer), '--output-dir', str(Path(tmp) / "out"),
+        ])
+
+        print(f"\n  {'run':28s} {'seconds':>8s} {'peak MB':>8s}")
+        print(f"  {'geopandas whole layer':28s} {base_s:8.2f} {peak_from(base_output):8,.0f}")
+        print(f"  {'06_process_wards (streamed)':28s} {ward_s:8.2f} {peak_from(output):8,.0f}")
+
+        print("\nWard pipeline phases:")
+        in_timings = False
+        for line in output.splitlines():
+            if line.startswith("Timings:"):
+                in_timings = True
+            elif in_timings and line.startswith("  "):
+                print(line)
+            elif in_timings:
+                break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Build the rollup cube of the final LSG layer
+Sums LSG counts, areas and officials coverage once per release for every
+grouping of district, LSG type and president's party (kerala_rollup.py), so
+the query library and the web app read totals instead of scanning features.
+Writes data/processed/rollup.json (publish_static.py publishes it).
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dump_json, load_json  # noqa: E402
+from kerala_rollup import DIMENSIONS, ROLLUP_FILE, Rollup, rollup_features  # noqa: E402
+
+INPUT_FILE = Path("data/processed/kerala_lsg_final.geojson")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Build district x LSG type x party aggregates")
+    parser.add_argument('--input', type=Path, default=INPUT_FILE)
+    parser.add_argument('--output', type=Path, default=ROLLUP_FILE)
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: File not found: {args.input}")
+        print("Please run scripts/04_merge_officials_data.py first")
+        sys.exit(1)
+
+    print("="*60)
+    print("ROLLUP CUBE")
+    print("="*60)
+
+    start = time.perf_counter()
+    cube = rollup_features(load_json(args.input))
+    dump_json(cube, args.output, minify=True)
+    elapsed = time.perf_counter() - start
+
+    rollup = Rollup(cube)
+    total = rollup.get()
+    print(f"LSGs: {total['lsgs']:,}, area: {total['area_sq_km']:,.2f} sq km, "
+          f"with officials: {total['with_officials']:,} ({100 * rollup.coverage():.1f}%)")
+    print("Cells: " + ", ".join(f"{name or 'total'} {len(cells)}" for name, cells in cube['groups'].items()))
+
+    print(f"\n  {'district':20s} {'LSGs':>6s} {'sq km':>10s} {'officials':>10s}")
+    for district, cell in rollup.breakdown('district').items():
+        print(f"  {district:20s} {cell['lsgs']:6d} {cell['area_sq_km']:10,.2f} "
+              f"{100 * cell['with_officials'] / cell['lsgs']:9.1f}%")
+
+    parties = sorted(rollup.breakdown('party').items(), key=lambda item: -item[1]['lsgs'])
+    print("\nPresidents by party: " + ", ".join(f"{party} {cell['lsgs']}" for party, cell in parties))
+
+    print(f"\n✓ Rollup ({' x '.join(DIMENSIONS)}) in {elapsed:.2f}s, "
+          f"{args.output.stat().st_size / 1024:,.1f} KB: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
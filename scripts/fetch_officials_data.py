@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Fetch officials data from LSG websites into the officials CSV
+Crawls the `website` column concurrently with a pooled HTTP client,
+per-host rate limits and an ETag/Last-Modified cache, then fills in
+president and secretary fields parsed from the pages
+"""
+
+import argparse
+import asyncio
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from urllib.parse import urlsplit
+
+try:
+    import requests
+    from bs4 import BeautifulSoup
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    print("Error: requests and beautifulsoup4 are not installed")
+    print("Please run: pip install -r requirements.txt")
+    sys.exit(1)
+
+USER_AGENT = "kerala-lsg-mapping/1.0 (+https://github.com/cyrilckurian/lsg-mapping-kerala)"
+
+# CSV columns this script fills in
+OFFICIALS_FIELDS = [
+    'president_name', 'president_party', 'president_contact', 'president_email',
+    'secretary_name', 'secretary_contact', 'secretary_email'
+]
+
+PRESIDENT_ROLE = re.compile(
+    r'(?<!vice )(?<!vice-)(?<!deputy )\b(president|mayor|chair(?:person|man|woman))\b', re.I
+)
+SECRETARY_ROLE = re.compile(
+    r'(?<!assistant )(?<!joint )(?<!additional )\b(secretary|commissioner)\b', re.I
+)
+EMAIL = re.compile(r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+')
+PHONE = re.compile(r'(?:\+91[\s-]?)?(?:0\d{2,4}[\s-]?\d{6,8}|[6-9]\d{9})\b')
+# "Name (Party)" - party may itself contain one level of parentheses, e.g. CPI(M)
+NAME_WITH_PARTY = re.compile(r'^(.*?)\s*\(((?:[^()]|\([^()]*\))+)\)\s*$')
+LABEL_VALUE = re.compile(r'^\s*([^:\-–]{3,40}?)\s*[:\-–]\s*(.+?)\s*$')
+
+
+class ResponseCache:
+    """On-disk store of response bodies keyed by URL, with their validators"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.index_file = self.cache_dir / "index.json"
+        self.entries = {}
+        if self.index_file.exists():
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def _body_path(self, url):
+        return self.cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.html"
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since headers for a cached URL"""
+        entry = self.entries.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def load(self, url):
+        with open(self._body_path(url), 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def store(self, url, body, etag=None, last_modified=None):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._body_path(url), 'w', encoding='utf-8') as f:
+            f.write(body)
+        self.entries[url] = {
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        }
+
+    def save(self):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_file.with_name(f".{self.index_file.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_file)
+
+
+class HostRateLimiter:
+    """Space out the starts of requests to the same host by a minimum interval"""
+
+    def __init__(self, per_host_rate):
+        self.min_interval = 1.0 / per_host_rate if per_host_rate > 0 else 0.0
+        self.last_start = {}
+        self.locks = {}
+
+    @asynccontextmanager
+    async def turn(self, host):
+        """
+        Wait for the host's next turn; the request starts when the block exits
+
+        Callers for one host queue on the host's lock, not on any shared
+        resource, so a busy host does not hold up the others.
+        """
+        loop = asyncio.get_running_loop()
+        async with self.locks.setdefault(host, asyncio.Lock()):
+            last = self.last_start.get(host)
+            if last is not None:
+                delay = last + self.min_interval - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            yield
+            self.last_start[host] = loop.time()
+
+
+class OfficialsFetcher:
+    """Concurrent fetcher sharing one pooled requests.Session"""
+
+    def __init__(self, cache, concurrency=32, per_host_rate=1.0, timeout=20):
+        self.cache = cache
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.limiter = HostRateLimiter(per_host_rate)
+        # One thread per pooled connection; the default executor is capped at cpu_count + 4
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency, max_retries=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    async def fetch(self, url):
+        """
+        Fetch one page, revalidating against the cache
+
+        Returns:
+            dict with url, status ('fetched', 'not_modified' or 'error'), html and error
+        """
+        host = urlsplit(url).netloc.lower()
+        headers = self.cache.conditional_headers(url)
+
+        # Rate-limit per host before taking a connection slot, so requests
+        # waiting for their host's turn leave the slots to other hosts
+        async with self.limiter.turn(host):
+            await self.semaphore.acquire()
+        try:
+            response = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                partial(self.session.get, url, headers=headers, timeout=self.timeout)
+            )
+        except requests.RequestException as e:
+            return {'url': url, 'status': 'error', 'html': None, 'error': str(e)}
+        finally:
+            self.semaphore.release()
+
+        if response.status_code == 304:
+            return {'url': url, 'status': 'not_modified', 'html': self.cache.load(url), 'error': None}
+
+        if response.status_code != 200:
+            return {'url': url, 'status': 'error', 'html': None,
+                    'error': f"HTTP {response.status_code}"}
+
+        html = response.text
+        self.cache.store(
+            url, html,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified')
+        )
+        return {'url': url, 'status': 'fetched', 'html': html, 'error': None}
+
+    async def fetch_all(self, urls):
+        try:
+            return await asyncio.gather(*(self.fetch(url) for url in urls))
+        finally:
+            self.session.close()
+            self.executor.shutdown()
+
+
+def split_name_party(text):
+    """Split "Name (Party)" into its parts"""
+    match = NAME_WITH_PARTY.match(text)
+    if match:
+        return match.group(1).strip(), match.group(2).strip()
+    return text.strip(), ''
+
+
+def clean_name(text):
+    """Strip role words, contact details and punctuation around a name"""
+    text = PHONE.sub('', EMAIL.sub('', text))
+    text = PRESIDENT_ROLE.sub('', SECRETARY_ROLE.sub('', text))
+    return re.sub(r'\s+', ' ', text).strip(' :-–,|')
+
+
+def _official_from_cells(cells, headers):
+    """Pull name/party/contact/email out of a table row's cells"""
+    info = {'name': '', 'party': '', 'contact': '', 'email': ''}
+    row_text = ' '.join(cells)
+
+    if len(headers) == len(cells):
+        for header, cell in zip(headers, cells, strict=True):
+            if 'party' in header and cell:
+                info['party'] = cell
+            elif 'name' in header and cell:
+                info['name'] = cell
+
+    if not info['name']:
+        for cell in cells:
+            # Role-only and contact-only cells clean down to nothing
+            name = clean_name(cell)
+            if name:
+                info['name'] = name
+                break
+
+    if not info['party']:
+        info['name'], info['party'] = split_name_party(info['name'])
+
+    email = EMAIL.search(row_text)
+    phone = PHONE.search(row_text)
+    info['email'] = email.group(0) if email else ''
+    info['contact'] = phone.group(0) if phone else ''
+    return info
+
+
+def parse_officials(html):
+    """
+    Parse president and secretary details from an LSG web page
+
+    Looks at table rows first (the common layout on LSG sites), then
+    falls back to "Role: Name" lines in the page text.
+
+    Returns:
+        dict keyed by the CSV officials columns; missing values are ''
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    found = {'president': None, 'secretary': None}
+
+    for table in soup.find_all('table'):
+        headers = []
+        for row in table.find_all('tr'):
+            cells = [c.get_text(' ', strip=True) for c in row.find_all(['th', 'td'])]
+            if row.find('th') and not row.find('td'):
+                headers = [c.lower() for c in cells]
+                continue
+            # Ignore addresses like secretary@... when looking for the role
+            row_text = EMAIL.sub('', ' '.join(cells))
+            for role, pattern in (('president', PRESIDENT_ROLE), ('secretary', SECRETARY_ROLE)):
+                if found[role] is None and pattern.search(row_text):
+                    found[role] = _official_from_cells(cells, headers)
+
+    lines = [line for line in soup.get_text('\n').splitlines() if line.strip()]
+    for i, line in enumerate(lines):
+        match = LABEL_VALUE.match(line)
+        if not match:
+            continue
+        label, value = match.groups()
+        for role, pattern in (('president', PRESIDENT_ROLE), ('secretary', SECRETARY_ROLE)):
+            if found[role] is None and pattern.search(EMAIL.sub('', label)):
+                # Contact details usually follow on the next couple of lines
+                context = ' '.join([value] + lines[i + 1:i + 3])
+                name, party = split_name_party(clean_name(value))
+                email = EMAIL.search(context)
+                phone = PHONE.search(context)
+                found[role] = {
+                    'name': name,
+                    'party': party,
+                    'contact': phone.group(0) if phone else '',
+                    'email': email.group(0) if email else '',
+                }
+
+    president = found['president'] or {}
+    secretary = found['secretary'] or {}
+    return {
+        'president_name': president.get('name', ''),
+        'president_party': president.get('party', ''),
+        'president_contact': president.get('contact', ''),
+        'president_email': president.get('email', ''),
+        'secretary_name': secretary.get('name', ''),
+        'secretary_contact': secretary.get('contact', ''),
+        'secretary_email': secretary.get('email', ''),
+    }
+
+
+def update_records(records, parsed_by_url, overwrite=False):
+    """
+    Copy parsed officials fields into CSV rows
+
+    Existing values are kept unless overwrite is set, so hand-entered
+    data is never replaced by a scrape.
+
+    Returns:
+        Number of rows with at least one field filled in
+    """
+    updated = 0
+    for row in records:
+        parsed = parsed_by_url.get(row.get('website', '').strip())
+        if not parsed:
+            continue
+        changed = False
+        for field in OFFICIALS_FIELDS:
+            value = parsed.get(field, '')
+            if value and (overwrite or not row.get(field)):
+                if row.get(field) != value:
+                    row[field] = value
+                    changed = True
+        if changed:
+            updated += 1
+    return updated
+
+
+def fetch_officials_data(officials_csv, output_csv, cache_dir, concurrency=32,
+                         per_host_rate=1.0, timeout=20, overwrite=False):
+    """Fetch every website listed in the CSV and write the updated rows"""
+
+    print(f"Reading officials data: {officials_csv}...")
+    with open(officials_csv, mode='r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        records = list(reader)
+
+    urls = sorted({row['website'].strip() for row in records if row.get('website', '').strip()})
+    print(f"  Records: {len(records)}")
+    print(f"  Websites: {len(urls)}")
+
+    cache = ResponseCache(cache_dir)
+    fetcher = OfficialsFetcher(cache, concurrency, per_host_rate, timeout)
+
+    print(f"\nFetching with {concurrency} connections, {per_host_rate} req/s per host...")
+    start = time.perf_counter()
+    results = asyncio.run(fetcher.fetch_all(urls))
+    elapsed = time.perf_counter() - start
+    cache.save()
+
+    parsed_by_url = {}
+    status_counts = {}
+    for result in results:
+        status_counts[result['status']] = status_counts.get(result['status'], 0) + 1
+        if result['html']:
+            parsed_by_url[result['url']] = parse_officials(result['html'])
+
+    updated = update_records(records, parsed_by_url, overwrite)
+
+    tmp_path = output_csv.with_name(f".{output_csv.name}.{os.getpid()}.tmp")
+    with open(tmp_path, mode='w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+    os.replace(tmp_path, output_csv)
+
+    # Print summary
+    print("\n" + "="*60)
+    print("OFFICIALS FETCH COMPLETE")
+    print("="*60)
+    print(f"Websites: {len(urls)} in {elapsed:.1f}s")
+    for status, count in sorted(status_counts.items()):
+        print(f"  {status}: {count}")
+    print(f"Rows updated: {updated}")
+
+    errors = [r for r in results if r['status'] == 'error']
+    if errors:
+        print("\nFirst 10 errors:")
+        for result in errors[:10]:
+            print(f"  - {result['url']}: {result['error']}")
+
+    print(f"\n✓ Officials data saved to: {output_csv}")
+    return True
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Fetch officials data from LSG websites")
+    parser.add_argument('--csv', type=Path, default=Path("data/raw/lsg_officials.csv"),
+                        help="Officials CSV to read (default: data/raw/lsg_officials.csv)")
+    parser.add_argument('--output', type=Path, default=None,
+                        help="CSV to write (default: overwrite --csv)")
+    parser.add_argument('--cache-dir', type=Path, default=Path("data/cache/officials_http"),
+                        help="HTTP cache directory (default: data/cache/officials_http)")
+    parser.add_argument('--concurrency', type=int, default=32,
+                        help="Maximum requests in flight (default: 32)")
+    parser.add_argument('--per-host-rate', type=float, default=1.0,
+                        help="Requests per second per host (default: 1.0)")
+    parser.add_argument('--timeout', type=float, default=20, help="Request timeout in seconds")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="Replace values already present in the CSV")
+    args = parser.parse_args()
+
+    if not args.csv.exists():
+        print(f"Error: Officials CSV file not found: {args.csv}")
+        print("You can start with the template at: data/raw/lsg_officials_template.csv")
+        sys.exit(1)
+
+    fetch_officials_data(
+        args.csv, args.output or args.csv, args.cache_dir,
+        concurrency=args.concurrency, per_host_rate=args.per_host_rate,
+        timeout=args.timeout, overwrite=args.overwrite
+    )
+
+
+if __name__ == "__main__":
+    main()
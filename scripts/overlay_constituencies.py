@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Overlay LSGs with assembly and parliamentary constituency boundaries
+Records each LSG's constituencies with their overlap fraction in
+kerala_lsg_final.geojson (run after stage 4, before stage 5) and writes a
+reverse index from constituency to LSGs
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+try:
+    from kerala_constituencies import (
+        DEFAULT_CONSTITUENCY_INDEX,
+        KINDS,
+        MIN_FRACTION,
+        ConstituencyLayer,
+        apply_constituencies,
+        build_constituency_index,
+        overlay_lsgs,
+    )
+except ImportError as e:
+    print(f"Error: {e}")
+    print("Please run: pip install shapely")
+    sys.exit(1)
+
+from kerala_json_io import dump_feature_collection, dump_json, load_json  # noqa: E402
+from kerala_layers import ATTRIBUTES_FILE, GEOMETRY_FILE, write_split_layer  # noqa: E402
+
+LSG_FILE = Path("data/processed/kerala_lsg_final.geojson")
+
+
+def overlay_constituencies(lsg_file, boundary_files, output_file, index_file,
+                           min_fraction=MIN_FRACTION, workers=None):
+    """
+    Overlay the LSG layer with constituency boundaries
+
+    Args:
+        lsg_file: Merged LSG layer from stage 04
+        boundary_files: {kind: path} for the constituency layers to use
+        output_file: Where to write the annotated LSG layer (may be lsg_file)
+        index_file: Where to write the constituency -> LSGs index
+        min_fraction: Smallest overlap share kept
+        workers: Thread count for the per-district overlay
+
+    Returns:
+        Summary dict (per-kind stats, layer sizes, seconds)
+    """
+    start = time.perf_counter()
+    geo_data = load_json(lsg_file)
+    layers = [ConstituencyLayer.load(kind, path) for kind, path in boundary_files.items()]
+
+    matches = overlay_lsgs(geo_data['features'], layers, min_fraction, workers)
+    stats = apply_constituencies(geo_data, matches)
+    index = build_constituency_index(geo_data, min_fraction)
+
+    dump_feature_collection(geo_data, output_file)
+    if Path(output_file).resolve() == LSG_FILE.resolve():
+        # Constituencies are attributes; the geometry file stays as it is
+        write_split_layer(geo_data, GEOMETRY_FILE, ATTRIBUTES_FILE)
+    dump_json(index, index_file, minify=True)
+    return {
+        'lsgs': len(geo_data['features']),
+        'layers': {layer.kind: len(layer) for layer in layers},
+        'stats': stats,
+        'index': {kind: len(index.get(kind, {})) for kind in boundary_files},
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Overlay LSGs with constituency boundaries")
+    parser.add_argument('--input', type=Path, default=LSG_FILE)
+    parser.add_argument('--output', type=Path, help="Annotated LSG layer (default: update --input in place)")
+    parser.add_argument('--assembly', type=Path, default=KINDS['assembly'][0])
+    parser.add_argument('--parliamentary', type=Path, default=KINDS['parliamentary'][0])
+    parser.add_argument('--index-file', type=Path, default=DEFAULT_CONSTITUENCY_INDEX)
+    parser.add_argument('--min-fraction', type=float, default=MIN_FRACTION)
+    parser.add_argument('--workers', type=int, help="Overlay threads (default: one per CPU)")
+    args = parser.parse_args()
+
+    if not args.input.exists():
+        print(f"Error: File not found: {args.input}")
+        print("Please run scripts/04_merge_officials_data.py first")
+        sys.exit(1)
+
+    boundary_files = {kind: path for kind, path in
+                      (('assembly', args.assembly), ('parliamentary', args.parliamentary)) if path.exists()}
+    if not boundary_files:
+        print(f"Error: No constituency boundaries found ({args.assembly}, {args.parliamentary})")
+        sys.exit(1)
+
+    print("="*60)
+    print("CONSTITUENCY OVERLAY")
+    print("="*60)
+
+    summary = overlay_constituencies(args.input, boundary_files, args.output or args.input,
+                                     args.index_file, args.min_fraction, args.workers)
+
+    print(f"\nLSGs: {summary['lsgs']}")
+    print(f"\n  {'kind':14s} {'shapes':>7s} {'filled':>7s} {'kept':>7s} {'disagree':>9s} {'none':>6s}")
+    for kind, stats in summary['stats'].items():
+        print(f"  {kind:14s} {summary['layers'][kind]:7d} {stats['filled']:7d} {stats['kept']:7d} "
+              f"{stats['disagree']:9d} {stats['none']:6d}")
+    for kind, stats in summary['stats'].items():
+        if stats['disagree']:
+            print(f"Warning: {stats['disagree']} CSV {KINDS[kind][1]} values match no overlapping {kind} constituency")
+    print(f"\nOverlay took {summary['seconds']:.2f}s")
+    print(f"\n✓ LSG layer saved to: {args.output or args.input}")
+    print(f"✓ Constituency index saved to: {args.index_file}")
+
+
+if __name__ == "__main__":
+    main()
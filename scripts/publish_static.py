@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Publish processed data to the web app with content-hashed names
+Writes gzip/brotli variants at maximum compression and a manifest.json
+that the app loads first to find the current files
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_publish import MANIFEST_NAME, brotli, publish  # noqa: E402
+
+STATIC_DIR = Path("web-app/static/data")
+
+# Files the web app loads, in the order they are published
+PUBLISHED_FILES = [
+    Path("data/processed/kerala_lsg_geometry.geojson"),
+    Path("data/processed/kerala_lsg_attributes.json"),
+    Path("data/processed/kerala_districts.geojson"),
+    Path("data/processed/search_index.json"),
+    Path("data/processed/spatial_index.json"),
+    Path("data/processed/constituency_index.json"),
+    Path("data/processed/thumbnails.json"),
+    Path("data/processed/rollup.json"),
+    Path("data/raw/mahe_boundary.geojson"),
+]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Publish content-hashed, precompressed static data")
+    parser.add_argument('files', nargs='*', type=Path, help="Files to publish (default: all web app data)")
+    parser.add_argument('--static-dir', type=Path, default=STATIC_DIR)
+    parser.add_argument('--no-plain', action='store_true',
+                        help="Do not also copy files under their plain names")
+    args = parser.parse_args()
+
+    sources = [path for path in (args.files or PUBLISHED_FILES) if path.exists()]
+    if not sources:
+        print("Error: Nothing to publish")
+        print("Run the processing pipeline first (./run_all.sh)")
+        sys.exit(1)
+
+    print("="*60)
+    print("STATIC DATA PUBLISH")
+    print("="*60)
+    if brotli is None:
+        print("Note: brotli is not installed, writing gzip variants only (pip install brotli)")
+
+    manifest, removed = publish(sources, args.static_dir, keep_plain=not args.no_plain)
+
+    for src in sources:
+        entry = manifest['files'][src.name]
+        sizes = ', '.join(f"{encoding} {variant['bytes'] / 1024:,.1f} KB"
+                          for encoding, variant in entry['encodings'].items())
+        print(f"\n{src.name} -> {entry['path']}")
+        print(f"  {entry['bytes'] / 1024:,.1f} KB ({sizes})")
+
+    if removed:
+        print(f"\nRemoved {len(removed)} stale file(s)")
+    print(f"\n✓ Manifest saved to: {args.static_dir / MANIFEST_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Release tool: version the published datasets and write delta patches
+Hashes each feature's geometry and properties, compares them with the
+previous release and writes a patch of added, removed and changed features
+"""
+
+import argparse
+import hashlib
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import atomic_copy, dump_json, load_json  # noqa: E402
+from kerala_release import dataset_hash, hash_items, index_items, make_patch, members_of  # noqa: E402
+
+RELEASE_DIR = Path("data/releases")
+STATIC_RELEASE_DIR = Path("web-app/static/data/releases")
+MANIFEST_FORMAT = 'kerala-lsg-releases/1'
+
+DATASETS = [
+    Path("data/processed/kerala_lsg_final.geojson"),
+    Path("data/processed/search_index.json"),
+]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(release_dir):
+    manifest_file = release_dir / "manifest.json"
+    if manifest_file.exists():
+        return load_json(manifest_file)
+    return {'format': MANIFEST_FORMAT, 'datasets': {}}
+
+
+def release_dataset(path, release_dir, manifest):
+    """
+    Record a new version of one dataset if its content changed
+
+    Returns:
+        List of files written (hashes and patch), empty if unchanged
+    """
+    start = time.perf_counter()
+    data = load_json(path)
+    kind, items_by_id = index_items(data)
+    hashes = hash_items(items_by_id, kind)
+    digest = dataset_hash(hashes)
+
+    entry = manifest['datasets'].setdefault(path.name, {'kind': kind, 'current': 0, 'versions': []})
+    previous = entry['versions'][-1] if entry['versions'] else None
+
+    print(f"\n{path.name}: {len(hashes)} features, hash {digest}")
+    members = members_of(items_by_id, kind)
+    old_members = load_json(release_dir / previous['members']) if previous and previous.get('members') else None
+    if previous and previous['hash'] == digest and (old_members or {}) == members:
+        print(f"  Unchanged since v{previous['version']}")
+        return []
+
+    version = entry['current'] + 1
+    dataset_dir = release_dir / path.stem
+    hashes_file = dataset_dir / f"v{version:04d}.hashes.json"
+    dump_json(hashes, hashes_file, minify=True)
+    written = [hashes_file]
+    # Unhashed members (search entry ids), so the next patch only sends those that changed
+    if members:
+        members_file = dataset_dir / f"v{version:04d}.members.json"
+        dump_json(members, members_file, minify=True)
+        written.append(members_file)
+
+    version_info = {
+        'version': version,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'hash': digest,
+        'file_sha256': file_sha256(path),
+        'features': len(hashes),
+        'hashes': hashes_file.relative_to(release_dir).as_posix(),
+    }
+    if members:
+        version_info['members'] = members_file.relative_to(release_dir).as_posix()
+
+    if previous:
+        old_hashes = load_json(release_dir / previous['hashes'])
+        patch = make_patch(old_hashes, hashes, items_by_id, kind, previous['version'], version, old_members)
+        patch_file = dataset_dir / f"v{previous['version']:04d}-v{version:04d}.patch.json"
+        dump_json(patch, patch_file, minify=True)
+        written.append(patch_file)
+
+        version_info['patch'] = {
+            'from_version': previous['version'],
+            'file': patch_file.relative_to(release_dir).as_posix(),
+            'added': len(patch['added']),
+            'removed': len(patch['removed']),
+            'changed': len(patch['changed']),
+            'bytes': patch_file.stat().st_size,
+        }
+        print(f"  Patch v{previous['version']} -> v{version}: "
+              f"+{len(patch['added'])} -{len(patch['removed'])} ~{len(patch['changed'])} "
+              f"({patch_file.stat().st_size / 1024:,.1f} KB vs {path.stat().st_size / 1024:,.1f} KB full)")
+
+    entry['kind'] = kind
+    entry['current'] = version
+    entry['versions'].append(version_info)
+    print(f"  Released v{version} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return written
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Version datasets and write delta patches")
+    parser.add_argument('datasets', nargs='*', type=Path, help="Dataset files (default: final GeoJSON and search index)")
+    parser.add_argument('--release-dir', type=Path, default=RELEASE_DIR)
+    parser.add_argument('--publish', action='store_true',
+                        help=f"Also copy the manifest and new patches to {STATIC_RELEASE_DIR}")
+    args = parser.parse_args()
+
+    datasets = args.datasets or DATASETS
+    missing = [path for path in datasets if not path.exists()]
+    if missing:
+        for path in missing:
+            print(f"Error: File not found: {path}")
+        print("Run the processing pipeline first (./run_all.sh)")
+        sys.exit(1)
+
+    print("="*60)
+    print("DATASET RELEASE")
+    print("="*60)
+
+    manifest = load_manifest(args.release_dir)
+    written = []
+    for path in datasets:
+        written += release_dataset(path, args.release_dir, manifest)
+
+    manifest_file = args.release_dir / "manifest.json"
+    dump_json(manifest, manifest_file, minify=False)
+    print(f"\n✓ Manifest saved to: {manifest_file}")
+
+    if args.publish:
+        for path in written + [manifest_file]:
+            if path.suffix == '.json' and 'hashes' not in path.name:
+                atomic_copy(path, STATIC_RELEASE_DIR / path.relative_to(args.release_dir))
+        print(f"✓ Published to: {STATIC_RELEASE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
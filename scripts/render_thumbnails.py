@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Render SVG boundary thumbnails for every LSG and district
+Draws each LSG in its district and each district in the state from the
+stage 03 geometries, in a process pool. Thumbnails are cached by content
+hash, so a rerun only renders those whose geometry or context changed.
+Writes data/processed/thumbnails/ and the thumbnails.json index, and copies
+the images to the web app (publish_static.py publishes the index).
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from pathlib import Path
+
+import numpy as np
+import shapely
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dump_json, load_json  # noqa: E402
+from kerala_lsg_records import stable_feature_id, unique_ids  # noqa: E402
+from kerala_thumbnails import RENDER_VERSION, THUMBNAIL_SIZE, group_digests, render_group  # noqa: E402
+
+LSG_FILE = Path("data/processed/kerala_lsg_simplified.geojson")
+DISTRICTS_FILE = Path("data/processed/kerala_districts_simplified.geojson")
+OUTPUT_DIR = Path("data/processed/thumbnails")
+INDEX_FILE = Path("data/processed/thumbnails.json")
+STATIC_DIR = Path("web-app/static/data/thumbnails")
+INDEX_FORMAT = 'kerala-lsg-thumbnails/1'
+
+
+def read_layer(path):
+    """(properties list, geometry array) of the features that have a geometry"""
+    features = [f for f in load_json(path)['features'] if f.get('geometry')]
+    geoms = shapely.from_geojson([json.dumps(f['geometry']) for f in features])
+    return [f['properties'] for f in features], geoms
+
+
+def rounded_bounds(geoms):
+    return tuple(round(v, 6) for v in shapely.total_bounds(geoms).tolist())
+
+
+def build_groups(lsg_props, lsg_geoms, district_props, district_geoms):
+    """
+    Render groups: one per district for its LSGs, and one for the districts
+
+    Returns:
+        {'lsg': [group, ...], 'district': [group]} - see kerala_thumbnails.group_digests
+    """
+    districts = zip(district_props, district_geoms, strict=True)
+    outlines = {(p.get('district') or p.get('name')): g for p, g in districts}
+    ids = unique_ids(stable_feature_id(p) for p in lsg_props)
+
+    members = {}
+    for i, props in enumerate(lsg_props):
+        members.setdefault(props.get('district') or 'Unknown', []).append(i)
+
+    lsg_groups = []
+    for district, rows in members.items():
+        geoms = lsg_geoms[rows]
+        wkb = shapely.to_wkb(geoms).tolist()
+        outline = outlines.get(district)
+        lsg_groups.append({
+            'bounds': rounded_bounds(outline if outline is not None else geoms),
+            'context': wkb,
+            'outline': shapely.to_wkb(outline) if outline is not None else None,
+            'targets': [(ids[i], data) for i, data in zip(rows, wkb, strict=True)],
+        })
+
+    names = list(outlines)
+    district_wkb = shapely.to_wkb(np.array(list(outlines.values()), dtype=object)).tolist()
+    district_group = {
+        'bounds': rounded_bounds(district_geoms),
+        'context': district_wkb,
+        'outline': None,
+        'targets': list(zip(names, district_wkb, strict=True)),
+    }
+    return {'lsg': lsg_groups, 'district': [district_group] if names else []}
+
+
+def plan(groups, out_dir, size):
+    """
+    Index of every thumbnail, and the groups trimmed to those not yet rendered
+
+    Returns:
+        (index, todo)
+    """
+    index = {'format': INDEX_FORMAT, 'size': size, 'version': RENDER_VERSION}
+    todo = []
+    for kind, kind_groups in groups.items():
+        index[kind] = {}
+        for group in kind_groups:
+            digests = group_digests(group, size)
+            missing = {}
+            for key, wkb in group['targets']:
+                index[kind][key] = f"{digests[key]}.svg"
+                if not (out_dir / index[kind][key]).exists():
+                    missing[digests[key]] = wkb
+            if missing:
+                todo.append({**group, 'targets': list(missing.items())})
+    # Largest groups first, so the pool finishes together
+    todo.sort(key=lambda group: -len(group['targets']))
+    return index, todo
+
+
+def referenced(index):
+    return {name for kind in ('lsg', 'district') for name in index.get(kind, {}).values()}
+
+
+def prune(directory, keep):
+    removed = 0
+    for path in directory.glob("*.svg"):
+        if path.name not in keep:
+            path.unlink()
+            removed += 1
+    return removed
+
+
+def sync_static(index, out_dir, static_dir, previous_index_file):
+    """Copy new thumbnails to the web app; keep the previous generation for loaded pages"""
+    static_dir.mkdir(parents=True, exist_ok=True)
+    names = referenced(index)
+    copied = 0
+    for name in names:
+        if not (static_dir / name).exists():
+            shutil.copyfile(out_dir / name, static_dir / name)
+            copied += 1
+    keep = names | (referenced(load_json(previous_index_file)) if previous_index_file.exists() else set())
+    return copied, prune(static_dir, keep)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Render LSG and district boundary thumbnails")
+    parser.add_argument('--lsg-file', type=Path, default=LSG_FILE)
+    parser.add_argument('--districts-file', type=Path, default=DISTRICTS_FILE)
+    parser.add_argument('--output-dir', type=Path, default=OUTPUT_DIR)
+    parser.add_argument('--index-file', type=Path, default=INDEX_FILE)
+    parser.add_argument('--size', type=int, default=THUMBNAIL_SIZE, help="Pixels along the longer side")
+    parser.add_argument('--workers', type=int, default=None, help="Render processes (default: one per CPU)")
+    parser.add_argument('--static-dir', type=Path, default=STATIC_DIR)
+    parser.add_argument('--no-static', action='store_true', help="Do not copy thumbnails to the web app")
+    args = parser.parse_args()
+
+    for path in (args.lsg_file, args.districts_file):
+        if not path.exists():
+            print(f"Error: File not found: {path}")
+            print("Please run scripts/03_simplify_geojson.py first")
+            sys.exit(1)
+
+    print("="*60)
+    print("BOUNDARY THUMBNAILS")
+    print("="*60)
+
+    start = time.perf_counter()
+    lsg_props, lsg_geoms = read_layer(args.lsg_file)
+    district_props, district_geoms = read_layer(args.districts_file)
+    groups = build_groups(lsg_props, lsg_geoms, district_props, district_geoms)
+
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    index, todo = plan(groups, args.output_dir, args.size)
+    total = len(index['lsg']) + len(index['district'])
+    rendered = sum(len(group['targets']) for group in todo)
+    print(f"Thumbnails: {len(index['lsg']):,} LSGs, {len(index['district'])} districts")
+    print(f"  Cached: {total - rendered:,}, to render: {rendered:,} in {len(todo)} group(s)")
+
+    workers = min(args.workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = sum(pool.map(render_group, todo, repeat(args.output_dir), repeat(args.size)))
+    else:
+        written = sum(render_group(group, args.output_dir, args.size) for group in todo)
+
+    removed = prune(args.output_dir, referenced(index))
+    dump_json(index, args.index_file, minify=True)
+
+    print(f"  Rendered {rendered:,} ({written / 1024:,.1f} KB) with {max(workers, 1)} process(es), "
+          f"removed {removed:,} stale")
+    files = list(args.output_dir.glob("*.svg"))
+    if files:
+        print(f"  Cache: {len(files):,} files, {sum(f.stat().st_size for f in files) / 1024:,.1f} KB")
+
+    if not args.no_static:
+        copied, pruned = sync_static(index, args.output_dir, args.static_dir,
+                                     args.static_dir.parent / args.index_file.name)
+        print(f"  Web app: {copied:,} copied, {pruned:,} removed ({args.static_dir})")
+
+    print(f"\n✓ Thumbnails in {time.perf_counter() - start:.1f}s: {args.output_dir}")
+    print(f"✓ Index saved to: {args.index_file} (published by scripts/publish_static.py)")
+
+
+if __name__ == "__main__":
+    main()
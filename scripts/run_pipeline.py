@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Run the processing pipeline as a dependency graph
+Starts every stage whose inputs are ready, several at a time, streams each
+stage's output with a [stage] prefix, stops everything on the first failure
+and reports stage timings and the critical path.
+Runs the same steps as run_all.sh (./run_all.sh --parallel uses this).
+"""
+
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+REPORT_FILE = Path("data/processed/pipeline_report.json")
+TAIL_LINES = 20  # output lines shown for a failed stage
+
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dump_json  # noqa: E402
+
+
+def script(name, *args):
+    return [sys.executable, "-u", str(Path("scripts") / name), *args]
+
+
+# needs: stages that must succeed first (a skipped stage counts as done)
+# after: stages that only have to finish first, whatever their outcome
+# optional: a failure skips the dependants instead of stopping the run
+# when: input files, any of which makes the stage run
+PIPELINE = [
+    {'name': '01_districts', 'cmd': script("01_add_district_field.py"), 'needs': []},
+    {'name': '02_dissolve', 'cmd': script("02_extract_districts.py"), 'needs': ['01_districts']},
+    {'name': '03_lsg', 'cmd': script("03_simplify_geojson.py", "--layer", "kerala_lsg"),
+     'needs': ['01_districts']},
+    {'name': '03_districts', 'cmd': script("03_simplify_geojson.py", "--layer", "kerala_districts"),
+     'needs': ['02_dissolve']},
+    # No officials data yet is not an error (see run_all.sh)
+    {'name': '04_officials', 'cmd': script("04_merge_officials_data.py"), 'needs': ['03_lsg'],
+     'optional': True},
+    {'name': 'constituencies', 'cmd': script("overlay_constituencies.py"), 'needs': ['04_officials'],
+     'when': [Path("data/raw/assembly_constituencies.geojson"),
+              Path("data/raw/parliamentary_constituencies.geojson")]},
+    {'name': '05_search', 'cmd': script("05_generate_search_index.py"),
+     'needs': ['04_officials', 'constituencies']},
+    {'name': '06_wards', 'cmd': script("06_process_wards.py"), 'needs': ['01_districts'],
+     'when': [Path("data/raw/kerala_wards.geojson")]},
+    # The map works without thumbnails
+    {'name': 'thumbnails', 'cmd': script("render_thumbnails.py"), 'needs': ['03_lsg', '03_districts'],
+     'optional': True},
+    {'name': 'rollup', 'cmd': script("build_rollup.py"), 'needs': ['04_officials', 'constituencies']},
+    {'name': 'publish', 'cmd': script("publish_static.py"), 'needs': ['02_dissolve'],
+     'after': ['03_districts', '05_search', '06_wards', 'thumbnails', 'rollup']},
+]
+
+
+def dependencies(stage):
+    return stage.get('needs', []) + stage.get('after', [])
+
+
+def check_graph(stages):
+    """
+    Stage names in an order that respects the dependencies
+
+    Raises:
+        ValueError: Unknown dependency or a cycle
+    """
+    names = [stage['name'] for stage in stages]
+    by_name = {stage['name']: stage for stage in stages}
+    waiting = {}
+    for stage in stages:
+        for dep in dependencies(stage):
+            if dep not in by_name:
+                raise ValueError(f"Stage {stage['name']} depends on unknown stage {dep}")
+        waiting[stage['name']] = len(set(dependencies(stage)))
+
+    order = []
+    ready = deque(name for name in names if not waiting[name])
+    while ready:
+        name = ready.popleft()
+        order.append(name)
+        for other in names:
+            if name in dependencies(by_name[other]):
+                waiting[other] -= 1
+                if not waiting[other]:
+                    ready.append(other)
+    if len(order) < len(names):
+        raise ValueError(f"Dependency cycle among: {', '.join(n for n in names if n not in order)}")
+    return order
+
+
+def critical_path(stages, results):
+    """
+    Longest chain of dependent stages by run time
+
+    Returns:
+        (stage names from first to last, seconds)
+    """
+    by_name = {stage['name']: stage for stage in stages}
+    best = {}
+    for name in check_graph(stages):
+        seconds = results.get(name, {}).get('seconds', 0.0)
+        previous = max((best[dep] for dep in dependencies(by_name[name])),
+                       key=lambda item: item[1], default=([], 0.0))
+        ran = results.get(name, {}).get('start') is not None
+        best[name] = (previous[0] + [name] if ran else previous[0], previous[1] + seconds)
+    return max(best.values(), key=lambda item: item[1], default=([], 0.0))
+
+
+def _stream(name, proc, lines):
+    for line in proc.stdout:
+        lines.put((name, line.rstrip('\n')))
+    proc.wait()
+    lines.put((name, None))
+
+
+def run_graph(stages, jobs=None, cwd=ROOT, env=None, echo=print):
+    """
+    Run stages as their dependencies complete, up to `jobs` at a time
+
+    Args:
+        stages: Stage dicts (see PIPELINE)
+        jobs: Concurrent stages (default: one per CPU)
+        cwd, env: Working directory and environment for every stage
+        echo: Called with each prefixed output line
+
+    Returns:
+        (ok, results) - results maps stage name to {'status', 'start',
+        'seconds', 'returncode', 'tail'}; status is 'ok', 'failed',
+        'skipped' (when-inputs missing), 'blocked' (a need failed) or
+        'stopped' (terminated after another stage failed)
+    """
+    order = check_graph(stages)
+    by_name = {stage['name']: stage for stage in stages}
+    jobs = jobs or os.cpu_count() or 1
+    width = max(len(name) for name in order)
+
+    results = {}
+    running = {}
+    lines = queue.Queue()
+    start = time.perf_counter()
+    failed = None
+
+    def settle():
+        """Resolve stages that will not run; True if anything changed"""
+        changed = False
+        for name in order:
+            if name in results or name in running:
+                continue
+            stage = by_name[name]
+            if any(results.get(dep, {}).get('status') in ('failed', 'blocked') for dep in stage.get('needs', [])):
+                results[name] = {'status': 'blocked', 'start': None, 'seconds': 0.0}
+                echo(f"[{name:<{width}}] blocked: a required stage did not succeed")
+                changed = True
+            elif stage.get('when') and all(dep in results for dep in dependencies(stage)) \
+                    and not any((Path(cwd) / path).exists() for path in stage['when']):
+                results[name] = {'status': 'skipped', 'start': None, 'seconds': 0.0}
+                echo(f"[{name:<{width}}] skipped: no {' or '.join(str(p) for p in stage['when'])}")
+                changed = True
+        return changed
+
+    while len(results) < len(order):
+        while settle():
+            pass
+        if failed is None:
+            for name in order:
+                if len(running) >= jobs:
+                    break
+                if name in results or name in running:
+                    continue
+                if all(results.get(dep, {}).get('status') in ('ok', 'skipped') for dep in by_name[name].get('needs', [])) \
+                        and all(dep in results for dep in by_name[name].get('after', [])):
+                    proc = subprocess.Popen(
+                        by_name[name]['cmd'], cwd=cwd, env=env, stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT, text=True, errors='replace', bufsize=1,
+                    )
+                    running[name] = {'proc': proc, 'start': time.perf_counter() - start, 'tail': deque(maxlen=TAIL_LINES)}
+                    threading.Thread(target=_stream, args=(name, proc, lines), daemon=True).start()
+                    command = ' '.join('python' if arg == sys.executable else arg for arg in by_name[name]['cmd'])
+                    echo(f"[{name:<{width}}] started: {command}")
+        if not running:
+            if len(results) < len(order):
+                # Nothing left that can start (a failure stopped the run)
+                for name in order:
+                    results.setdefault(name, {'status': 'stopped', 'start': None, 'seconds': 0.0})
+            break
+
+        name, line = lines.get()
+        if line is not None:
+            running[name]['tail'].append(line)
+            echo(f"[{name:<{width}}] {line}")
+            continue
+
+        info = running.pop(name)
+        code = info['proc'].returncode
+        status = 'ok' if code == 0 else 'stopped' if failed else 'failed'
+        results[name] = {
+            'status': status,
+            'start': info['start'],
+            'seconds': time.perf_counter() - start - info['start'],
+            'returncode': code,
+            'tail': list(info['tail']),
+        }
+        echo(f"[{name:<{width}}] {'finished' if code == 0 else f'exited with {code}'} "
+             f"in {results[name]['seconds']:.1f}s")
+        if status == 'failed' and not by_name[name].get('optional') and failed is None:
+            failed = name
+            for other in running.values():
+                other['proc'].terminate()
+
+    return failed is None, results
+
+
+def print_report(stages, results, wall):
+    path, path_seconds = critical_path(stages, results)
+    total = sum(result['seconds'] for result in results.values())
+    width = max(len(stage['name']) for stage in stages)
+
+    print("\n" + "="*60)
+    print("STAGE TIMINGS")
+    print("="*60)
+    print(f"  {'':1s} {'stage':<{width}s} {'start':>7s} {'seconds':>8s}  status")
+    for stage in stages:
+        result = results[stage['name']]
+        begin = f"{result['start']:7.1f}" if result['start'] is not None else f"{'-':>7s}"
+        marker = '*' if stage['name'] in path else ' '
+        print(f"  {marker} {stage['name']:<{width}s} {begin} {result['seconds']:8.1f}  {result['status']}")
+    print(f"\n* Critical path ({path_seconds:.1f}s): {' -> '.join(path) or '-'}")
+    print(f"Wall time {wall:.1f}s; stages add up to {total:.1f}s run one after another")
+    return {
+        'wall_seconds': round(wall, 3),
+        'stage_seconds': round(total, 3),
+        'critical_path': path,
+        'critical_path_seconds': round(path_seconds, 3),
+        'stages': {
+            name: {key: round(value, 3) if isinstance(value, float) else value
+                   for key, value in result.items() if key != 'tail'}
+            for name, result in results.items()
+        },
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Run the pipeline stages in parallel where they are independent")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Stages run at once (default: one per CPU)")
+    parser.add_argument('--report', type=Path, default=REPORT_FILE, help="Timing report JSON")
+    parser.add_argument('--dry-run', action='store_true', help="Print the stage graph and exit")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("KERALA LSG PIPELINE (PARALLEL)")
+    print("="*60)
+
+    if args.dry_run:
+        for name in check_graph(PIPELINE):
+            stage = next(s for s in PIPELINE if s['name'] == name)
+            needs = ', '.join(dependencies(stage)) or '-'
+            print(f"  {name:15s} after: {needs}")
+        return
+
+    if not (ROOT / "data/raw/kerala_lsg_data.geojson").exists():
+        print("❌ Kerala LSG data not found")
+        print("Please run ./setup.sh first to download the data")
+        sys.exit(1)
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    env["PYTHONUNBUFFERED"] = "1"
+
+    start = time.perf_counter()
+    ok, results = run_graph(PIPELINE, jobs=args.jobs, cwd=ROOT, env=env)
+    wall = time.perf_counter() - start
+
+    report = print_report(PIPELINE, results, wall)
+    report['ok'] = ok
+    dump_json(report, ROOT / args.report, minify=False)
+    print(f"Report saved to: {args.report}")
+
+    for name, result in results.items():
+        if result['status'] == 'failed':
+            optional = next(s for s in PIPELINE if s['name'] == name).get('optional')
+            print(f"\n{'⚠️ ' if optional else '❌'} Stage {name} failed (exit {result['returncode']})"
+                  + (" - its dependants were skipped" if optional else ""))
+            if not optional:
+                print("   Last output:")
+                for line in result['tail']:
+                    print(f"     {line}")
+    if not ok:
+        stopped = [name for name, result in results.items() if result['status'] == 'stopped']
+        if stopped:
+            print(f"   Not run or stopped: {', '.join(stopped)}")
+        sys.exit(1)
+    print("\n✓ Pipeline complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Snapshot store: keep every pipeline release, sharing unchanged features
+Records the current datasets as a dated snapshot (e.g. per election or
+delimitation), lists snapshots, exports a dataset as of a date and shows
+one LSG's history across snapshots
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import dump_feature_collection, dump_json, load_json  # noqa: E402
+from kerala_snapshots import SNAPSHOT_DIR, SnapshotStore  # noqa: E402
+
+DATASETS = [
+    Path("data/processed/kerala_lsg_final.geojson"),
+    Path("data/processed/search_index.json"),
+]
+
+
+def commit(store, date, name, datasets):
+    missing = [path for path in datasets if not path.exists()]
+    if missing:
+        for path in missing:
+            print(f"Error: File not found: {path}")
+        print("Run the processing pipeline first (./run_all.sh)")
+        sys.exit(1)
+
+    before = store.size()
+    try:
+        stats = store.commit({path.name: load_json(path) for path in datasets}, date, name)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    after = store.size()
+    full = sum(path.stat().st_size for path in datasets)
+
+    print(f"Snapshot {name or date}: {stats['features']:,} features")
+    print(f"  New objects: {stats['objects']:,} ({stats['bytes'] / 1024:,.1f} KB), shared: {stats['shared']:,}")
+    print(f"  Store: {after[0]:,} objects, {after[1] / 1024:,.1f} KB "
+          f"(+{(after[1] - before[1]) / 1024:,.1f} KB; the datasets are {full / 1024:,.1f} KB)")
+
+
+def export(store, date, out_dir, datasets):
+    name = store.as_of(date)
+    if name is None:
+        print(f"Error: No snapshot dated on or before {date}")
+        sys.exit(1)
+    print(f"Snapshot as of {date}: {name}")
+    for dataset in datasets:
+        data = store.load(name, dataset.name)
+        target = out_dir / dataset.name
+        if isinstance(data, dict):
+            dump_feature_collection(data, target)
+        else:
+            dump_json(data, target)
+        print(f"  ✓ {target}")
+
+
+def history(store, feature_id, dataset):
+    events = store.history(feature_id, dataset)
+    if not events:
+        print(f"{feature_id} is in no snapshot of {dataset}")
+        return
+    print(f"{feature_id} in {dataset}:")
+    for event in events:
+        print(f"  {event['date']}  {event['snapshot']:20s} {event['change']}")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Dated dataset snapshots with shared, content-addressed features")
+    action = parser.add_mutually_exclusive_group(required=True)
+    action.add_argument('--commit', metavar='DATE', help="Snapshot the current datasets as of DATE (YYYY-MM-DD)")
+    action.add_argument('--list', action='store_true', help="List snapshots")
+    action.add_argument('--as-of', metavar='DATE', help="Export the datasets as they were on DATE")
+    action.add_argument('--history', metavar='ID', help="Changes to one LSG (stable id, e.g. a Wikidata QID)")
+    parser.add_argument('--name', help="Snapshot name for --commit (default: the date)")
+    parser.add_argument('--out', type=Path, default=Path("data/snapshots/export"), help="Directory for --as-of")
+    parser.add_argument('--dataset', type=Path, action='append',
+                        help="Dataset file (repeatable; default: final GeoJSON and search index)")
+    parser.add_argument('--store', type=Path, default=SNAPSHOT_DIR)
+    args = parser.parse_args()
+
+    datasets = args.dataset or DATASETS
+    store = SnapshotStore(args.store)
+
+    print("="*60)
+    print("DATASET SNAPSHOTS")
+    print("="*60)
+
+    if args.commit:
+        commit(store, args.commit, args.name, datasets)
+    elif args.list:
+        snapshots = store.snapshots()
+        for snapshot in snapshots:
+            counts = ', '.join(f"{name} {count:,}" for name, count in snapshot['datasets'].items())
+            print(f"  {snapshot['date']}  {snapshot['name']:20s} {counts}")
+        objects, size = store.size()
+        print(f"\n{len(snapshots)} snapshot(s), {objects:,} objects, {size / 1024:,.1f} KB")
+    elif args.as_of:
+        export(store, args.as_of, args.out, datasets)
+    else:
+        for dataset in datasets:
+            history(store, args.history, dataset.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Watch mode: rebuild processed data whenever raw inputs change
+Keeps the simplified GeoJSON in memory, reruns only the affected stages
+and atomically swaps the results into web-app/static/data
+"""
+
+import argparse
+import copy
+import importlib.util
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SCRIPTS_DIR = ROOT / "scripts"
+STATIC_DIR = ROOT / "web-app" / "static" / "data"
+
+# Pipeline stages in dependency order
+STAGES = [
+    "01_add_district_field",
+    "02_extract_districts",
+    "03_simplify_geojson",
+    "04_merge_officials_data",
+    "05_generate_search_index",
+]
+
+# Each watched input and the first stage that consumes it
+WATCHED_INPUTS = {
+    Path("data/raw/kerala_lsg_data.geojson"): "01_add_district_field",
+    Path("kerala_district_mapping.py"): "01_add_district_field",
+    Path("data/raw/lsg_officials.csv"): "04_merge_officials_data",
+    Path("data/raw/lsg_officials_template.csv"): "04_merge_officials_data",
+    Path("data/raw/mahe_boundary.geojson"): None,  # Published as-is
+    Path("data/raw/assembly_constituencies.geojson"): "04_merge_officials_data",
+    Path("data/raw/parliamentary_constituencies.geojson"): "04_merge_officials_data",
+}
+CONSTITUENCY_FILES = {
+    'assembly': Path("data/raw/assembly_constituencies.geojson"),
+    'parliamentary': Path("data/raw/parliamentary_constituencies.geojson"),
+}
+
+SIMPLIFIED_FILE = Path("data/processed/kerala_lsg_simplified.geojson")
+FALLBACK_FILE = Path("data/processed/kerala_lsg_with_districts.geojson")
+FINAL_FILE = Path("data/processed/kerala_lsg_final.geojson")
+SEARCH_INDEX_FILE = Path("data/processed/search_index.json")
+SPATIAL_INDEX_FILE = Path("data/processed/spatial_index.json")
+BINARY_INDEX_FILE = Path("data/processed/search_index.bin")
+DISTRICTS_FILE = Path("data/processed/kerala_districts.geojson")
+CONSTITUENCY_INDEX_FILE = Path("data/processed/constituency_index.json")
+MAHE_FILE = Path("data/raw/mahe_boundary.geojson")
+
+# Stages import shared modules from the repository root
+sys.path.insert(0, str(ROOT))
+from kerala_json_io import atomic_write_bytes, dump_feature_collection, dump_json, load_json  # noqa: E402
+from kerala_layers import ATTRIBUTES_FILE, GEOMETRY_FILE, write_split_layer  # noqa: E402
+from kerala_lsg_binary import build_binary_index  # noqa: E402
+from kerala_officials import read_officials_csv, validate_officials  # noqa: E402
+from kerala_publish import publish  # noqa: E402
+
+
+def load_stage(name):
+    """Import a numbered stage script as a module"""
+    spec = importlib.util.spec_from_file_location(f"stage_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def snapshot(paths):
+    """Return (mtime_ns, size) for each existing watched file"""
+    state = {}
+    for path in paths:
+        try:
+            st = (ROOT / path).stat()
+        except FileNotFoundError:
+            continue
+        state[path] = (st.st_mtime_ns, st.st_size)
+    return state
+
+
+class PipelineWorker:
+    """Persistent worker that holds parsed pipeline inputs between runs"""
+
+    def __init__(self, static_dir=STATIC_DIR):
+        self.static_dir = static_dir
+        self.merge_stage = load_stage("04_merge_officials_data")
+        self.index_stage = load_stage("05_generate_search_index")
+        self.base_geo = None
+        self.constituency_matches = None
+
+    def officials_csv(self):
+        """Same lookup order as stage 04: real CSV first, template as fallback"""
+        officials_csv = ROOT / "data/raw/lsg_officials.csv"
+        if not officials_csv.exists():
+            officials_csv = ROOT / "data/raw/lsg_officials_template.csv"
+        return officials_csv
+
+    def load_base(self):
+        """Parse the simplified LSG layer once and keep it in memory"""
+        geojson_file = ROOT / SIMPLIFIED_FILE
+        if not geojson_file.exists():
+            geojson_file = ROOT / FALLBACK_FILE
+        if not geojson_file.exists():
+            print(f"Error: Neither {SIMPLIFIED_FILE} nor {FALLBACK_FILE} exist.")
+            print("Run stages 01-03 first (./run_all.sh)")
+            return False
+
+        self.base_geo = load_json(geojson_file)
+        # Geometry only changes here, so bounding boxes are computed once per load
+        self.merge_stage.add_bounds(self.base_geo)
+        print(f"  Loaded {len(self.base_geo['features'])} features from {geojson_file.name}")
+        self.load_constituencies()
+        return True
+
+    def load_constituencies(self):
+        """Overlay the cached layer with constituency boundaries, if any are present"""
+        self.constituency_matches = None
+        boundary_files = {kind: ROOT / path for kind, path in CONSTITUENCY_FILES.items() if (ROOT / path).exists()}
+        if not boundary_files or self.base_geo is None:
+            return
+        # Only needs shapely, and only when boundaries have been added
+        import kerala_constituencies
+        layers = [kerala_constituencies.ConstituencyLayer.load(kind, path) for kind, path in boundary_files.items()]
+        self.constituency_matches = kerala_constituencies.overlay_lsgs(self.base_geo['features'], layers)
+        print(f"  Overlaid constituencies: {', '.join(boundary_files)}")
+
+    def run_geometry_stages(self, first_stage):
+        """Rerun the geopandas stages (01-03) in a subprocess, then reload"""
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+
+        for name in STAGES[STAGES.index(first_stage):STAGES.index("04_merge_officials_data")]:
+            print(f"  Running {name}...")
+            result = subprocess.run(
+                [sys.executable, str(SCRIPTS_DIR / f"{name}.py")],
+                cwd=ROOT, env=env, capture_output=True, text=True
+            )
+            if result.returncode != 0:
+                print(result.stdout[-2000:])
+                print(result.stderr[-2000:])
+                print(f"❌ {name} failed, keeping previous outputs")
+                return False
+
+        self.publish(ROOT / DISTRICTS_FILE)
+        return self.load_base()
+
+    def run_officials_stages(self):
+        """Rerun stages 04-05 in memory against the cached geometry"""
+        if self.base_geo is None and not self.load_base():
+            return False
+
+        officials_csv = self.officials_csv()
+        try:
+            officials, issues = validate_officials(read_officials_csv(officials_csv))
+        except (OSError, ValueError) as e:
+            print(f"Error reading CSV: {e}")
+            return False
+        if len(issues):
+            print(f"  Officials CSV: {len(issues)} validation issue(s) (run stage 04 for the report)")
+
+        # Copy properties only; geometries are shared with the cached layer
+        geo_data = copy.copy(self.base_geo)
+        geo_data['features'] = [
+            {**feature, 'properties': dict(feature['properties'])}
+            for feature in self.base_geo['features']
+        ]
+
+        officials_lookup = self.merge_stage.build_officials_lookup(officials)
+        matched, updated = self.merge_stage.apply_officials(geo_data, officials_lookup)
+        if self.constituency_matches is not None:
+            import kerala_constituencies
+            kerala_constituencies.apply_constituencies(geo_data, self.constituency_matches)
+            dump_json(kerala_constituencies.build_constituency_index(geo_data),
+                      ROOT / CONSTITUENCY_INDEX_FILE, minify=True)
+        search_index, skipped = self.index_stage.build_search_index(geo_data)
+
+        dump_feature_collection(geo_data, ROOT / FINAL_FILE)
+        write_split_layer(geo_data, ROOT / GEOMETRY_FILE, ROOT / ATTRIBUTES_FILE)
+        dump_json([entry.to_dict() for entry in search_index], ROOT / SEARCH_INDEX_FILE)
+        dump_json(self.index_stage.build_spatial_index(search_index), ROOT / SPATIAL_INDEX_FILE, minify=True)
+        atomic_write_bytes(build_binary_index(search_index), ROOT / BINARY_INDEX_FILE)
+        self.publish(ROOT / GEOMETRY_FILE, ROOT / ATTRIBUTES_FILE, ROOT / SEARCH_INDEX_FILE,
+                     ROOT / SPATIAL_INDEX_FILE,
+                     *([ROOT / CONSTITUENCY_INDEX_FILE] if self.constituency_matches is not None else []))
+
+        print(f"  Matched {matched} LSGs ({updated} with data), "
+              f"{len(search_index)} search entries ({skipped} skipped)")
+        return True
+
+    def publish(self, *srcs):
+        """Swap processed files into the web app's static data directory and manifest"""
+        srcs = [src for src in srcs if src.exists()]
+        if srcs:
+            publish(srcs, self.static_dir)
+
+    def rebuild(self, changed):
+        """Rerun everything downstream of the earliest changed input"""
+        start = time.perf_counter()
+        first_stages = {WATCHED_INPUTS[path] for path in changed}
+
+        if MAHE_FILE in changed:
+            self.publish(ROOT / MAHE_FILE)
+        first_stages.discard(None)
+
+        ok = True
+        if first_stages:
+            first_stage = min(first_stages, key=STAGES.index)
+            if STAGES.index(first_stage) < STAGES.index("04_merge_officials_data"):
+                ok = self.run_geometry_stages(first_stage)
+            elif set(changed) & set(CONSTITUENCY_FILES.values()):
+                self.load_constituencies()
+            if ok:
+                ok = self.run_officials_stages()
+
+        elapsed = time.perf_counter() - start
+        status = "✓ Rebuilt" if ok else "❌ Rebuild failed"
+        print(f"{status} in {elapsed:.2f}s")
+        return ok
+
+
+def watch(worker, interval=0.2, debounce=0.3):
+    """Poll watched inputs and rebuild once a burst of edits settles"""
+    paths = list(WATCHED_INPUTS)
+    state = snapshot(paths)
+    pending = set()
+    last_change = 0.0
+
+    print(f"Watching {len(paths)} inputs (Ctrl+C to stop)...")
+    while True:
+        time.sleep(interval)
+        current = snapshot(paths)
+        changed = {p for p in set(state) | set(current) if state.get(p) != current.get(p)}
+        state = current
+
+        if changed:
+            for path in sorted(changed):
+                print(f"Changed: {path}")
+            pending |= changed
+            last_change = time.monotonic()
+            continue
+
+        if pending and time.monotonic() - last_change >= debounce:
+            worker.rebuild(pending)
+            pending = set()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--interval', type=float, default=0.2,
+                        help="Polling interval in seconds (default: 0.2)")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help="Quiet period before rebuilding (default: 0.3)")
+    parser.add_argument('--once', action='store_true',
+                        help="Rebuild stages 04-05 once and exit")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("PIPELINE WATCH MODE")
+    print("="*60)
+
+    worker = PipelineWorker()
+    if not worker.load_base():
+        sys.exit(1)
+
+    if args.once:
+        sys.exit(0 if worker.run_officials_stages() else 1)
+
+    try:
+        watch(worker, args.interval, args.debounce)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from kerala_json_io import load_json
+from kerala_lsg_binary import BinaryLSGIndex, build_binary_index
+from kerala_lsg_records import SearchEntry
+
+SEARCH_INDEX = Path(__file__).resolve().parent.parent / "data" / "processed" / "search_index.json"
+
+
+@pytest.fixture
+def binary_index(tmp_path):
+    entries = [SearchEntry.from_dict(item) for item in load_json(SEARCH_INDEX)]
+    path = tmp_path / "search_index.bin"
+    path.write_bytes(build_binary_index(entries))
+    with BinaryLSGIndex(path) as index:
+        yield index, entries
+
+
+def test_records_round_trip(binary_index):
+    index, entries = binary_index
+    assert len(index) == len(entries)
+    for entry in entries:
+        loaded = index.get(entry.id)
+        assert (loaded.name, loaded.name_ml, loaded.district, loaded.lsg_type, loaded.wikidata) == \
+            (entry.name, entry.name_ml, entry.district, entry.lsg_type, entry.wikidata)
+        assert loaded.centroid == pytest.approx(entry.centroid)
+    assert index.get(10**9) is None
+
+
+def test_name_lookup_and_filter(binary_index):
+    index, entries = binary_index
+    assert [e.name for e in index.find("manjes")][0] == "Manjeswaram"
+    assert [e.name for e in index.find("മഞ്ചേശ്വരം")][0] == "Manjeswaram"
+    assert index.find("zzzz") == []
+
+    wayanad = index.filter(district="Wayanad", lsg_type="municipality")
+    assert [e.id for e in wayanad] == [
+        e.id for e in entries if e.district == "Wayanad" and e.lsg_type == "municipality"
+    ]
+    assert index.filter(district="Nowhere") == []
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "search_index.bin"
+    path.write_bytes(b"not an index" * 10)
+    with pytest.raises(ValueError):
+        BinaryLSGIndex(path)
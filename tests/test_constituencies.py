@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("shapely")
+
+from kerala_constituencies import (  # noqa: E402
+    ConstituencyIndex,
+    ConstituencyLayer,
+    apply_constituencies,
+    build_constituency_index,
+    overlay_lsgs,
+)
+
+
+def square(x, y, size=1.0):
+    ring = [[x, y], [x + size, y], [x + size, y + size], [x, y + size], [x, y]]
+    return {"type": "Polygon", "coordinates": [ring]}
+
+
+def lsg(name, district, geometry, **props):
+    return {"type": "Feature", "properties": {"name": name, "district": district, **props}, "geometry": geometry}
+
+
+def test_overlay_fractions_and_reverse_index():
+    assembly = ConstituencyLayer("assembly", [
+        {"type": "Feature", "properties": {"AC_NAME": "West"}, "geometry": square(0.0, 0.0, 2.0)},
+        {"type": "Feature", "properties": {"AC_NAME": "East"}, "geometry": square(2.0, 0.0, 2.0)},
+    ])
+    geo_data = {"type": "FeatureCollection", "features": [
+        lsg("Inside", "A", square(0.5, 0.5)),
+        lsg("Straddling", "B", square(1.75, 0.5), mla_constituency="East"),
+        lsg("Sliver", "B", square(1.995, 0.0)),
+        lsg("Offshore", "A", square(10.0, 10.0)),
+    ]}
+
+    matches = overlay_lsgs(geo_data["features"], [assembly], workers=2)
+    assert [m["assembly"] for m in matches] == [
+        [("West", 1.0)], [("East", 0.75), ("West", 0.25)], [("East", 0.995)], [],
+    ]
+
+    stats = apply_constituencies(geo_data, matches)
+    assert stats["assembly"] == {"filled": 2, "kept": 1, "disagree": 0, "none": 1}
+    props = [f["properties"] for f in geo_data["features"]]
+    assert [p.get("mla_constituency") for p in props] == ["West", "East", "East", None]
+
+    index = ConstituencyIndex(build_constituency_index(geo_data))
+    assert index.names("assembly") == ["East", "West"]
+    assert [item["name"] for item in index.lsgs("assembly", "West")] == ["Inside", "Straddling"]
+    assert [item["search_id"] for item in index.lsgs("assembly", "West", min_fraction=0.5)] == [1]
+
+
+def test_rerun_replaces_only_filled_values():
+    geo_data = {"type": "FeatureCollection", "features": [
+        lsg("From CSV", "A", square(0.5, 0.5), mla_constituency="Manjeshwar"),
+        lsg("Filled", "A", square(0.5, 0.5)),
+    ]}
+    first_run = [{"assembly": [("Manjeshwar", 1.0)]}, {"assembly": [("West", 1.0)]}]
+    apply_constituencies(geo_data, first_run)
+    assert geo_data["features"][1]["properties"]["mla_constituency"] == "West"
+
+    # Rerun without the assembly layer: the overlay's value goes, the CSV value stays
+    apply_constituencies(geo_data, [{}, {}])
+    csv_props, filled_props = (f["properties"] for f in geo_data["features"])
+    assert csv_props["mla_constituency"] == "Manjeshwar" and "constituency_filled" not in csv_props
+    assert "mla_constituency" not in filled_props and "constituency_filled" not in filled_props
@@ -0,0 +1,144 @@
+import csv
+import hashlib
+import importlib.util
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("requests")
+pytest.importorskip("bs4")
+
+ROOT = Path(__file__).resolve().parent.parent
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "lsg_sites"
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, ROOT / "scripts" / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves recorded LSG pages with ETag revalidation"""
+
+    hits = []
+
+    def do_GET(self):
+        path = FIXTURES / self.path.lstrip("/")
+        if not path.is_file():
+            self.send_error(404)
+            return
+        body = path.read_bytes()
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        self.hits.append((self.path, self.headers.get("If-None-Match")))
+
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fixture_server():
+    FixtureHandler.hits = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_parse_table_layout():
+    fetcher = load_script("fetch_officials_data")
+    parsed = fetcher.parse_officials((FIXTURES / "table_layout.html").read_text(encoding="utf-8"))
+
+    assert parsed["president_name"] == "Smt. Bharathi S"
+    assert parsed["president_party"] == "CPI(M)"
+    assert parsed["president_contact"] == "9447000001"
+    assert parsed["president_email"] == "president.vorkady@example.org"
+    assert parsed["secretary_name"] == "Sudheer P"
+    assert parsed["secretary_contact"] == "04998 272000"
+
+
+def test_parse_label_layout():
+    fetcher = load_script("fetch_officials_data")
+    parsed = fetcher.parse_officials((FIXTURES / "label_layout.html").read_text(encoding="utf-8"))
+
+    assert parsed["president_name"] == "Prasanna Earnest"
+    assert parsed["president_party"] == "CPI(M)"
+    assert parsed["president_contact"] == "0474 2749860"
+    assert parsed["president_email"] == "mayor@kollamcorporation.example.org"
+    assert parsed["secretary_name"] == "Shine Kumar"
+    assert parsed["secretary_contact"] == "9446000000"
+
+
+def test_fetch_uses_conditional_requests(tmp_path, fixture_server):
+    fetcher = load_script("fetch_officials_data")
+
+    officials_csv = tmp_path / "lsg_officials.csv"
+    with open(ROOT / "data" / "raw" / "lsg_officials_template.csv", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)[:2]
+    rows[0]["website"] = f"{fixture_server}/table_layout.html"
+    rows[1]["website"] = f"{fixture_server}/label_layout.html"
+    rows[1]["secretary_name"] = "Hand Entered"
+    with open(officials_csv, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    cache_dir = tmp_path / "cache"
+    fetcher.fetch_officials_data(officials_csv, officials_csv, cache_dir, per_host_rate=0)
+
+    with open(officials_csv, encoding="utf-8", newline="") as f:
+        updated = list(csv.DictReader(f))
+    assert updated[0]["president_name"] == "Smt. Bharathi S"
+    assert updated[1]["president_name"] == "Prasanna Earnest"
+    # Existing values are not overwritten by default
+    assert updated[1]["secretary_name"] == "Hand Entered"
+
+    # Second run revalidates with the stored ETags and gets 304s
+    fetcher.fetch_officials_data(officials_csv, officials_csv, cache_dir, per_host_rate=0)
+    assert len(FixtureHandler.hits) == 4
+    assert all(etag is None for _, etag in FixtureHandler.hits[:2])
+    assert all(etag is not None for _, etag in FixtureHandler.hits[2:])
+
+
+def test_rate_limited_host_does_not_block_other_hosts(tmp_path):
+    fetcher = load_script("fetch_officials_data")
+    officials = fetcher.OfficialsFetcher(fetcher.ResponseCache(tmp_path), concurrency=1, per_host_rate=5)
+    starts = []
+
+    class Response:
+        status_code = 500
+
+    def get(url, **kwargs):
+        starts.append((url, time.perf_counter()))
+        return Response()
+
+    officials.session.get = get
+    urls = ["http://a.test/1", "http://a.test/2", "http://a.test/3", "http://b.test/1"]
+    begin = time.perf_counter()
+    fetcher.asyncio.run(officials.fetch_all(urls))
+
+    times = {url: t - begin for url, t in starts}
+    # b.test goes out while a.test waits out its 0.2 s interval
+    assert times["http://b.test/1"] < 0.15
+    assert times["http://a.test/2"] - times["http://a.test/1"] >= 0.19
+    assert times["http://a.test/3"] - times["http://a.test/2"] >= 0.19
@@ -0,0 +1,59 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("geopandas")
+
+from kerala_geo_cache import cache_path, read_geodataframe  # noqa: E402
+
+
+def write_layer(path, names):
+    features = [
+        {"type": "Feature", "properties": {"name": name, "district": "Kasaragod"},
+         "geometry": {"type": "Polygon", "coordinates": [[[75.0 + i, 12.0], [75.1 + i, 12.0], [75.1 + i, 12.1],
+                                                          [75.0 + i, 12.0]]]}}
+        for i, name in enumerate(names)
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+
+def test_cache_reuse_and_invalidation(tmp_path):
+    source = tmp_path / "layer.geojson"
+    cache_dir = tmp_path / "cache"
+    write_layer(source, ["Vorkady", "Paivalike"])
+
+    parsed, hit = read_geodataframe(source, cache_dir)
+    assert not hit and cache_path(source, cache_dir).exists()
+
+    cached, hit = read_geodataframe(source, cache_dir)
+    assert hit
+    assert cached.equals(parsed) and cached.crs == parsed.crs
+
+    # New mtime, same content: still a hit
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_geodataframe(source, cache_dir)[1]
+
+    write_layer(source, ["Vorkady", "Manjeshwar"])
+    changed, hit = read_geodataframe(source, cache_dir)
+    assert not hit
+    assert list(changed["name"]) == ["Vorkady", "Manjeshwar"]
+    assert len(list(cache_dir.iterdir())) == 1
+
+    assert not read_geodataframe(source, cache_dir, use_cache=False)[1]
+
+
+def test_cache_keeps_one_entry_per_layer_name(tmp_path):
+    cache_dir = tmp_path / "cache"
+    for checkout in ("old", "new"):
+        (tmp_path / checkout).mkdir()
+        write_layer(tmp_path / checkout / "layer.geojson", ["Vorkady"])
+        read_geodataframe(tmp_path / checkout / "layer.geojson", cache_dir)
+    write_layer(tmp_path / "other.geojson", ["Paivalike"])
+    read_geodataframe(tmp_path / "other.geojson", cache_dir)
+
+    assert sorted(path.name for path in cache_dir.iterdir()) == sorted([
+        cache_path(tmp_path / "new" / "layer.geojson", cache_dir).name,
+        cache_path(tmp_path / "other.geojson", cache_dir).name,
+    ])
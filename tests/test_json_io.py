@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+import kerala_json_io
+
+
+@pytest.mark.parametrize("backend", sorted(kerala_json_io.BACKENDS))
+def test_backends_round_trip(tmp_path, backend):
+    data = {"name": "മഞ്ചേശ്വരം", "centroid": [74.888732866, 12.732851980], "officials": {}}
+
+    pretty = kerala_json_io.dumps(data, minify=False, backend=backend)
+    minified = kerala_json_io.dumps(data, minify=True, backend=backend)
+    assert json.loads(pretty) == json.loads(minified) == data
+    assert len(minified) < len(pretty)
+    # Malayalam is written as UTF-8, not \u escapes
+    assert "മഞ്ചേശ്വരം".encode("utf-8") in minified
+
+    rounded = kerala_json_io.dumps(data, minify=True, precision=3, backend=backend)
+    assert json.loads(rounded)["centroid"] == [74.889, 12.733]
+
+    output = tmp_path / "out.json"
+    kerala_json_io.dump_json(data, output, backend=backend)
+    assert kerala_json_io.load_json(output, backend=backend) == data
+
+
+@pytest.mark.parametrize("minify", [False, True])
+def test_dump_feature_collection_streams_generator(tmp_path, minify):
+    features = (
+        {"type": "Feature", "properties": {"id": i}, "geometry": {"type": "Point", "coordinates": [76.0 + i, 10.0]}}
+        for i in range(3)
+    )
+    output = tmp_path / "out.geojson"
+    kerala_json_io.dump_feature_collection({"type": "FeatureCollection", "name": "test", "features": features},
+                                           output, minify=minify)
+
+    data = json.loads(output.read_text(encoding="utf-8"))
+    assert data["name"] == "test"
+    assert [f["properties"]["id"] for f in data["features"]] == [0, 1, 2]
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        kerala_json_io.get_backend("simdjson")
+
+
+def test_iter_features_streams_in_small_chunks(tmp_path):
+    features = [
+        {"type": "Feature", "properties": {"name": f"വാർഡ് {i}"},
+         "geometry": {"type": "Point", "coordinates": [76.0 + i / 10, 10.0]}}
+        for i in range(20)
+    ]
+    output = tmp_path / "wards.geojson"
+    with kerala_json_io.FeatureCollectionWriter(output, minify=False) as writer:
+        for feature in features:
+            writer.write(feature)
+        writer.write_encoded(kerala_json_io.dumps(features[0], minify=True))
+
+    assert writer.count == 21
+    assert list(kerala_json_io.iter_features(output, chunk_size=16)) == features + features[:1]
@@ -0,0 +1,46 @@
+import json
+
+from kerala_layers import join_layer, load_layer, split_layer, write_split_layer
+
+
+def layer(phone):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {"type": "Feature", "bbox": [0, 0, 1, 1],
+             "properties": {"name": "Vorkady", "district": "Kasaragod", "lsg_type": "gram panchayat",
+                            "officials": {"president": {"contact": phone}}},
+             "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}},
+            {"type": "Feature", "properties": {"name": "Kollam", "wikidata": "Q1"},
+             "geometry": {"type": "Point", "coordinates": [2, 2]}},
+        ],
+    }
+
+
+def test_split_and_join_round_trip():
+    geometry, attributes = split_layer(layer("111"))
+    assert [f["id"] for f in geometry["features"]] == ["kasaragod/gram-panchayat/vorkady", "Q1"]
+    assert all(f["properties"] == {} for f in geometry["features"])
+    assert attributes["features"]["Q1"] == {"name": "Kollam", "wikidata": "Q1"}
+
+    joined = join_layer(geometry, attributes)
+    assert [f["properties"] for f in joined["features"]] == [f["properties"] for f in layer("111")["features"]]
+    assert join_layer(geometry, {"features": {}})["features"][1]["properties"] == {}
+
+
+def test_attribute_refresh_keeps_geometry_file(tmp_path):
+    geometry_file, attributes_file = tmp_path / "geometry.geojson", tmp_path / "attributes.json"
+    assert write_split_layer(layer("111"), geometry_file, attributes_file)
+    mtime = geometry_file.stat().st_mtime_ns
+
+    # Officials change: only the attributes file is rewritten
+    assert not write_split_layer(layer("222"), geometry_file, attributes_file)
+    assert geometry_file.stat().st_mtime_ns == mtime
+    first = load_layer(geometry_file, attributes_file)["features"][0]
+    assert first["properties"]["officials"]["president"]["contact"] == "222"
+    assert json.loads(attributes_file.read_text())["format"] == "kerala-lsg-attributes/1"
+
+    moved = layer("222")
+    moved["features"][1]["geometry"]["coordinates"] = [3, 3]
+    assert write_split_layer(moved, geometry_file, attributes_file)
+    assert load_layer(geometry_file, attributes_file)["features"][1]["geometry"]["coordinates"] == [3, 3]
@@ -0,0 +1,47 @@
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from kerala_lsg_query import LSGIndex  # noqa: E402
+from kerala_nearest import BoundaryIndex, CentroidIndex, local_distance_km  # noqa: E402
+
+SEARCH_INDEX = Path(__file__).resolve().parent.parent / "data" / "processed" / "search_index.json"
+
+
+def test_grid_queries_match_brute_force():
+    rng = np.random.default_rng(1)
+    lon, lat = rng.uniform(74.8, 77.4, 300), rng.uniform(8.2, 12.8, 300)
+    index = CentroidIndex(np.arange(300) + 1, lon, lat, cell=0.1, margin=0.5)
+    # Points inside the grid, in its margin and well outside it
+    qlon, qlat = rng.uniform(73.0, 79.0, 2000), rng.uniform(7.0, 14.0, 2000)
+    dist = local_distance_km(qlon[:, None], qlat[:, None], lon, lat)
+
+    ids, distances = index.nearest(qlon, qlat, k=3)
+    order = np.argsort(dist, axis=1)[:, :3]
+    assert np.array_equal(ids, order + 1)
+    assert np.allclose(distances, np.take_along_axis(dist, order, axis=1))
+
+    points, found, found_dist = index.within(qlon, qlat, 10.0)
+    rows, cols = np.nonzero(dist <= 10.0)
+    pairs = zip(points.tolist(), found.tolist(), strict=True)
+    assert sorted(pairs) == sorted(zip(rows.tolist(), (cols + 1).tolist(), strict=True))
+    assert np.all(found_dist <= 10.0)
+
+
+def test_offshore_point_finds_coastal_lsg():
+    index = LSGIndex.load(SEARCH_INDEX)
+    # Arabian Sea, ~20 km off Kochi
+    ids, distances = index.nearest(76.05, 9.95, k=2)
+    assert ids.shape == (1, 2) and distances[0, 0] <= distances[0, 1]
+    assert index.get(int(ids[0, 0])).district in {"Ernakulam", "Thrissur", "Alappuzha"}
+
+
+def test_boundary_index_distance_zero_inside():
+    shapely = pytest.importorskip("shapely")
+    squares = [shapely.box(76.0, 10.0, 76.1, 10.1), shapely.box(76.3, 10.0, 76.4, 10.1)]
+    index = BoundaryIndex(["a", "b"], squares)
+    ids, distances = index.nearest([76.05, 76.25, 80.0], [10.05, 10.05, 10.05], max_distance_km=50)
+    assert list(ids) == ["a", "b", -1]
+    assert distances[0] == 0 and 5.0 < distances[1] < 5.6 and np.isinf(distances[2])
@@ -0,0 +1,100 @@
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+from kerala_officials import (  # noqa: E402
+    issue_summary,
+    name_keys,
+    normalize_contacts,
+    officials_frame,
+    read_officials_csv,
+    validate_officials,
+)
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def load_script(name):
+    # Helper to import scripts with numbers in filenames
+    spec = importlib.util.spec_from_file_location(f"stage_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_validate_normalizes_and_reports_rows(tmp_path):
+    csv_file = tmp_path / "officials.csv"
+    csv_file.write_text(
+        "lsg_id,lsg_name,lsg_type,district,president_contact,president_email,website,wikidata_id\n"
+        "G1,Alpha Grama Panchayat,Grama  Panchayat,trivandrum,\"98470 12345, 0471-2345678\",A@Example.IN,,q42\n"
+        "G2,Beta,Panchayat,Nowhere,12345,not-an-email,example.in,Z9\n"
+        "G1,Alpha,,Thiruvananthapuram District,,,,\n"
+        ",,,Kollam,,,,\n",
+        encoding="utf-8",
+    )
+
+    valid, issues = validate_officials(read_officials_csv(csv_file))
+
+    assert valid["lsg_id"].tolist() == ["G1", "G2", "G1"]
+    alpha = valid.iloc[0]
+    assert alpha["district"] == "Thiruvananthapuram" and valid.iloc[2]["district"] == "Thiruvananthapuram"
+    assert alpha["lsg_type"] == "grama panchayat"
+    assert alpha["president_contact"] == "+919847012345, 04712345678"
+    assert (alpha["president_email"], alpha["wikidata_id"]) == ("a@example.in", "Q42")
+    # Invalid values are reported but kept as given
+    assert valid.iloc[1]["president_contact"] == "12345"
+
+    by_line = issues.groupby("line")["column"].apply(sorted).to_dict()
+    assert by_line == {
+        2: ["lsg_id"],
+        3: ["district", "lsg_type", "president_contact", "president_email", "website", "wikidata_id"],
+        5: ["lsg_name"],
+    }
+    assert issues.loc[issues["line"] == 5, "severity"].tolist() == ["error"]
+    assert issue_summary(issues)[("warning", "district", "unknown district")] == 1
+
+
+def test_history_and_ward_rows():
+    frame = officials_frame([
+        {"lsg_id": "G1", "lsg_name": "Alpha", "president_name": "New", "as_of": "2020-12-21"},
+        {"lsg_id": "G1", "lsg_name": "Alpha", "president_name": "Old", "as_of": "2015-11-12"},
+        {"lsg_id": "G1", "lsg_name": "Alpha", "president_name": "Member", "as_of": "2020-12-21", "ward_no": "4"},
+    ])
+
+    valid, issues = validate_officials(frame)
+
+    # Ward rows stay out of the join, and rows on different dates are not duplicates
+    assert valid["president_name"].tolist() == ["Old", "New"]
+    assert issues.empty
+
+
+def test_contacts_and_name_keys_match_row_helpers():
+    merge = load_script("04_merge_officials_data")
+    names = ["Vorkady Grama Panchayat", " Kochi Municipal Corporation", "Odd Gramapanchayath", "Plain", ""]
+    assert name_keys(pd.Series(names)).tolist() == [merge.normalize_name(name) for name in names]
+
+    contacts, invalid = normalize_contacts(pd.Series(["+91 98470-12345", "0091 9847012345 / 4712345678", "", "98470"]))
+    assert contacts.tolist() == ["+919847012345", "+919847012345, 04712345678", "", "98470"]
+    assert invalid.tolist() == [False, False, False, True]
+
+
+def test_lookup_from_frame_matches_row_by_row_add():
+    merge = load_script("04_merge_officials_data")
+    records = [
+        {"lsg_name": "Vorkady Grama Panchayat", "district": "Kasaragod", "president_name": "Old"},
+        {"lsg_name": "Vorkady", "district": "Kasaragod", "president_name": "New", "lsg_id": "KL-1"},
+        {"lsg_name": "Vorkady", "district": "Kannur", "wikidata_id": "q7"},
+    ]
+
+    lookup = merge.build_officials_lookup(records)
+    expected = merge.OfficialsLookup()
+    for row in records:
+        expected.add(merge.LSGRecord.from_csv_row(row))
+
+    assert lookup.collisions == expected.collisions
+    assert lookup.ambiguous_names() == expected.ambiguous_names() == {"vorkady"}
+    for layer in merge.JOIN_LAYERS:
+        assert lookup.layers[layer] == expected.layers[layer]
@@ -0,0 +1,42 @@
+from kerala_lsg_query import LSGIndex
+from kerala_lsg_records import SearchColumns, SearchEntry
+from kerala_phonetic import phonetic_key, phonetic_keys, transliterate
+
+# Spellings that must share a key; web-app/src/lib/utils/phonetic.test.js checks the same
+SAME_KEY = [
+    ["Manjeswaram", "Manjeshwar", "മഞ്ചേശ്വരം", "Manjeshwaram Grama Panchayath"],
+    ["Thiruvananthapuram", "Tiruvanantapuram", "തിരുവനന്തപുരം", "Thiruvananthapuram Corporation"],
+    ["Kozhikode", "Kozhikkode", "കോഴിക്കോട്"],
+    ["Kasaragod", "Kasargod", "കാസർഗോഡ്"],
+    ["Thrissur", "Trissur", "തൃശ്ശൂർ"],
+    ["Angamaly", "Angamali", "അങ്കമാലി"],
+    ["Vorkady", "Vorkadi Gramapanchayat", "വോർക്കാടി ഗ്രാമപഞ്ചായത്ത്"],
+]
+
+
+def test_spelling_variants_share_a_key():
+    for spellings in SAME_KEY:
+        keys = {phonetic_key(name) for name in spellings}
+        assert len(keys) == 1, (spellings, keys)
+    assert phonetic_key("Manjeswaram") == "mnjsvr"
+    assert phonetic_key("Kollam") != phonetic_key("Kottayam")
+    assert transliterate("കോഴിക്കോട്") == "kozhikkot"
+    assert phonetic_keys("Alappuzha", "ആലപ്പുഴ", "") == ["alpz"]
+
+
+def test_search_falls_back_to_phonetic_keys():
+    items = [
+        {"id": 1, "name": "Manjeswaram", "name_ml": "മഞ്ചേശ്വരം", "lsg_type": "gram panchayat",
+         "district": "Kasaragod", "centroid": [74.9, 12.7]},
+        {"id": 2, "name": "Kasaragod", "name_ml": "", "lsg_type": "municipality",
+         "district": "Kasaragod", "centroid": [75.0, 12.5]},
+    ]
+    entry = SearchEntry.from_dict(items[0])
+    assert SearchEntry.from_dict({**items[0], "phonetic": ["mnjsvr"]}).to_dict()["phonetic"] == ["mnjsvr"]
+    assert entry.phonetic == ()
+
+    # Keys are computed when the index predates them
+    index = LSGIndex(SearchColumns.from_dicts(items))
+    assert [e.id for e in index.search("Manjeshwar")] == [1]
+    assert [e.id for e in index.search("kasargod municipality")] == [2]
+    assert index.search("Kollam") == []
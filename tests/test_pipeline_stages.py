@@ -0,0 +1,252 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def load_script(name):
+    # Helper to import scripts with numbers in filenames
+    spec = importlib.util.spec_from_file_location(f"stage_{name}", SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_feature(name, district="Kasaragod"):
+    return {
+        "type": "Feature",
+        "properties": {"name": name, "district": district, "lsg_type": "gram panchayat"},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[75.0, 12.0], [75.1, 12.0], [75.1, 12.1], [75.0, 12.0]]],
+        },
+    }
+
+
+def test_apply_officials_and_search_index():
+    merge = load_script("04_merge_officials_data")
+    index = load_script("05_generate_search_index")
+
+    geo_data = {"type": "FeatureCollection", "features": [make_feature("Vorkady"), make_feature("Paivalike")]}
+    records = [
+        {"lsg_name": "Vorkady Grama Panchayat", "president_name": "A. Person", "website": "https://example.org"},
+    ]
+
+    matched, updated = merge.apply_officials(geo_data, merge.build_officials_lookup(records))
+    assert (matched, updated) == (1, 1)
+    assert geo_data["features"][0]["properties"]["officials"]["president"]["name"] == "A. Person"
+    assert "officials" not in geo_data["features"][1]["properties"]
+
+    search_index, skipped = index.build_search_index(geo_data)
+    assert skipped == 0
+    assert [entry.id for entry in search_index] == [1, 2]
+    first = search_index[0].to_dict()
+    assert first["head"] == {"name": "A. Person", "title": "President"}
+    assert first["website"] == "https://example.org"
+    assert "website" not in search_index[1].to_dict()
+
+
+def test_layered_officials_join():
+    merge = load_script("04_merge_officials_data")
+
+    features = [make_feature("Vorkady"), make_feature("Vorkady", district="Kannur"), make_feature("Odd Name")]
+    features[2]["properties"]["wikidata"] = "Q42"
+    geo_data = {"type": "FeatureCollection", "features": features}
+    records = [
+        {"lsg_name": "Vorkady Grama Panchayat", "district": "Kasaragod", "president_name": "Old"},
+        {"lsg_name": "Vorkady Grama Panchayat", "district": "Kasaragod", "president_name": "Kasaragod Head"},
+        {"lsg_name": "Vorkady", "district": "Kannur", "president_name": "Kannur Head", "lsg_id": "KL-KNR-9"},
+        {"lsg_name": "Unusual Spelling Panchayath", "wikidata_id": "q42", "president_name": "QID Head"},
+    ]
+
+    report = {}
+    matched, _ = merge.apply_officials(geo_data, merge.build_officials_lookup(records), report)
+
+    heads = [f["properties"]["officials"]["president"]["name"] for f in features]
+    assert matched == 3
+    assert heads == ["Kasaragod Head", "Kannur Head", "QID Head"]
+    assert features[1]["properties"]["lsg_id"] == "KL-KNR-9"
+    assert report["wikidata"]["matched"] == 1
+    assert report["district_name"] == {"matched": 2, "missed": 0, "collisions": 1}
+    assert report["shared"] == 0 and report["unused"] == 0
+
+
+def test_name_layer_does_not_cross_districts():
+    merge = load_script("04_merge_officials_data")
+
+    features = [make_feature("Vorkady"), make_feature("Vorkady", district="Kannur")]
+    geo_data = {"type": "FeatureCollection", "features": features}
+    records = [{"lsg_name": "Vorkady", "district": "Kasaragod", "president_name": "KSD Head"}]
+
+    report = {}
+    matched, _ = merge.apply_officials(geo_data, merge.build_officials_lookup(records), report)
+
+    assert matched == 1
+    assert features[0]["properties"]["officials"]["president"]["name"] == "KSD Head"
+    assert "officials" not in features[1]["properties"]
+    assert report["district_name"]["missed"] == 1 and report["name"]["matched"] == 0
+    assert report["shared"] == 0
+
+
+def test_simplify_writes_lod_levels(tmp_path):
+    pytest.importorskip("geopandas")
+    simplify = load_script("03_simplify_geojson")
+
+    features = [make_feature("Vorkady"), make_feature("Vorkady"), make_feature("Paivalike")]
+    features[2]["properties"]["wikidata"] = "Q123"
+    input_file = tmp_path / "input.geojson"
+    input_file.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+
+    entry = simplify.simplify_geojson(
+        input_file, tmp_path / "simplified.geojson", 0.001,
+        layer="lsg", lod_tolerances=[0.0001, 0.005], lod_dir=tmp_path / "lod",
+        cache_dir=tmp_path / "cache"
+    )
+
+    assert [level["tolerance"] for level in entry["levels"]] == [0.0001, 0.001, 0.005]
+    for level in entry["levels"]:
+        data = json.loads((tmp_path / "lod" / level["file"]).read_text())
+        assert [f["id"] for f in data["features"]] == [
+            "kasaragod/gram-panchayat/vorkady", "kasaragod/gram-panchayat/vorkady#2", "Q123",
+        ]
+    assert (tmp_path / "simplified.geojson").exists()
+
+
+def test_process_wards_dissolves_to_parents(tmp_path):
+    pytest.importorskip("shapely")
+    wards = load_script("06_process_wards")
+
+    lsgs = [make_feature("Vorkady"), make_feature("Paivalike")]
+    lsgs[1]["properties"]["wikidata"] = "Q123"
+    lsg_file = tmp_path / "lsg.geojson"
+    lsg_file.write_text(json.dumps({"type": "FeatureCollection", "features": lsgs}))
+
+    def ward(no, lsg, x):
+        ring = [[x, 12.0], [x + 0.05, 12.0], [x + 0.05, 12.05], [x, 12.05], [x, 12.0]]
+        return {"type": "Feature", "properties": {"ward_no": no, "lsg": lsg},
+                "geometry": {"type": "Polygon", "coordinates": [ring]}}
+
+    ward_file = tmp_path / "wards.geojson"
+    ward_file.write_text(json.dumps({"type": "FeatureCollection", "features": [
+        ward(1, "Vorkady Grama Panchayat", 75.0), ward(2, "Vorkady", 75.05),
+        ward(1, "Q123", 75.0), ward(1, "Nowhere", 75.0),
+    ]}))
+
+    summary = wards.process_wards(ward_file, lsg_file, tmp_path / "out", chunk_size=64)
+    assert summary["counts"] == {"Kasaragod": 3, "Unknown": 1}
+    assert (summary["wards"], summary["lsgs"], summary["districts"]) == (4, 2, 1)
+
+    lsg_layer = json.loads((tmp_path / "out" / "kerala_lsg_from_wards.geojson").read_text())
+    by_id = {f["id"]: f for f in lsg_layer["features"]}
+    assert by_id["kasaragod/gram-panchayat/vorkady"]["properties"]["ward_count"] == 2
+    assert by_id["Q123"]["properties"]["ward_count"] == 1
+
+    index = json.loads((tmp_path / "out" / "ward_search_index.json").read_text())
+    assert [e["ward_id"] for e in index][:2] == [
+        "kasaragod/gram-panchayat/vorkady/ward-1", "kasaragod/gram-panchayat/vorkady/ward-2",
+    ]
+    assert index[-1]["district"] == "Unknown"
+
+
+def test_lod_manifest_merges_per_layer_runs(tmp_path):
+    simplify = load_script("03_simplify_geojson")
+    manifest_file = tmp_path / "lod" / "manifest.json"
+
+    simplify.update_lod_manifest({"kerala_lsg": {"levels": []}}, manifest_file, replace=False)
+    simplify.update_lod_manifest({"kerala_districts": {"levels": []}}, manifest_file, replace=False)
+    assert list(json.loads(manifest_file.read_text())["layers"]) == ["kerala_lsg", "kerala_districts"]
+
+    simplify.update_lod_manifest({"kerala_lsg": {"levels": []}}, manifest_file)
+    assert list(json.loads(manifest_file.read_text())["layers"]) == ["kerala_lsg"]
+
+
+def test_run_graph_overlaps_stages_and_fails_fast(tmp_path):
+    pipeline = load_script("run_pipeline")
+
+    def stage(name, code="", needs=(), **extra):
+        return {"name": name, "cmd": [sys.executable, "-c", f"import time; print('{name}'); {code}"],
+                "needs": list(needs), **extra}
+
+    stages = [
+        stage("a"),
+        stage("b", "time.sleep(0.5)", ["a"]),
+        stage("c", "time.sleep(0.5)", ["a"]),
+        stage("d", "raise SystemExit(3)", ["a"], optional=True),
+        stage("e", needs=["d"]),
+        stage("f", needs=["b"], when=["missing.txt"]),
+        stage("g", needs=["c", "f"], after=["e"]),
+    ]
+    lines = []
+    ok, results = pipeline.run_graph(stages, jobs=3, cwd=tmp_path, echo=lines.append)
+
+    assert ok
+    assert {name: r["status"] for name, r in results.items()} == {
+        "a": "ok", "b": "ok", "c": "ok", "d": "failed", "e": "blocked", "f": "skipped", "g": "ok",
+    }
+    assert "[b] b" in lines
+    # b and c ran side by side
+    assert abs(results["b"]["start"] - results["c"]["start"]) < 0.4
+    path, _ = pipeline.critical_path(stages, results)
+    assert path[0] == "a" and path[-1] == "g" and path[1] in ("b", "c")
+
+    stages = [stage("a"), stage("slow", "time.sleep(30)", ["a"]), stage("bad", "raise SystemExit(2)", ["a"]),
+              stage("after_slow", needs=["slow"])]
+    ok, results = pipeline.run_graph(stages, jobs=3, cwd=tmp_path, echo=lines.append)
+    assert not ok
+    assert results["bad"]["status"] == "failed" and results["bad"]["returncode"] == 2
+    assert results["slow"]["status"] == "stopped" and results["slow"]["seconds"] < 10
+    assert results["after_slow"]["status"] == "stopped"
+
+    with pytest.raises(ValueError):
+        pipeline.check_graph([stage("x", needs=["y"]), stage("y", needs=["x"])])
+
+
+def test_watch_debounces_edits_into_one_rebuild(tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    watch = load_script("watch_pipeline")
+    monkeypatch.setattr(watch, "ROOT", tmp_path)
+    raw = tmp_path / "data" / "raw"
+    raw.mkdir(parents=True)
+    (raw / "lsg_officials.csv").write_text("lsg_name\n")
+    (raw / "kerala_lsg_data.geojson").write_text("{}")
+
+    # Edits made during each poll interval; the clock only moves when the watcher sleeps
+    edits = {
+        1: ["lsg_officials.csv"], 2: ["lsg_officials.csv"],
+        8: ["kerala_lsg_data.geojson", "lsg_officials.csv"],
+    }
+    clock = {"now": 0.0, "polls": 0}
+
+    def sleep(seconds):
+        clock["polls"] += 1
+        if clock["polls"] > 14:
+            raise KeyboardInterrupt
+        for name in edits.get(clock["polls"], []):
+            path = raw / name
+            path.write_text(path.read_text() + "x")
+        clock["now"] += seconds
+
+    def now():
+        return clock["now"]
+
+    monkeypatch.setattr(watch, "time", SimpleNamespace(sleep=sleep, monotonic=now, perf_counter=now))
+
+    worker = watch.PipelineWorker()
+    runs = []
+    monkeypatch.setattr(worker, "run_geometry_stages", lambda first: runs.append(("geometry", first)) or True)
+    monkeypatch.setattr(worker, "run_officials_stages", lambda: runs.append(("officials", clock["polls"])) or True)
+
+    with pytest.raises(KeyboardInterrupt):
+        watch.watch(worker, interval=0.2, debounce=0.3)
+
+    # Two quick CSV edits rebuild stages 04-05 once, 0.3s after the second one;
+    # a raw geometry change reruns everything from stage 01
+    assert runs == [
+        ("officials", 4),
+        ("geometry", "01_add_district_field"), ("officials", 10),
+    ]
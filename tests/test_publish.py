@@ -0,0 +1,53 @@
+import gzip
+import json
+
+from kerala_publish import publish
+
+
+def test_publish_writes_hashed_variants_and_prunes(tmp_path):
+    src = tmp_path / "search_index.json"
+    static_dir = tmp_path / "static"
+
+    src.write_text(json.dumps([{"id": 1, "name": "Alpha"}]))
+    first, removed = publish([src], static_dir)
+    entry = first["files"]["search_index.json"]
+
+    assert removed == []
+    assert entry["path"].startswith("search_index.") and entry["path"] != "search_index.json"
+    assert (static_dir / entry["path"]).read_bytes() == src.read_bytes()
+    assert gzip.decompress((static_dir / entry["encodings"]["gzip"]["path"]).read_bytes()) == src.read_bytes()
+    assert (static_dir / "search_index.json").read_bytes() == src.read_bytes()
+    assert json.loads((static_dir / "manifest.json").read_text()) == first
+
+    # Same content, same names
+    assert publish([src], static_dir)[0]["files"] == first["files"]
+
+    # Two newer releases: the previous generation is kept, the oldest removed
+    src.write_text(json.dumps([{"id": 1, "name": "Beta"}]))
+    second, _ = publish([src], static_dir)
+    src.write_text(json.dumps([{"id": 1, "name": "Gamma"}]))
+    third, removed = publish([src], static_dir)
+
+    assert (static_dir / second["files"]["search_index.json"]["path"]).exists()
+    assert not (static_dir / entry["path"]).exists()
+    assert static_dir / entry["path"] in removed
+    assert third["files"]["search_index.json"]["path"] != second["files"]["search_index.json"]["path"]
+
+
+def test_republishing_keeps_the_previous_generation(tmp_path):
+    src = tmp_path / "search_index.json"
+    static_dir = tmp_path / "static"
+
+    src.write_text(json.dumps([{"id": 1, "name": "Alpha"}]))
+    first, _ = publish([src], static_dir)
+    src.write_text(json.dumps([{"id": 1, "name": "Beta"}]))
+    second, _ = publish([src], static_dir)
+    # Stages publish their output, then publish_static.py publishes it again
+    third, removed = publish([src], static_dir)
+
+    v1 = first["files"]["search_index.json"]
+    assert removed == []
+    assert third["files"]["search_index.json"]["previous"]["path"] == v1["path"]
+    assert (static_dir / v1["path"]).exists()
+    assert (static_dir / v1["encodings"]["gzip"]["path"]).exists()
+    assert second["files"] == third["files"]
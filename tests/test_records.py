@@ -0,0 +1,69 @@
+from pathlib import Path
+
+from kerala_json_io import load_json
+from kerala_lsg_query import LSGIndex
+from kerala_lsg_records import LSGRecord, SearchColumns, SearchEntry
+
+SEARCH_INDEX = Path(__file__).resolve().parent.parent / "data" / "processed" / "search_index.json"
+
+
+def test_lsg_record_from_csv_row():
+    record = LSGRecord.from_csv_row({
+        "lsg_name": "Kollam Corporation", "district": "Kollam", "president_name": " Mayor Name ",
+        "president_party": "CPI(M)", "secretary_email": "secretary@example.org", "website": "",
+    })
+    assert record.has_data
+    assert record.president.name == "Mayor Name"
+
+    props = {}
+    record.apply_to(props)
+    assert props["officials"]["president"]["party"] == "CPI(M)"
+    assert "party" not in props["officials"]["secretary"]
+    assert "website" not in props
+
+
+def test_search_entry_round_trip():
+    for item in load_json(SEARCH_INDEX)[:50]:
+        expected = {k: v for k, v in item.items() if v is not None}
+        expected.setdefault("name_ml", "")
+        assert SearchEntry.from_dict(item).to_dict() == expected
+
+
+def test_columns_share_categorical_strings():
+    items = load_json(SEARCH_INDEX)
+    columns = SearchColumns.from_dicts(items)
+
+    assert len(columns) == len(items)
+    # 14 districts plus the empty default
+    assert len(columns.tables["district"]) <= 15
+
+    rows = columns.rows_where(district="Kasaragod", lsg_type="municipality")
+    expected = [i for i, item in enumerate(items)
+                if item["district"] == "Kasaragod" and item["lsg_type"] == "municipality"]
+    assert rows == expected
+    assert columns.rows_where(district="Nowhere") == []
+    assert columns.entry(0).to_dict()["name"] == items[0]["name"]
+
+
+def test_lsg_index_queries():
+    index = LSGIndex.load(SEARCH_INDEX)
+
+    assert index.get(2).name == "Manjeswaram"
+    assert index.get(10**9) is None
+    assert [e.name for e in index.search("manjes")][0] == "Manjeswaram"
+    assert [e.name for e in index.search("മഞ്ചേശ്വരം")][0] == "Manjeswaram"
+    assert all(e.district == "Wayanad" for e in index.filter(district="Wayanad"))
+    assert sum(index.counts_by("district").values()) == len(index)
+
+
+def test_search_entries_keep_the_presidents_party():
+    props = {"name": "Kollam", "lsg_type": "corporation", "district": "Kollam",
+             "officials": {"president": {"name": "Mayor Name", "party": "CPI(M)"}}}
+    entry = SearchEntry.from_feature(1, props, (76.6, 8.9))
+    assert entry.to_dict()["head"] == {"name": "Mayor Name", "title": "Mayor", "party": "CPI(M)"}
+
+    other = SearchEntry.from_feature(2, dict(props, name="Paravur", lsg_type="municipality"), (76.7, 8.8))
+    index = LSGIndex(SearchColumns.from_entries([entry, other, SearchEntry.from_feature(3, {"name": "X"}, (0, 0))]))
+    assert index.columns.entry(1).head_party is entry.head_party
+    assert [e.id for e in index.filter(party="CPI(M)")] == [1, 2]
+    assert index.counts_by("head_party") == {"CPI(M)": 2, "": 1}
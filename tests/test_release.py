@@ -0,0 +1,104 @@
+import copy
+
+import pytest
+
+from kerala_release import apply_patch, hash_items, index_items, make_patch, members_of
+
+
+def make_feature(name, qid, x):
+    return {
+        "type": "Feature",
+        "properties": {"name": name, "district": "Kollam", "lsg_type": "gram panchayat", "wikidata": qid},
+        "geometry": {"type": "Polygon", "coordinates": [[[x, 9.0], [x + 0.1, 9.0], [x, 9.1], [x, 9.0]]]},
+    }
+
+
+def release(data):
+    kind, by_id = index_items(data)
+    return kind, by_id, hash_items(by_id, kind)
+
+
+def test_geojson_patch_round_trip():
+    old = {"type": "FeatureCollection", "features": [
+        make_feature("Alpha", "Q1", 76.0), make_feature("Beta", "Q2", 76.2), make_feature("Gamma", "", 76.4),
+    ]}
+    new = copy.deepcopy(old)
+    new["features"][0]["properties"]["officials"] = {"president": {"name": "A. Person"}}
+    new["features"][1]["geometry"]["coordinates"][0][1] = [76.35, 9.0]
+    del new["features"][2]
+    new["features"].append(make_feature("Delta", "Q4", 76.6))
+
+    _, _, old_hashes = release(old)
+    kind, new_by_id, new_hashes = release(new)
+    patch = make_patch(old_hashes, new_hashes, new_by_id, kind, 1, 2)
+
+    assert [item["id"] for item in patch["added"]] == ["Q4"]
+    assert patch["removed"] == ["kollam/gram-panchayat/gamma"]
+    assert {c["id"]: sorted(c) for c in patch["changed"]} == {
+        "Q1": ["id", "properties"],
+        "Q2": ["geometry", "id"],
+    }
+
+    assert apply_patch(old, patch) == new
+    with pytest.raises(ValueError):
+        apply_patch(new, patch)
+
+
+def test_search_index_patch_keeps_entry_layout():
+    old = [
+        {"id": 1, "name": "Alpha", "name_ml": "", "lsg_type": "municipality", "district": "Kollam",
+         "centroid": [76.0, 9.0], "wikidata": "Q1"},
+        {"id": 2, "name": "Beta", "name_ml": "", "lsg_type": "municipality", "district": "Kollam",
+         "centroid": [76.2, 9.0], "wikidata": "Q2"},
+    ]
+    new = copy.deepcopy(old)
+    new[1]["head"] = {"name": "B. Person", "title": "President"}
+
+    _, _, old_hashes = release(old)
+    kind, new_by_id, new_hashes = release(new)
+    patch = make_patch(old_hashes, new_hashes, new_by_id, kind, 1, 2)
+
+    assert [c["id"] for c in patch["changed"]] == ["Q2"]
+    patched = apply_patch(old, patch)
+    assert patched == new
+    assert list(patched[1]) == list(new[1])
+
+
+def test_search_index_insert_only_renumbers_later_entries():
+    def entry(entry_id, name, qid):
+        return {"id": entry_id, "name": name, "name_ml": "", "lsg_type": "municipality", "district": "Kollam",
+                "centroid": [76.0, 9.0], "wikidata": qid}
+
+    old = [entry(1, "Alpha", "Q1"), entry(2, "Beta", "Q2"), entry(3, "Gamma", "Q3")]
+    new = [entry(1, "Alpha", "Q1"), entry(2, "Aardvark", "Q9"), entry(3, "Beta", "Q2"), entry(4, "Gamma", "Q3")]
+
+    _, old_by_id, old_hashes = release(old)
+    kind, new_by_id, new_hashes = release(new)
+    patch = make_patch(old_hashes, new_hashes, new_by_id, kind, 1, 2, members_of(old_by_id, kind))
+
+    assert [item["id"] for item in patch["added"]] == ["Q9"]
+    assert patch["changed"] == []
+    assert patch["members"] == {"Q2": {"id": 3}, "Q3": {"id": 4}}
+    patched = apply_patch(old, patch)
+    assert sorted(patched, key=lambda e: e["id"]) == new
+    assert list(patched[0]) == list(new[0])
+
+
+def test_patch_replaces_members():
+    def feature(qid, **members):
+        return {"type": "Feature", **members, "properties": {"name": qid, "wikidata": qid},
+                "geometry": {"type": "Point", "coordinates": [76.0, 9.0]}}
+
+    old = {"type": "FeatureCollection",
+           "features": [feature("Q1", id="Q1", note="stale"), feature("Q2")]}
+    new = {"type": "FeatureCollection",
+           "features": [feature("Q1", id="Q1"), feature("Q2", id="Q2")]}
+
+    _, old_by_id, old_hashes = release(old)
+    kind, new_by_id, new_hashes = release(new)
+    patch = make_patch(old_hashes, new_hashes, new_by_id, kind, 1, 2, members_of(old_by_id, kind))
+
+    assert patch["members"] == {"Q1": {"id": "Q1"}, "Q2": {"id": "Q2"}}
+    patched = apply_patch(old, patch)
+    assert patched == new
+    assert list(patched["features"][0]) == list(new["features"][0])
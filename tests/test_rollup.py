@@ -0,0 +1,66 @@
+import pytest
+
+pytest.importorskip("shapely")
+pytest.importorskip("pandas")
+
+from kerala_rollup import Rollup, areas_sq_km, feature_frame, rollup_features  # noqa: E402
+
+
+def make_feature(district, lsg_type, party="", president="", x=76.0, size=0.1):
+    return {
+        "type": "Feature",
+        "properties": {
+            "name": f"{district} {x}", "district": district, "lsg_type": lsg_type,
+            "officials": {
+                "president": {"name": president, "party": party, "contact": "", "email": ""},
+                "secretary": {"name": "", "contact": "", "email": ""},
+            },
+        },
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[x, 10.0], [x + size, 10.0], [x + size, 10.0 + size], [x, 10.0 + size], [x, 10.0]]],
+        },
+    }
+
+
+def test_rollup_sums_every_grouping():
+    geo_data = {"type": "FeatureCollection", "features": [
+        make_feature("Kollam", "gram panchayat", "LDF", "A. Person", x=76.0),
+        make_feature("Kollam", "gram panchayat", "UDF", "B. Person", x=76.1),
+        make_feature("Kollam", "municipality", x=76.2),
+        make_feature("Wayanad", "gram panchayat", "LDF", "C. Person", x=76.3),
+        {"type": "Feature", "properties": {}, "geometry": None},
+    ]}
+
+    cube = rollup_features(geo_data)
+    rollup = Rollup(cube)
+
+    assert len(cube["groups"]) == 8
+    assert rollup.get()["lsgs"] == 5
+    assert rollup.get(district="Kollam") == {
+        "lsgs": 3, "area_sq_km": pytest.approx(3 * 120.5, rel=0.01), "with_officials": 2, "with_contact": 0,
+    }
+    assert rollup.get(district="Kollam", party="LDF", lsg_type="gram panchayat")["lsgs"] == 1
+    assert rollup.get(district="Idukki")["lsgs"] == 0
+    parties = rollup.breakdown("party")
+    assert {party: cell["lsgs"] for party, cell in parties.items()} == {"LDF": 2, "UDF": 1, "Unknown": 2}
+    assert parties["UDF"] == rollup.get(party="UDF")
+    assert list(rollup.breakdown("lsg_type", district="Kollam")) == ["gram panchayat", "municipality"]
+    assert rollup.get(district="Unknown", lsg_type="unknown")["area_sq_km"] == 0
+    assert rollup.coverage(district="Kollam") == pytest.approx(2 / 3)
+
+    # Every grouping adds up to the same total
+    frame = feature_frame(geo_data)
+    for cells in cube["groups"].values():
+        assert sum(values[0] for values in cells.values()) == len(frame)
+
+    with pytest.raises(ValueError):
+        rollup.get(block="Anchal")
+
+
+def test_areas_match_an_equal_area_projection():
+    import shapely
+
+    # A 0.1 degree square near Kochi: about 10.96 km (east-west) by 11.06 km
+    square = shapely.box(76.2, 9.9, 76.3, 10.0)
+    assert areas_sq_km([square])[0] == pytest.approx(121.3, rel=0.002)
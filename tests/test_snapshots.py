@@ -0,0 +1,65 @@
+import copy
+import datetime
+
+import pytest
+
+from kerala_snapshots import SnapshotStore
+
+
+def make_feature(name, qid, x):
+    return {
+        "type": "Feature",
+        "properties": {"name": name, "district": "Kollam", "lsg_type": "gram panchayat", "wikidata": qid},
+        "geometry": {"type": "Polygon", "coordinates": [[[x, 9.0], [x + 0.1, 9.0], [x, 9.1], [x, 9.0]]]},
+    }
+
+
+def layer(*features):
+    return {"type": "FeatureCollection", "features": list(features)}
+
+
+def test_snapshots_share_unchanged_features(tmp_path):
+    store = SnapshotStore(tmp_path)
+    first = layer(make_feature("Alpha", "Q1", 76.0), make_feature("Beta", "Q2", 76.2))
+    for feature in first["features"]:
+        feature["bbox"] = [0, 0, 0, 0]
+    stats = store.commit({"lsg.geojson": first}, datetime.date(2015, 11, 2), name="le-2015")
+    assert (stats["features"], stats["objects"], stats["shared"]) == (2, 4, 0)
+
+    second = copy.deepcopy(first)
+    second["features"][0]["properties"]["officials"] = {"president": {"name": "A. Person"}}
+    second["features"].append(make_feature("Gamma", "Q3", 76.4))
+    stats = store.commit({"lsg.geojson": second}, "2020-12-16")
+    # Alpha's new properties and Gamma; Alpha's geometry and Beta are shared
+    assert (stats["objects"], stats["shared"]) == (3, 3)
+    with pytest.raises(ValueError):
+        store.commit({"lsg.geojson": second}, "2020-12-16")
+
+    assert [s["name"] for s in store.snapshots()] == ["le-2015", "2020-12-16"]
+    assert store.as_of("2014-01-01") is None
+    assert store.as_of("2019-06-30") == "le-2015"
+
+    # bbox is recomputed from the stored geometry
+    restored = store.load_as_of("2019-06-30", "lsg.geojson")
+    assert [f["properties"] for f in restored["features"]] == [f["properties"] for f in first["features"]]
+    assert restored["features"][0]["bbox"] == [76.0, 9.0, 76.1, 9.1]
+    gamma = store.load_as_of("2030-01-01", "lsg.geojson")["features"][2]
+    assert (gamma["geometry"], gamma["properties"]) == (second["features"][2]["geometry"], second["features"][2]["properties"])
+
+    assert [(e["snapshot"], e["change"]) for e in store.history("Q1", "lsg.geojson")] == [
+        ("le-2015", "added"), ("2020-12-16", "properties"),
+    ]
+    assert [e["change"] for e in store.history("Q3", "lsg.geojson")] == ["added"]
+    assert store.feature("le-2015", "lsg.geojson", "Q3") is None
+
+
+def test_snapshots_keep_feature_ids(tmp_path):
+    store = SnapshotStore(tmp_path)
+    data = layer(make_feature("Alpha", "Q1", 76.0), make_feature("Beta", "", 76.2))
+    data["features"][0]["id"] = "Q1"
+    data["features"][1]["id"] = "kollam/gram-panchayat/beta"
+    store.commit({"geometry.geojson": data}, "2020-12-16")
+
+    restored = store.load("2020-12-16", "geometry.geojson")
+    assert [f["id"] for f in restored["features"]] == ["Q1", "kollam/gram-panchayat/beta"]
+    assert restored == data
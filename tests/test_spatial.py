@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+
+from kerala_lsg_query import LSGIndex
+from kerala_spatial import (
+    GridIndex,
+    build_grid,
+    feature_bounds,
+    geometry_bounds,
+    intersects,
+    shared_vertex_report,
+    snap_geometries,
+)
+
+SEARCH_INDEX = Path(__file__).resolve().parent.parent / "data" / "processed" / "search_index.json"
+
+
+def polygon(x, y, size=0.1):
+    return {"type": "Polygon", "coordinates": [[[x, y], [x + size, y], [x + size, y + size], [x, y]]]}
+
+
+def test_feature_bounds_match_coordinate_walk():
+    features = [
+        {"type": "Feature", "properties": {}, "geometry": polygon(76.0, 9.0)},
+        {"type": "Feature", "properties": {}, "geometry": {
+            "type": "MultiPolygon",
+            "coordinates": [polygon(75.0, 11.0)["coordinates"], polygon(75.5, 11.5, 0.2)["coordinates"]],
+        }},
+        {"type": "Feature", "properties": {}, "geometry": None},
+    ]
+    boxes = feature_bounds(features)
+    assert boxes == [geometry_bounds(f["geometry"]) for f in features]
+    assert boxes[1] == [75.0, 11.0, 75.7, 11.7]
+    assert boxes[2] is None
+
+
+def test_grid_cells_cover_boxes():
+    grid = build_grid(["a", "b"], [[76.01, 9.01, 76.02, 9.02], [76.04, 9.04, 76.06, 9.06]], cell=0.05)
+    assert grid["cells"] == {"1520:180": ["a", "b"], "1521:180": ["b"], "1520:181": ["b"], "1521:181": ["b"]}
+
+
+def test_viewport_query_matches_brute_force():
+    index = LSGIndex.load(SEARCH_INDEX)
+    viewport = [76.2, 9.9, 76.4, 10.1]
+
+    expected = {e.id for e in index.filter() if intersects(e.centroid * 2, viewport)}
+    assert expected
+    assert {e.id for e in index.in_bbox(viewport)} == expected
+    assert index.in_bbox([0.0, 0.0, 1.0, 1.0]) == []
+
+    grid = GridIndex(["x"], [[76.0, 9.0, 76.1, 9.1]])
+    assert grid.query([-180.0, -90.0, 180.0, 90.0]) == ["x"]
+
+
+def test_snapping_rejoins_noisy_neighbours():
+    shapely = pytest.importorskip("shapely")
+    # Two LSGs whose shared edge was digitized with ~1e-9 noise on one side
+    west = shapely.Polygon([(76.0, 10.0), (76.1, 10.0), (76.1, 10.1), (76.0, 10.1)])
+    east = shapely.Polygon([(76.1 + 2e-9, 10.0 - 1e-9), (76.2, 10.0), (76.2, 10.1), (76.1 - 1e-9, 10.1 + 2e-9)])
+    geoms = [west, east]
+
+    before = shared_vertex_report(geoms, 1e-6)
+    assert before["unmatched"] == before["border_vertices"] == 4 and before["overlap_area"] > 0
+    snapped = snap_geometries(geoms, 1e-6)
+    report = shared_vertex_report(snapped, 2e-6)
+    assert report == {"pairs": 1, "border_vertices": 4, "unmatched": 0, "overlap_area": 0.0}
+    assert shapely.get_precision(snapped).tolist() == [0.0, 0.0]
+    assert shapely.union_all(snapped).geom_type == "Polygon"
@@ -0,0 +1,63 @@
+import importlib.util
+import re
+from pathlib import Path
+
+import pytest
+
+shapely = pytest.importorskip("shapely")
+np = pytest.importorskip("numpy")
+
+from kerala_thumbnails import Viewport, group_digests, render_group  # noqa: E402
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def box(x, y, size=0.1):
+    return shapely.box(75 + x, 12 + y, 75 + x + size, 12 + y + size)
+
+
+def test_thumbnails_render_and_cache(tmp_path):
+    stage = load_script("render_thumbnails")
+    lsgs = np.array([box(0, 0), box(0.1, 0), box(0.2, 0, size=0.001)], dtype=object)
+    props = [{"name": name, "district": "Kasaragod", "lsg_type": "gram panchayat"} for name in "ABC"]
+    district = np.array([shapely.union_all(lsgs)], dtype=object)
+    groups = stage.build_groups(props, lsgs, [{"district": "Kasaragod"}], district)
+
+    index, todo = stage.plan(groups, tmp_path, 64)
+    assert sorted(index["lsg"]) == ["kasaragod/gram-panchayat/a", "kasaragod/gram-panchayat/b",
+                                    "kasaragod/gram-panchayat/c"]
+    assert list(index["district"]) == ["Kasaragod"]
+    assert sum(len(group["targets"]) for group in todo) == 4
+    for group in todo:
+        render_group(group, tmp_path, 64)
+
+    svg = (tmp_path / index["lsg"]["kasaragod/gram-panchayat/a"]).read_text()
+    width, height = map(int, re.search(r'viewBox="0 0 (\d+) (\d+)"', svg).groups())
+    assert max(width, height) == 64
+    points = [tuple(map(float, p.split(","))) for p in re.findall(r"[\d.]+,[\d.]+", svg)]
+    assert all(0 <= x <= width and 0 <= y <= height for x, y in points)
+    # Too small to see at this size: marked with a dot
+    assert "<circle" in (tmp_path / index["lsg"]["kasaragod/gram-panchayat/c"]).read_text()
+
+    # Everything is cached; moving one LSG redraws its district's thumbnails only
+    assert stage.plan(groups, tmp_path, 64)[1] == []
+    lsgs[1] = box(0.1, 0.05)
+    moved = stage.build_groups(props, lsgs, [{"district": "Kasaragod"}], district)
+    new_index, todo = stage.plan(moved, tmp_path, 64)
+    assert sum(len(group["targets"]) for group in todo) == 3
+    assert new_index["district"] == index["district"]
+
+
+def test_digests_depend_on_context():
+    group = {"bounds": (75, 12, 76, 13), "context": [b"a"], "outline": None, "targets": [("x", b"1")]}
+    assert group_digests(group) == group_digests(dict(group))
+    assert group_digests(group) != group_digests({**group, "context": [b"b"]})
+    assert group_digests(group, 64) != group_digests(group, 128)
+    assert Viewport((75, 12, 76, 13), 100).path(np.array([None], dtype=object)) == ""
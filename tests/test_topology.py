@@ -0,0 +1,65 @@
+import pytest
+
+shapely = pytest.importorskip("shapely")
+np = pytest.importorskip("numpy")
+
+from kerala_topology import Topology  # noqa: E402
+
+
+def square(x, y, size=1.0, hole=None):
+    shell = [(x, y), (x + size, y), (x + size, y + size), (x, y + size), (x, y)]
+    return shapely.Polygon(shell, [hole] if hole else None)
+
+
+def wavy(x0, x1, y, steps=20):
+    """Points along a slightly wavy horizontal border"""
+    xs = np.linspace(x0, x1, steps + 1)
+    return [(float(x), y + (0.01 if i % 2 else 0.0)) for i, x in enumerate(xs)]
+
+
+def coverage():
+    # A 3x1 strip (two LSGs in district A, one in B) and an enclave of B inside A
+    hole = [(0.4, 0.4), (0.6, 0.4), (0.6, 0.6), (0.4, 0.6), (0.4, 0.4)]
+    return np.array([
+        square(0, 0, hole=hole),
+        square(1, 0),
+        square(2, 0),
+        square(0.4, 0.4, 0.2),
+    ], dtype=object), ["A", "A", "B", "B"]
+
+
+def test_rebuild_and_dissolve_match_polygons():
+    geoms, labels = coverage()
+    topology = Topology(geoms)
+
+    assert shapely.equals(topology.polygons(), geoms).all()
+    merged = topology.dissolve(labels)
+    for label in ("A", "B"):
+        geometry, ok = merged[label]
+        members = geoms[[i for i, value in enumerate(labels) if value == label]]
+        assert ok
+        assert shapely.equals(geometry, shapely.union_all(members))
+
+
+def test_simplified_layers_share_borders():
+    # Two LSGs meeting along a wavy border, one district
+    top = shapely.Polygon([*wavy(0, 2, 0.5), (2, 1), (0, 1)])
+    bottom = shapely.Polygon([(0, 0), (2, 0), *wavy(0, 2, 0.5)[::-1]])
+    geoms = np.array([top, bottom], dtype=object)
+    topology = Topology(geoms)
+
+    arcs = topology.arc_coordinates(0.05)
+    simplified = topology.polygons(arcs)
+    assert shapely.get_num_coordinates(simplified).sum() < shapely.get_num_coordinates(geoms).sum()
+    # No gap or overlap opens between the neighbours
+    assert shapely.area(shapely.intersection(*simplified)) == 0
+    merged, ok = topology.dissolve(["X", "X"], arcs)["X"]
+    assert ok and shapely.equals(merged, shapely.union_all(simplified))
+
+
+def test_overlapping_lsgs_fail_the_check():
+    geoms, labels = coverage()
+    geoms[1] = square(0.9, 0)
+    merged = Topology(geoms).dissolve(labels)
+    assert not merged["A"][1]
+    assert merged["B"][1]
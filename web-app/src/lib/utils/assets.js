@@ -0,0 +1,26 @@
+/**
+ * Resolves data file names to their published URLs.
+ * scripts/publish_static.py writes /data/manifest.json, mapping each plain
+ * name (e.g. kerala_lsg_final.geojson) to an immutable content-hashed file.
+ * Without a manifest the plain names are used.
+ */
+let manifestPromise;
+
+export function loadAssetManifest(fetchFn = fetch) {
+	if (!manifestPromise) {
+		// The manifest itself must always be revalidated
+		manifestPromise = fetchFn('/data/manifest.json', { cache: 'no-cache' })
+			.then((res) => (res.ok ? res.json() : { files: {} }))
+			.catch(() => ({ files: {} }));
+	}
+	return manifestPromise;
+}
+
+export function resolveAsset(manifest, name) {
+	const entry = manifest?.files?.[name];
+	return `/data/${entry ? entry.path : name}`;
+}
+
+export async function assetUrl(name, fetchFn = fetch) {
+	return resolveAsset(await loadAssetManifest(fetchFn), name);
+}
@@ -0,0 +1,17 @@
+import { describe, it, expect } from 'vitest';
+import { resolveAsset } from './assets.js';
+
+describe('resolveAsset', () => {
+	const manifest = {
+		files: { 'search_index.json': { path: 'search_index.1059283aaa99.json' } }
+	};
+
+	it('uses the hashed file from the manifest', () => {
+		expect(resolveAsset(manifest, 'search_index.json')).toBe('/data/search_index.1059283aaa99.json');
+	});
+
+	it('falls back to the plain name', () => {
+		expect(resolveAsset(manifest, 'kerala_lsg_final.geojson')).toBe('/data/kerala_lsg_final.geojson');
+		expect(resolveAsset(null, 'search_index.json')).toBe('/data/search_index.json');
+	});
+});
@@ -0,0 +1,48 @@
+/**
+ * Loads the LSG layer from its separately published geometry and attributes.
+ * Stage 04 writes kerala_lsg_geometry.geojson (boundaries by stable feature
+ * id, no properties) and kerala_lsg_attributes.json (properties by id); each
+ * has its own content-hashed URL, so an officials refresh only re-downloads
+ * the attributes. Falls back to kerala_lsg_final.geojson for data published
+ * before the split. Same join as kerala_layers.join_layer().
+ */
+import { loadAssetManifest, resolveAsset } from './assets.js';
+
+const GEOMETRY = 'kerala_lsg_geometry.geojson';
+const ATTRIBUTES = 'kerala_lsg_attributes.json';
+const COMBINED = 'kerala_lsg_final.geojson';
+
+let layerPromise;
+
+export function joinLayer(geometry, attributes) {
+	const byId = attributes?.features ?? {};
+	return {
+		...geometry,
+		features: geometry.features.map((feature) => ({
+			...feature,
+			properties: { ...(byId[feature.id] ?? {}) }
+		}))
+	};
+}
+
+async function fetchJson(url, fetchFn) {
+	const res = await fetchFn(url);
+	if (!res.ok) throw new Error(`Could not load ${url}: ${res.status}`);
+	return res.json();
+}
+
+export function loadLsgLayer(fetchFn = fetch) {
+	if (!layerPromise) {
+		layerPromise = loadAssetManifest(fetchFn).then(async (manifest) => {
+			if (!manifest?.files?.[GEOMETRY]) return resolveAsset(manifest, COMBINED);
+			const [geometry, attributes] = await Promise.all([
+				fetchJson(resolveAsset(manifest, GEOMETRY), fetchFn),
+				fetchJson(resolveAsset(manifest, ATTRIBUTES), fetchFn)
+			]);
+			return joinLayer(geometry, attributes);
+		});
+		// Retry on the next call after a failed download
+		layerPromise.catch(() => (layerPromise = undefined));
+	}
+	return layerPromise;
+}
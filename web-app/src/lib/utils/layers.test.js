@@ -0,0 +1,20 @@
+import { describe, it, expect } from 'vitest';
+import { joinLayer } from './layers.js';
+
+describe('joinLayer', () => {
+	const point = (id, x) => ({
+		type: 'Feature',
+		id,
+		properties: {},
+		geometry: { type: 'Point', coordinates: [x, x] }
+	});
+	const geometry = { type: 'FeatureCollection', features: [point('Q1', 0), point('Q2', 1)] };
+
+	it('copies properties onto features by id', () => {
+		const attributes = { features: { Q1: { name: 'Alpha' } } };
+		const layer = joinLayer(geometry, attributes);
+		expect(layer.features.map((f) => f.properties)).toEqual([{ name: 'Alpha' }, {}]);
+		expect(layer.features[0].geometry).toBe(geometry.features[0].geometry);
+		expect(geometry.features[0].properties).toEqual({});
+	});
+});
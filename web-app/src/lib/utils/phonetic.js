@@ -0,0 +1,253 @@
+/**
+ * Phonetic search keys for LSG names in English and Malayalam.
+ * Same rules as kerala_phonetic.py, which stage 05 uses to store each
+ * entry's keys in search_index.json ("phonetic"); change both together.
+ * Malayalam is transliterated to a plain Latin spelling, then spelling
+ * variants are folded to a consonant skeleton: Manjeswaram, Manjeshwar and
+ * മഞ്ചേശ്വരം all become "mnjsvr".
+ */
+
+const VIRAMA = '്';
+const MALAYALAM = /[ഀ-ൿ]/;
+
+const VOWELS = {
+	അ: 'a',
+	ആ: 'aa',
+	ഇ: 'i',
+	ഈ: 'ee',
+	ഉ: 'u',
+	ഊ: 'oo',
+	ഋ: 'ru',
+	എ: 'e',
+	ഏ: 'e',
+	ഐ: 'ai',
+	ഒ: 'o',
+	ഓ: 'o',
+	ഔ: 'au'
+};
+
+const VOWEL_SIGNS = {
+	'ാ': 'aa',
+	'ി': 'i',
+	'ീ': 'ee',
+	'ു': 'u',
+	'ൂ': 'oo',
+	'ൃ': 'ru',
+	'െ': 'e',
+	'േ': 'e',
+	'ൈ': 'ai',
+	'ൊ': 'o',
+	'ോ': 'o',
+	'ൌ': 'au',
+	'ൗ': 'au'
+};
+
+const CONSONANTS = {
+	ക: 'k',
+	ഖ: 'kh',
+	ഗ: 'g',
+	ഘ: 'gh',
+	ങ: 'ng',
+	ച: 'ch',
+	ഛ: 'chh',
+	ജ: 'j',
+	ഝ: 'jh',
+	ഞ: 'nj',
+	ട: 't',
+	ഠ: 'th',
+	ഡ: 'd',
+	ഢ: 'dh',
+	ണ: 'n',
+	ത: 'th',
+	ഥ: 'th',
+	ദ: 'd',
+	ധ: 'dh',
+	ന: 'n',
+	പ: 'p',
+	ഫ: 'ph',
+	ബ: 'b',
+	ഭ: 'bh',
+	മ: 'm',
+	യ: 'y',
+	ര: 'r',
+	ല: 'l',
+	വ: 'v',
+	ശ: 'sh',
+	ഷ: 'sh',
+	സ: 's',
+	ഹ: 'h',
+	ള: 'l',
+	ഴ: 'zh',
+	റ: 'r'
+};
+
+// Conjuncts spelled differently from their parts
+const CONJUNCTS = {
+	ങ്ക: 'nk',
+	ങ്ങ: 'ng',
+	ഞ്ച: 'nch',
+	ഞ്ഞ: 'nj',
+	റ്റ: 'tt',
+	ന്റ: 'nt',
+	ക്ഷ: 'ksh'
+};
+
+const OTHER = {
+	'ം': 'm',
+	'ഃ': 'h',
+	ൺ: 'n',
+	ൻ: 'n',
+	ർ: 'r',
+	ൽ: 'l',
+	ൾ: 'l',
+	ൿ: 'k',
+	'\u200c': '',
+	'\u200d': ''
+};
+
+// Romanized spelling variants folded together, applied in order
+const FOLDS = [
+	[/ksh/g, 'ks'],
+	[/nch/g, 'nj'],
+	[/c(?!h)|q/g, 'k'],
+	[/x/g, 'ks'],
+	[/sh/g, 's'],
+	[/zh/g, 'z'],
+	[/ch/g, 'c'],
+	[/[td]h|d/g, 't'],
+	[/bh/g, 'b'],
+	[/ph|f/g, 'p'],
+	[/kh/g, 'k'],
+	[/gh/g, 'g'],
+	[/jh/g, 'j'],
+	[/w/g, 'v'],
+	[/n[gk]/g, 'ng'],
+	[/(.)\1+/g, '$1'],
+	[/(?<=[aeiouy])m$/, '']
+];
+
+// Trailing words that name the LSG type rather than the place
+const SUFFIX_WORDS = [
+	'grama',
+	'gram',
+	'panchayat',
+	'gramapanchayat',
+	'block',
+	'district',
+	'municipality',
+	'municipal',
+	'corporation',
+	'nagarasabha',
+	'ഗ്രാമപഞ്ചായത്ത്',
+	'പഞ്ചായത്ത്',
+	'ബ്ലോക്ക്',
+	'ജില്ലാ',
+	'നഗരസഭ',
+	'കോർപ്പറേഷൻ'
+];
+
+export function transliterate(text) {
+	let out = '';
+	let i = 0;
+	while (i < text.length) {
+		const char = text[i];
+		const conjunct = text.slice(i, i + 3);
+		if (CONJUNCTS[conjunct]) {
+			out += CONJUNCTS[conjunct];
+			i += 3;
+		} else if (CONSONANTS[char]) {
+			out += CONSONANTS[char];
+			i += 1;
+		} else {
+			out += VOWELS[char] ?? OTHER[char] ?? char;
+			i += 1;
+			continue;
+		}
+		// Inherent vowel unless a vowel sign or virama follows
+		const following = text[i] ?? '';
+		if (VOWEL_SIGNS[following]) {
+			out += VOWEL_SIGNS[following];
+			i += 1;
+		} else if (following === VIRAMA) {
+			i += 1;
+		} else {
+			out += 'a';
+		}
+	}
+	return out;
+}
+
+function words(text) {
+	if (MALAYALAM.test(text)) text = transliterate(text);
+	const ascii = text.normalize('NFKD').replace(/[\u0080-\uffff]/g, '').toLowerCase();
+	return ascii.match(/[a-z]+/g) ?? [];
+}
+
+function fold(text) {
+	for (const [pattern, replacement] of FOLDS) text = text.replace(pattern, replacement);
+	if (!text) return '';
+	// Keep the first letter (any vowel as "a"), drop the other vowels
+	const first = 'aeiouy'.includes(text[0]) ? 'a' : text[0];
+	return first + text.slice(1).replace(/[aeiouy]/g, '');
+}
+
+const SUFFIX_KEYS = new Set(SUFFIX_WORDS.map((word) => fold(words(word).join(''))));
+
+export function phoneticKey(text) {
+	const parts = words(text ?? '');
+	while (parts.length > 1 && SUFFIX_KEYS.has(fold(parts[parts.length - 1]))) parts.pop();
+	return fold(parts.join(''));
+}
+
+export function phoneticKeys(...names) {
+	const keys = [];
+	for (const name of names) {
+		const key = phoneticKey(name);
+		if (key && !keys.includes(key)) keys.push(key);
+	}
+	return keys;
+}
+
+/**
+ * Map of phonetic key to entries, from the keys stage 05 stored
+ * (computed here for older indexes without them).
+ */
+export function buildPhoneticIndex(entries) {
+	const index = new Map();
+	for (const entry of entries) {
+		for (const key of entry.phonetic ?? phoneticKeys(entry.name, entry.name_ml)) {
+			if (!index.has(key)) index.set(key, []);
+			index.get(key).push(entry);
+		}
+	}
+	return index;
+}
+
+function sharedPrefix(a, b) {
+	let n = 0;
+	while (n < a.length && n < b.length && a[n] === b[n]) n++;
+	return n;
+}
+
+/**
+ * Substring matches on English or Malayalam names, then names that sound
+ * the same, closest spelling first. Mirrors LSGIndex.search().
+ */
+export function searchEntries(entries, phoneticIndex, query, limit = 10) {
+	const q = query.trim().toLowerCase();
+	if (!q) return [];
+	const results = [];
+	for (const item of entries) {
+		if (item.name.toLowerCase().includes(q) || (item.name_ml && item.name_ml.includes(q))) {
+			results.push(item);
+			if (results.length >= limit) return results;
+		}
+	}
+	const found = new Set(results);
+	const ascii = !MALAYALAM.test(q);
+	const name = (item) => (ascii ? item.name.toLowerCase() : item.name_ml || '');
+	const soundsLike = (phoneticIndex.get(phoneticKey(q)) ?? [])
+		.filter((item) => !found.has(item))
+		.sort((a, b) => sharedPrefix(q, name(b)) - sharedPrefix(q, name(a)));
+	return results.concat(soundsLike).slice(0, limit);
+}
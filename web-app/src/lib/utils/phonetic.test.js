@@ -0,0 +1,46 @@
+import { describe, it, expect } from 'vitest';
+import {
+	buildPhoneticIndex,
+	phoneticKey,
+	phoneticKeys,
+	searchEntries,
+	transliterate
+} from './phonetic.js';
+
+// Same examples as tests/test_phonetic.py, so both implementations agree
+const SAME_KEY = [
+	['Manjeswaram', 'Manjeshwar', 'മഞ്ചേശ്വരം', 'Manjeshwaram Grama Panchayath'],
+	['Thiruvananthapuram', 'Tiruvanantapuram', 'തിരുവനന്തപുരം', 'Thiruvananthapuram Corporation'],
+	['Kozhikode', 'Kozhikkode', 'കോഴിക്കോട്'],
+	['Kasaragod', 'Kasargod', 'കാസർഗോഡ്'],
+	['Thrissur', 'Trissur', 'തൃശ്ശൂർ'],
+	['Angamaly', 'Angamali', 'അങ്കമാലി'],
+	['Vorkady', 'Vorkadi Gramapanchayat', 'വോർക്കാടി ഗ്രാമപഞ്ചായത്ത്']
+];
+
+describe('phoneticKey', () => {
+	it('gives spelling variants one key', () => {
+		for (const spellings of SAME_KEY) {
+			expect(new Set(spellings.map(phoneticKey)).size).toBe(1);
+		}
+		expect(phoneticKey('Manjeswaram')).toBe('mnjsvr');
+		expect(phoneticKey('Kollam')).not.toBe(phoneticKey('Kottayam'));
+		expect(transliterate('കോഴിക്കോട്')).toBe('kozhikkot');
+		expect(phoneticKeys('Alappuzha', 'ആലപ്പുഴ', '')).toEqual(['alpz']);
+	});
+});
+
+describe('searchEntries', () => {
+	const entries = [
+		{ id: 1, name: 'Manjeswaram', name_ml: 'മഞ്ചേശ്വരം', phonetic: ['mnjsvr'] },
+		{ id: 2, name: 'Kasaragod', name_ml: '' }
+	];
+	const index = buildPhoneticIndex(entries);
+
+	it('matches substrings first, then names that sound the same', () => {
+		expect(searchEntries(entries, index, 'manjes').map((e) => e.id)).toEqual([1]);
+		expect(searchEntries(entries, index, 'Manjeshwar').map((e) => e.id)).toEqual([1]);
+		expect(searchEntries(entries, index, 'kasargod municipality').map((e) => e.id)).toEqual([2]);
+		expect(searchEntries(entries, index, 'Kollam')).toEqual([]);
+	});
+});
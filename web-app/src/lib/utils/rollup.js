@@ -0,0 +1,44 @@
+/**
+ * District x LSG type x party aggregates built by scripts/build_rollup.py.
+ * rollup.json holds every grouping of the dimensions, so a total is one
+ * lookup: groups["district,lsg_type"]["Kollam|municipality"] is
+ * [lsgs, area_sq_km, with_officials, with_contact] (see kerala_rollup.py).
+ */
+import { assetUrl } from './assets.js';
+
+let rollupPromise;
+
+export function loadRollup(fetchFn = fetch) {
+	if (!rollupPromise) {
+		rollupPromise = assetUrl('rollup.json', fetchFn)
+			.then((url) => fetchFn(url))
+			.then((res) => (res.ok ? res.json() : null))
+			.catch(() => null);
+	}
+	return rollupPromise;
+}
+
+function cellOf(rollup, values) {
+	return Object.fromEntries(rollup.measures.map((name, i) => [name, values?.[i] ?? 0]));
+}
+
+// Measures of one cell, e.g. { district: 'Kollam' }; omitted dimensions are summed over
+export function rollupCell(rollup, filters = {}) {
+	const dims = rollup.dimensions.filter((d) => d in filters);
+	const group = rollup.groups[dims.join(',')] ?? {};
+	return cellOf(rollup, group[dims.map((d) => filters[d]).join('|')]);
+}
+
+// { value of `by`: measures } within the filtered cell
+export function rollupBreakdown(rollup, by, filters = {}) {
+	const dims = rollup.dimensions.filter((d) => d === by || d in filters);
+	const position = dims.indexOf(by);
+	const result = {};
+	for (const [key, values] of Object.entries(rollup.groups[dims.join(',')] ?? {})) {
+		const parts = key.split('|');
+		if (dims.every((d, i) => d === by || parts[i] === filters[d])) {
+			result[parts[position]] = cellOf(rollup, values);
+		}
+	}
+	return result;
+}
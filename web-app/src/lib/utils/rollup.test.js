@@ -0,0 +1,36 @@
+import { describe, it, expect } from 'vitest';
+import { rollupBreakdown, rollupCell } from './rollup.js';
+
+describe('rollup', () => {
+	const rollup = {
+		format: 'kerala-lsg-rollup/1',
+		dimensions: ['district', 'lsg_type', 'party'],
+		measures: ['lsgs', 'area_sq_km', 'with_officials', 'with_contact'],
+		groups: {
+			'': { '': [3, 30.5, 2, 1] },
+			district: { Kollam: [2, 20, 1, 1], Wayanad: [1, 10.5, 1, 0] },
+			'district,lsg_type': {
+				'Kollam|gram panchayat': [1, 12, 0, 0],
+				'Kollam|municipality': [1, 8, 1, 1],
+				'Wayanad|gram panchayat': [1, 10.5, 1, 0]
+			}
+		}
+	};
+
+	it('looks cells up by their dimension values', () => {
+		expect(rollupCell(rollup).lsgs).toBe(3);
+		expect(rollupCell(rollup, { district: 'Kollam', lsg_type: 'municipality' })).toEqual({
+			lsgs: 1,
+			area_sq_km: 8,
+			with_officials: 1,
+			with_contact: 1
+		});
+		expect(rollupCell(rollup, { district: 'Idukki' }).lsgs).toBe(0);
+	});
+
+	it('breaks a cell down by one dimension', () => {
+		const types = rollupBreakdown(rollup, 'lsg_type', { district: 'Kollam' });
+		expect(Object.keys(types)).toEqual(['gram panchayat', 'municipality']);
+		expect(Object.keys(rollupBreakdown(rollup, 'district'))).toEqual(['Kollam', 'Wayanad']);
+	});
+});
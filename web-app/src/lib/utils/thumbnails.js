@@ -0,0 +1,43 @@
+/**
+ * Boundary thumbnails rendered by scripts/render_thumbnails.py.
+ * thumbnails.json (resolved through the publish manifest) maps each LSG's
+ * stable id and each district name to an immutable, content-hashed SVG.
+ */
+import { assetUrl } from './assets.js';
+
+let indexPromise;
+
+export function loadThumbnailIndex(fetchFn = fetch) {
+	if (!indexPromise) {
+		indexPromise = assetUrl('thumbnails.json', fetchFn)
+			.then((url) => fetchFn(url))
+			.then((res) => (res.ok ? res.json() : {}))
+			.catch(() => ({}));
+	}
+	return indexPromise;
+}
+
+function slug(value) {
+	return String(value ?? '')
+		.trim()
+		.toLowerCase()
+		.replace(/[^a-z0-9]+/g, '-')
+		.replace(/^-+|-+$/g, '');
+}
+
+// Same id as kerala_lsg_records.stable_feature_id
+export function stableFeatureId(entry) {
+	const qid = String(entry.wikidata ?? '').trim();
+	if (qid) return qid;
+	return [entry.district, entry.lsg_type, entry.name].map(slug).join('/');
+}
+
+export function thumbnailUrl(index, entry) {
+	const file = index?.lsg?.[stableFeatureId(entry)];
+	return file ? `/data/thumbnails/${file}` : null;
+}
+
+export function districtThumbnailUrl(index, district) {
+	const file = index?.district?.[district];
+	return file ? `/data/thumbnails/${file}` : null;
+}